@@ -0,0 +1,313 @@
+import hashlib
+import json
+import re
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs, urlencode
+
+class FakeGitHubData:
+    """
+    벤치마크용 가짜 GitHub 데이터입니다.
+    PR은 미리 만들어 두지 않고 요청이 올 때마다 같은 값으로 만들어
+    repository 수천 개 × PR 수백 개도 메모리를 거의 쓰지 않습니다.
+
+    repository i의 PR 수는 active_every개마다 하나씩만 있고 (나머지는 0개),
+    0 ~ max_prs 사이에서 고르게 분포합니다.
+    """
+
+    def __init__(self, repo_count=100, max_prs=20, active_every=3, body_size=500, owner="bench-owner"):
+        self.repo_count = repo_count
+        self.max_prs = max_prs
+        self.active_every = active_every
+        self.body_size = body_size
+        self.owner = owner
+        # 데이터를 바꿨을 때 ETag가 달라지도록 사용
+        self.version = 0
+        self.repository_cache = None
+        self.search_index = None
+
+    def pull_request_count(self, repo_index):
+        if self.max_prs == 0 or repo_index % self.active_every:
+            return 0
+        return (repo_index * 7919) % (self.max_prs + 1)
+
+    def repository(self, index):
+        name = f"repo-{index:05d}"
+        return {
+            "id": index,
+            "name": name,
+            "full_name": f"{self.owner}/{name}",
+            "private": True,
+            "owner": {"login": self.owner},
+            "html_url": f"https://github.com/{self.owner}/{name}",
+            "description": f"benchmark repository {index}",
+            "created_at": "2024-01-01T00:00:00Z",
+            "updated_at": "2024-06-01T00:00:00Z",
+            "pushed_at": "2024-06-01T00:00:00Z"
+        }
+
+    def pull_request(self, repo_name, number):
+        # 실제 응답처럼 렌더링에 쓰지 않는 큰 필드(head/base repository 등)도 포함
+        # created_at은 검색 API의 created 범위 분할을 확인할 수 있도록 repository마다 다른 시각을 씀
+        repo_index = int(repo_name.rsplit("-", 1)[-1])
+        repo = {"name": repo_name, "full_name": f"{self.owner}/{repo_name}", "owner": {"login": self.owner},
+                "description": "x" * 100, "private": True}
+        return {
+            "number": number,
+            "title": f"Benchmark pull request {number}",
+            "body": "Lorem ipsum dolor sit amet. " * (self.body_size // 28),
+            "state": "open",
+            "user": {"login": f"author-{number % 17}", "id": number % 17, "type": "User"},
+            "created_at": f"2024-05-{1 + number % 28:02d}T{repo_index % 24:02d}:{repo_index // 24 % 60:02d}:{number % 60:02d}Z",
+            "updated_at": f"2024-06-{1 + number % 28:02d}T{number % 24:02d}:00:00Z",
+            "html_url": f"https://github.com/{self.owner}/{repo_name}/pull/{number}",
+            "draft": number % 5 == 0,
+            "labels": [{"name": "bug"}] if number % 3 == 0 else [],
+            "requested_reviewers": [{"login": f"author-{(number + 1) % 17}"}] if number % 2 else [],
+            "head": {"sha": hashlib.sha1(f"{repo_name}{number}{self.version}".encode()).hexdigest(), "repo": repo},
+            "base": {"ref": "main", "repo": repo}
+        }
+
+    def repositories(self):
+        # repository 목록은 요청마다 같으므로 한 번만 만듦
+        if self.repository_cache is None:
+            self.repository_cache = [self.repository(i) for i in range(self.repo_count)]
+        return self.repository_cache
+
+    def pull_request_detail(self, repo_name, number):
+        """
+        /repos/{o}/{r}/pulls/{n} 응답을 만듭니다.
+        목록에 없는 번호는 닫힌 PR로 보고, 짝수 번호는 merge 된 것으로 돌려줍니다.
+        """
+        pull_requests = self.pull_requests(repo_name)
+        if pull_requests is None:
+            return None
+        for pr in pull_requests:
+            if pr["number"] == number:
+                return {**pr, "merged": False, "merged_at": None, "mergeable": number % 7 != 0}
+        pr = self.pull_request(repo_name, number)
+        merged = number % 2 == 0
+        return {**pr, "state": "closed", "merged": merged, "merged_at": pr["updated_at"] if merged else None}
+
+    def pull_request_reviews(self, repo_name, number):
+        """
+        /repos/{o}/{r}/pulls/{n}/reviews 응답을 만듭니다. (번호에 따라 승인 / 변경 요청 / 리뷰 없음)
+        """
+        if self.pull_requests(repo_name) is None:
+            return None
+        states = {0: ["COMMENTED", "APPROVED"], 1: ["CHANGES_REQUESTED"], 2: ["COMMENTED"]}.get(number % 4, [])
+        return [{"id": i, "user": {"login": f"reviewer-{i}"}, "state": state} for i, state in enumerate(states)]
+
+    def commit_status(self, sha):
+        """
+        /repos/{o}/{r}/commits/{sha}/status 응답을 만듭니다. (sha에 따라 성공 / 실패 / status 없음)
+        """
+        state = ("success", "failure", None)[int(sha[:8], 16) % 3]
+        if state is None:
+            return {"state": "pending", "sha": sha, "total_count": 0, "statuses": []}
+        return {"state": state, "sha": sha, "total_count": 1, "statuses": [{"state": state, "context": "ci/bench"}]}
+
+    def search_pull_requests(self, start, end):
+        """
+        created가 start ~ end(ISO 문자열, 양 끝 포함)인 PR의 (created_at, repository 이름, 번호)를
+        created 내림차순으로 돌려줍니다.
+        """
+        if self.search_index is None:
+            self.search_index = sorted(
+                ((self.pull_request(repo["name"], number)["created_at"], repo["name"], number)
+                 for index, repo in enumerate(self.repositories())
+                 for number in range(1, self.pull_request_count(index) + 1)),
+                reverse=True
+            )
+        return [entry for entry in self.search_index if start <= entry[0] <= end]
+
+    def search_item(self, base_url, repo_name, number):
+        """
+        /search/issues 결과 항목(issue 형태)을 만듭니다.
+        """
+        pr = self.pull_request(repo_name, number)
+        del pr["head"], pr["base"]
+        api_url = f"{base_url}/repos/{self.owner}/{repo_name}"
+        return {**pr, "repository_url": api_url, "pull_request": {"url": f"{api_url}/pulls/{number}"}}
+
+    def pull_requests(self, repo_name):
+        match = re.fullmatch(r"repo-(\d+)", repo_name)
+        if not match or int(match.group(1)) >= self.repo_count:
+            return None
+        count = self.pull_request_count(int(match.group(1)))
+        pull_requests = [self.pull_request(repo_name, number) for number in range(1, count + 1)]
+        pull_requests.sort(key=lambda pr: pr["updated_at"], reverse=True)
+        return pull_requests
+
+class FakeGitHubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # keep-alive 연결에서 헤더와 본문이 따로 나갈 때 Nagle 지연(~40ms)이 생기지 않도록
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        parsed = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+        server.record_request(self)
+
+        if parsed.path == "/search/issues":
+            self.send_search(query)
+            return
+        if parsed.path == "/user/repos" or re.fullmatch(r"/(users|orgs)/[^/]+/repos", parsed.path):
+            items = server.data.repositories()
+        elif match := re.fullmatch(r"/repos/[^/]+/([^/]+)", parsed.path):
+            index = int(match.group(1).rsplit("-", 1)[-1]) if re.fullmatch(r"repo-\d+", match.group(1)) else None
+            if index is None or index >= server.data.repo_count:
+                self.send_json(404, {"message": "Not Found"})
+            else:
+                self.send_json(200, server.data.repository(index))
+            return
+        elif match := re.fullmatch(r"/repos/[^/]+/([^/]+)/pulls/(\d+)/reviews", parsed.path):
+            items = server.data.pull_request_reviews(match.group(1), int(match.group(2)))
+        elif match := re.fullmatch(r"/repos/[^/]+/[^/]+/commits/([0-9a-f]+)/status", parsed.path):
+            self.send_json(200, server.data.commit_status(match.group(1)))
+            return
+        elif match := re.fullmatch(r"/repos/[^/]+/([^/]+)/pulls/(\d+)", parsed.path):
+            detail = server.data.pull_request_detail(match.group(1), int(match.group(2)))
+            if detail is None:
+                self.send_json(404, {"message": "Not Found"})
+            else:
+                # merge 가능 여부가 바뀌면 ETag도 바뀌므로 조건부 요청으로 다시 확인할 수 있음
+                self.send_conditional(json.dumps(detail).encode("utf-8"))
+            return
+        else:
+            match = re.fullmatch(r"/repos/[^/]+/([^/]+)/pulls", parsed.path)
+            items = server.data.pull_requests(match.group(1)) if match else None
+        if items is None:
+            self.send_json(404, {"message": "Not Found"})
+            return
+
+        per_page = min(100, int(query.get("per_page", 30)))
+        page = int(query.get("page", 1))
+        body = json.dumps(items[(page - 1) * per_page:page * per_page]).encode("utf-8")
+
+        headers = {}
+        if page * per_page < len(items):
+            next_query = urlencode({**query, "page": page + 1})
+            headers["Link"] = f'<{server.base_url}{parsed.path}?{next_query}>; rel="next"'
+
+        self.send_conditional(body, headers)
+
+    def send_conditional(self, body, headers=None):
+        """
+        ETag를 붙여 보내고, If-None-Match가 같으면 rate limit을 쓰지 않는 304로 답합니다.
+        """
+        headers = headers or {}
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+        headers["ETag"] = etag
+        if self.headers.get("If-None-Match") == etag:
+            self.send_json(304, None, headers, charge=False)
+            return
+        self.send_json(200, body, headers)
+
+    def send_search(self, query):
+        """
+        /search/issues를 처리합니다. q의 created:시작..끝 범위만 해석하고,
+        실제 API처럼 query 하나에 1,000개까지만 페이지로 나눠 돌려줍니다.
+        """
+        server = self.server
+        match = re.search(r"created:(\S+)\.\.(\S+)", query.get("q", ""))
+        start, end = match.groups() if match else ("", "~")
+        entries = server.data.search_pull_requests(start, end)
+
+        per_page = min(100, int(query.get("per_page", 30)))
+        page = int(query.get("page", 1))
+        if (page - 1) * per_page >= 1000:
+            self.send_json(422, {"message": "Only the first 1000 search results are available"}, resource="search")
+            return
+        available = min(len(entries), 1000)
+        items = [server.data.search_item(server.base_url, repo_name, number)
+                 for _, repo_name, number in entries[(page - 1) * per_page:min(page * per_page, available)]]
+
+        headers = {}
+        if page * per_page < available:
+            next_query = urlencode({**query, "page": page + 1})
+            headers["Link"] = f'<{server.base_url}/search/issues?{next_query}>; rel="next"'
+        body = {"total_count": len(entries), "incomplete_results": False, "items": items}
+        self.send_json(200, body, headers, resource="search")
+
+    def send_json(self, status, body, headers=None, charge=True, resource="core"):
+        if isinstance(body, dict):
+            body = json.dumps(body).encode("utf-8")
+        body = body or b""
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        for name, value in self.server.rate_limit_headers(charge, resource).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.record_response(len(body))
+
+class FakeGitHubServer(ThreadingHTTPServer):
+    """
+    /user/repos, /users/{u}/repos, /orgs/{o}/repos, /repos/{o}/{r}(/pulls(/{n}(/reviews))),
+    /repos/{o}/{r}/commits/{sha}/status, /search/issues를 제공하는
+    가짜 GitHub REST API 서버입니다.
+    Link 헤더 pagination, ETag / 304 응답, X-RateLimit-* 헤더를 실제 API처럼 돌려주고
+    요청 수와 주고받은 byte 수를 셉니다.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, data=None, rate_limit=100000):
+        super().__init__(("127.0.0.1", 0), FakeGitHubHandler)
+        self.data = data or FakeGitHubData()
+        self.rate_limit = rate_limit
+        self.rate_limit_reset = int(time.time()) + 3600
+        self.lock = threading.Lock()
+        self.reset_counters()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_port}"
+
+    def reset_counters(self):
+        with self.lock:
+            self.request_count = 0
+            self.not_modified_count = 0
+            self.bytes_in = 0
+            self.bytes_out = 0
+            self.rate_limit_used = 0
+            # { resource: 사용량 } (search는 core와 따로 셈)
+            self.rate_limit_used_by_resource = {}
+
+    def record_request(self, handler):
+        with self.lock:
+            self.request_count += 1
+            self.bytes_in += len(handler.requestline) + sum(len(k) + len(v) + 4 for k, v in handler.headers.items())
+
+    def record_response(self, body_size):
+        with self.lock:
+            self.bytes_out += body_size
+
+    def rate_limit_headers(self, charge, resource="core"):
+        with self.lock:
+            if charge:
+                self.rate_limit_used += 1
+                self.rate_limit_used_by_resource[resource] = self.rate_limit_used_by_resource.get(resource, 0) + 1
+            else:
+                self.not_modified_count += 1
+            used = self.rate_limit_used_by_resource.get(resource, 0)
+            return {
+                "X-RateLimit-Limit": str(self.rate_limit),
+                "X-RateLimit-Remaining": str(max(0, self.rate_limit - used)),
+                "X-RateLimit-Reset": str(self.rate_limit_reset),
+                "X-RateLimit-Used": str(used),
+                "X-RateLimit-Resource": resource
+            }
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
@@ -0,0 +1,110 @@
+import hashlib
+import json
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+class FakeSlackHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # keep-alive 연결에서 헤더와 본문이 따로 나갈 때 Nagle 지연(~40ms)이 생기지 않도록
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path.startswith("/api/"):
+            result = self.server.call_api(self.path[len("/api/"):], json.loads(body or b"{}"),
+                                          self.headers.get("Authorization"), len(body))
+            self.send_body(json.dumps(result).encode("utf-8"), "application/json; charset=utf-8")
+            return
+        self.server.record_post(self.path, json.loads(body or b"{}"), len(body))
+        self.send_body(b"ok", "text/plain")
+
+    def send_body(self, body, content_type):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+class FakeSlackServer(ThreadingHTTPServer):
+    """
+    Slack incoming webhook처럼 POST를 받아 "ok"를 돌려주는 가짜 서버입니다.
+    받은 payload와 요청 수, byte 수를 기록합니다.
+
+    /api/chat.postMessage, /api/chat.update, /api/chat.delete는 Slack Web API처럼
+    채널별 메시지를 ts로 저장하고 고치며, 호출 내역은 api_calls에 따로 기록합니다.
+    """
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FakeSlackHandler)
+        self.lock = threading.Lock()
+        self.reset_counters()
+
+    @property
+    def webhook_url(self):
+        return f"http://127.0.0.1:{self.server_port}/services/BENCH/WEBHOOK"
+
+    @property
+    def api_base(self):
+        return f"http://127.0.0.1:{self.server_port}/api"
+
+    def reset_counters(self):
+        with self.lock:
+            self.payloads = []
+            self.request_count = 0
+            self.bytes_in = 0
+            # [(method, payload), ...]
+            self.api_calls = []
+            if not hasattr(self, "messages"):
+                # { 채널 ID: { ts: 메시지 payload } } (카운터를 초기화해도 채널의 메시지는 남김)
+                self.messages = {}
+
+    def channel_id(self, channel):
+        if channel in self.messages or not channel or not channel.startswith("#"):
+            return channel
+        return "C" + hashlib.md5(channel.encode("utf-8")).hexdigest()[:8].upper()
+
+    def call_api(self, method, payload, authorization, size):
+        with self.lock:
+            self.api_calls.append((method, payload))
+            self.request_count += 1
+            self.bytes_in += size
+            if not authorization or not authorization.startswith("Bearer "):
+                return {"ok": False, "error": "not_authed"}
+
+            channel = self.channel_id(payload.get("channel"))
+            if not channel:
+                return {"ok": False, "error": "channel_not_found"}
+            if method == "chat.postMessage":
+                ts = f"{time.time():.6f}"
+                while ts in self.messages.get(channel, {}):
+                    ts = f"{float(ts) + 0.000001:.6f}"
+                self.messages.setdefault(channel, {})[ts] = payload
+                return {"ok": True, "channel": channel, "ts": ts}
+            if method in ("chat.update", "chat.delete"):
+                # chat.update / chat.delete는 채널 이름이 아니라 ID를 받음
+                if channel not in self.messages:
+                    return {"ok": False, "error": "channel_not_found"}
+                if payload.get("ts") not in self.messages[channel]:
+                    return {"ok": False, "error": "message_not_found"}
+                if method == "chat.delete":
+                    del self.messages[channel][payload["ts"]]
+                else:
+                    self.messages[channel][payload["ts"]] = {**self.messages[channel][payload["ts"]], **payload}
+                return {"ok": True, "channel": channel, "ts": payload["ts"]}
+            return {"ok": False, "error": "unknown_method"}
+
+    def record_post(self, path, payload, size):
+        with self.lock:
+            self.payloads.append(payload)
+            self.request_count += 1
+            self.bytes_in += size
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
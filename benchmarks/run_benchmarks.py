@@ -0,0 +1,154 @@
+"""
+가짜 GitHub / Slack 서버로 PR 알림 전체 흐름의 성능을 측정합니다.
+
+    python benchmarks/run_benchmarks.py --repos 10,100,1000 --max-prs 0,20,100
+
+repository 수 × repository당 최대 PR 수 조합마다
+get_all_pull_requests → make_pull_requests_msgs → send_slack_message를 두 번 실행합니다.
+(cold: 빈 캐시, warm: 같은 데이터로 다시 실행해 ETag / repository 목록 캐시가 채워진 상태)
+
+측정 항목:
+    - 단계별 wall time (fetch / render / send)
+    - GitHub 요청 수, 304 응답 수, rate limit 사용량
+    - 주고받은 byte 수 (GitHub 응답 본문 / Slack 요청 본문)
+    - peak memory (tracemalloc, 같은 프로세스에서 도는 가짜 서버의 할당도 포함)
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fake_github import FakeGitHubData, FakeGitHubServer
+from fake_slack import FakeSlackServer
+
+def configure_environment(github, slack, state_dir, slack_interval):
+    """
+    알림 모듈을 import 하기 전에 가짜 서버를 바라보도록 환경 변수를 설정합니다.
+    (load_dotenv는 이미 있는 환경 변수를 덮어쓰지 않음)
+    """
+    os.environ["GITHUB_API_BASE"] = github.base_url
+    os.environ["PR_GITHUB_TOKEN"] = "benchmark-token"
+    os.environ["SLACK_WEBHOOK_URL"] = slack.webhook_url
+    os.environ["PR_NOTIFY_STATE_DIR"] = state_dir
+    os.environ["GITHUB_CACHE_DIR"] = os.path.join(state_dir, "http_cache")
+    os.environ["SLACK_MIN_INTERVAL"] = str(slack_interval)
+    os.environ["SLACK_COALESCE_WINDOW"] = "0"
+    # warm 실행도 같은 메시지를 실제로 보내도록 중복 전송 방지는 끔
+    os.environ["SLACK_DEDUP_WINDOW"] = "0"
+
+def reset_http_cache(cache_dir):
+    """
+    시나리오마다 빈 ETag 캐시와 빈 repository 목록 캐시로 시작합니다.
+    """
+    import github_api_cache
+    import github_api_repo_cache
+
+    github_api_cache.GITHUB_CACHE_DIR = cache_dir
+    github_api_cache.response_cache = None
+    github_api_repo_cache.PR_REPO_CACHE_PATH = os.path.join(cache_dir, "repositories.json")
+    github_api_repo_cache.repository_list_cache = None
+
+def run_once(notify, github, slack, owner, workers, measure_memory, compact, backend):
+    github.reset_counters()
+    slack.reset_counters()
+    if measure_memory:
+        tracemalloc.start()
+
+    # 단계별 진행 출력은 측정에서 제외
+    with contextlib.redirect_stdout(io.StringIO()):
+        started = time.perf_counter()
+        all_pull_requests = notify.get_all_pull_requests(owner, max_workers=workers, compact=compact, backend=backend)
+        fetched = time.perf_counter()
+        messages = notify.make_pull_requests_msgs(all_pull_requests)
+        rendered = time.perf_counter()
+        for message in messages:
+            notify.send_slack_message(message, "#benchmark")
+        sent = time.perf_counter()
+
+    peak_memory = 0
+    if measure_memory:
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return {
+        "pull_requests": sum(len(data["pull_requests"]) for data in all_pull_requests.values()),
+        "wall_time": sent - started,
+        "fetch_time": fetched - started,
+        "render_time": rendered - fetched,
+        "send_time": sent - rendered,
+        "github_requests": github.request_count,
+        "not_modified": github.not_modified_count,
+        "rate_limit_used": github.rate_limit_used,
+        "github_bytes": github.bytes_out,
+        "slack_posts": slack.request_count,
+        "slack_bytes": slack.bytes_in,
+        "peak_memory": peak_memory
+    }
+
+def print_result(result):
+    print(
+        f"{result['repos']:>6} {result['max_prs']:>7} {result['phase']:>5} "
+        f"{result['pull_requests']:>7} {result['wall_time']:>8.2f} {result['fetch_time']:>7.2f} "
+        f"{result['render_time']:>7.3f} {result['send_time']:>6.2f} "
+        f"{result['github_requests']:>7} {result['not_modified']:>6} {result['rate_limit_used']:>6} "
+        f"{result['github_bytes'] / 1024 / 1024:>8.2f} {result['slack_posts']:>6} "
+        f"{result['slack_bytes'] / 1024:>8.1f} {result['peak_memory'] / 1024 / 1024:>8.1f}"
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="PR 알림 성능 벤치마크")
+    parser.add_argument("--repos", default="10,100,1000", help="repository 수 목록 (쉼표로 구분)")
+    parser.add_argument("--max-prs", default="0,20,100", help="repository당 최대 PR 수 목록 (쉼표로 구분)")
+    parser.add_argument("--active-every", type=int, default=3, help="PR이 있는 repository 간격")
+    parser.add_argument("--body-size", type=int, default=500, help="PR 본문 크기 (byte)")
+    parser.add_argument("--workers", type=int, default=8, help="PR 동시 조회 수")
+    parser.add_argument("--slack-interval", type=float, default=0, help="Slack 전송 최소 간격 (초)")
+    parser.add_argument("--backend", default="rest", choices=("rest", "search"), help="PR 조회 방식")
+    parser.add_argument("--compact", action="store_true", help="PR을 PullRequestRecord로 바꿔 보관")
+    parser.add_argument("--no-memory", action="store_true", help="peak memory를 측정하지 않음 (tracemalloc 부하 제거)")
+    parser.add_argument("--json", help="결과를 JSON으로 저장할 경로")
+    args = parser.parse_args()
+
+    github = FakeGitHubServer().start()
+    slack = FakeSlackServer().start()
+    state_dir = tempfile.mkdtemp(prefix="pr-notify-bench-")
+    configure_environment(github, slack, state_dir, args.slack_interval)
+
+    import github_api_notify as notify
+
+    print(
+        f"{'repos':>6} {'max_prs':>7} {'phase':>5} {'PRs':>7} {'wall(s)':>8} {'fetch':>7} "
+        f"{'render':>7} {'send':>6} {'gh_req':>7} {'304':>6} {'rl':>6} {'gh_MB':>8} "
+        f"{'posts':>6} {'sl_KB':>8} {'peak_MB':>8}"
+    )
+    results = []
+    for repo_count in [int(value) for value in args.repos.split(",")]:
+        for max_prs in [int(value) for value in args.max_prs.split(",")]:
+            github.data = FakeGitHubData(repo_count, max_prs, args.active_every, args.body_size)
+            github.data.repositories()
+            reset_http_cache(tempfile.mkdtemp(dir=state_dir))
+
+            for phase in ("cold", "warm"):
+                result = run_once(notify, github, slack, github.data.owner, args.workers, not args.no_memory, args.compact,
+                                  args.backend)
+                result.update({"repos": repo_count, "max_prs": max_prs, "phase": phase})
+                print_result(result)
+                results.append(result)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    github.shutdown()
+    slack.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import requests
+from requests.structures import CaseInsensitiveDict
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 조건부 요청(ETag / Last-Modified) 캐시 설정 (GITHUB_CACHE_DIR를 비우면 캐시 사용 안 함)
+GITHUB_CACHE_DIR = os.getenv("GITHUB_CACHE_DIR", os.path.join(os.getenv("PR_NOTIFY_STATE_DIR", ".pr_notify_state"), "http_cache"))
+GITHUB_CACHE_MAX_BYTES = int(os.getenv("GITHUB_CACHE_MAX_BYTES", str(50 * 1024 * 1024)))
+
+# 캐시된 응답을 다시 만들 때 필요한 헤더만 저장
+CACHED_HEADERS = ("Content-Type", "Link", "ETag", "Last-Modified")
+
+class ConditionalRequestCache:
+    """
+    GitHub API 응답을 URL과 parameter별로 디스크에 저장하고
+    다음 요청에 If-None-Match / If-Modified-Since 헤더를 붙여 줍니다.
+    304 응답은 rate limit에 포함되지 않으므로 변경이 없으면 요청 비용 없이 캐시된 응답을 사용합니다.
+    전체 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 지웁니다.
+    """
+
+    def __init__(self, directory, max_bytes=GITHUB_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        # { key: [크기, 마지막 사용 시각] }
+        self.index = {}
+        self.total_bytes = 0
+
+        os.makedirs(directory, exist_ok=True)
+        for file_name in os.listdir(directory):
+            if not file_name.endswith(".json"):
+                continue
+            stat = os.stat(os.path.join(directory, file_name))
+            self.index[file_name[:-5]] = [stat.st_size, stat.st_mtime]
+            self.total_bytes += stat.st_size
+
+    def make_key(self, url, params=None, headers=None):
+        """
+        요청을 구분하는 캐시 key를 만듭니다.
+        토큰마다 볼 수 있는 데이터가 다르므로 Authorization과 Accept 헤더도 key에 포함합니다.
+        """
+        headers = headers or {}
+        material = json.dumps([
+            url,
+            sorted((params or {}).items()),
+            headers.get("Authorization"),
+            headers.get("Accept")
+        ], default=str)
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def load(self, key):
+        """
+        저장된 응답을 가져옵니다.
+
+        Returns:
+            dict: { "url", "headers", "body" } (없으면 None)
+        """
+        with self.lock:
+            if key not in self.index:
+                return None
+            try:
+                with open(self.path(key), encoding="utf-8") as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                self.discard(key)
+                return None
+
+            now = time.time()
+            self.index[key][1] = now
+            os.utime(self.path(key), (now, now))
+            return entry
+
+    def conditional_headers(self, entry):
+        """
+        저장된 응답으로 조건부 요청 헤더를 만듭니다.
+        """
+        headers = {}
+        if entry["headers"].get("ETag"):
+            headers["If-None-Match"] = entry["headers"]["ETag"]
+        if entry["headers"].get("Last-Modified"):
+            headers["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+        return headers
+
+    def save(self, key, response):
+        """
+        ETag나 Last-Modified가 있는 200 응답을 저장합니다.
+        """
+        if response.status_code != 200:
+            return
+        if "ETag" not in response.headers and "Last-Modified" not in response.headers:
+            return
+
+        entry = {
+            "url": response.url,
+            "headers": {name: response.headers[name] for name in CACHED_HEADERS if name in response.headers},
+            "body": response.content.decode("utf-8")
+        }
+        data = json.dumps(entry, ensure_ascii=False).encode("utf-8")
+
+        with self.lock:
+            self.discard(key)
+            # 다른 프로세스가 같은 파일을 읽는 중이어도 깨지지 않도록 임시 파일에 쓴 뒤 교체
+            temp_path = f"{self.path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, self.path(key))
+            self.index[key] = [len(data), time.time()]
+            self.total_bytes += len(data)
+            self.evict()
+
+    def discard(self, key):
+        """
+        항목 하나를 지웁니다. (lock을 잡은 상태에서 호출)
+        """
+        size, _ = self.index.pop(key, (0, 0))
+        self.total_bytes -= size
+        try:
+            os.remove(self.path(key))
+        except FileNotFoundError:
+            pass
+
+    def evict(self):
+        """
+        전체 크기가 max_bytes 이하가 될 때까지 가장 오래 사용하지 않은 항목을 지웁니다.
+        (lock을 잡은 상태에서 호출)
+        """
+        if self.total_bytes <= self.max_bytes:
+            return
+        for key in sorted(self.index, key=lambda k: self.index[k][1]):
+            self.discard(key)
+            if self.total_bytes <= self.max_bytes:
+                break
+
+    def to_response(self, entry, not_modified):
+        """
+        304 응답을 받았을 때 저장된 응답으로 200 응답 객체를 다시 만듭니다.
+
+        Args:
+            entry (dict): load()로 가져온 항목
+            not_modified (requests.Response): 서버의 304 응답
+
+        Returns:
+            requests.Response: 캐시된 본문과 헤더를 가진 응답
+        """
+        response = requests.models.Response()
+        response.status_code = 200
+        response.url = entry["url"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        # rate limit 등 최신 정보는 304 응답의 헤더를 사용
+        for name, value in not_modified.headers.items():
+            if name.lower().startswith("x-ratelimit"):
+                response.headers[name] = value
+        response._content = entry["body"].encode("utf-8")
+        response.encoding = "utf-8"
+        response.request = not_modified.request
+        response.from_cache = True
+        return response
+
+response_cache = None
+response_cache_lock = threading.Lock()
+
+def get_response_cache():
+    """
+    프로세스에서 공유하는 조건부 요청 캐시를 가져옵니다.
+
+    Returns:
+        ConditionalRequestCache: 캐시 (GITHUB_CACHE_DIR가 비어 있으면 None)
+    """
+    global response_cache
+    if not GITHUB_CACHE_DIR:
+        return None
+    with response_cache_lock:
+        if response_cache is None:
+            response_cache = ConditionalRequestCache(GITHUB_CACHE_DIR)
+    return response_cache
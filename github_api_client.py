@@ -0,0 +1,211 @@
+import os
+import time
+from urllib.parse import urlparse
+import requests
+from dotenv import load_dotenv
+
+from github_api_cache import get_response_cache
+from github_api_deadline import get_circuit_breaker, get_run_deadline
+from github_api_ratelimit import get_rate_limit_scheduler
+from http_client import get_http_client
+from pr_metrics import endpoint_name, get_metrics
+
+load_dotenv()
+
+# GitHub API 설정
+GITHUB_TOKEN = os.getenv("PR_GITHUB_TOKEN")
+GITHUB_API_BASE = os.getenv("GITHUB_API_BASE", "https://api.github.com")
+
+# GitHub API host에 유지할 keep-alive 연결 수 (동시 조회 수보다 크거나 같게)
+GITHUB_POOL_SIZE = int(os.getenv("GITHUB_POOL_SIZE", "16"))
+
+def github_headers(accept="application/vnd.github.v3+json"):
+    """
+    GitHub API 요청에 사용할 기본 헤더를 만듭니다.
+
+    Args:
+        accept (str): Accept 헤더 값
+
+    Returns:
+        dict: 요청 헤더
+    """
+    return {
+        "Authorization": f"token {GITHUB_TOKEN}",
+        "Accept": accept
+    }
+
+# 요청마다 새로 만들지 않고 공유하는 기본 헤더
+GITHUB_HEADERS = github_headers()
+
+get_http_client().configure_host(GITHUB_API_BASE, GITHUB_POOL_SIZE)
+
+def rate_limit_resource(url):
+    """
+    요청 URL이 어떤 rate limit resource의 예산을 쓰는지 추정합니다.
+    (응답을 받으면 X-RateLimit-Resource 헤더 값으로 갱신됨)
+    """
+    if url.endswith("/graphql"):
+        return "graphql"
+    if "/search/" in url:
+        return "search"
+    return "core"
+
+def send_github_request(method, url, **kwargs):
+    """
+    rate limit scheduler를 거쳐 GitHub API 요청을 보냅니다.
+    예산이 부족하면 기다렸다가 보내고, rate limit / 일시적 서버 오류 응답은 재시도합니다.
+    실행 마감 시각(github_api_deadline)을 넘기는 대기나 요청은 하지 않고, timeout도 남은 시간에 맞춰 줄입니다.
+    재시도해도 연속으로 실패한 경로는 circuit breaker가 잠시 요청을 멈춥니다.
+
+    Args:
+        method (str): HTTP method
+        url (str): 요청 URL
+        **kwargs: HttpClient.request에 전달할 인자
+
+    Returns:
+        requests.Response: 마지막으로 받은 응답 (상태 코드는 확인하지 않음)
+
+    Raises:
+        DeadlineExceeded: 실행 마감 시각이 지났거나 기다리면 지나게 됨
+        CircuitOpenError: 경로가 멈춘 상태
+        requests.exceptions.RequestException: 연결 오류 / timeout
+    """
+    scheduler = get_rate_limit_scheduler()
+    metrics = get_metrics()
+    deadline = get_run_deadline()
+    breaker = get_circuit_breaker()
+    client = get_http_client()
+    resource = rate_limit_resource(url)
+    endpoint = endpoint_name(url)
+    # circuit breaker는 endpoint 종류가 아니라 실제 경로별로 셈 (repository 하나의 오류로 다른 repository까지 멈추지 않도록)
+    path = urlparse(url).path
+    timeout = kwargs.pop("timeout", client.timeout)
+    deadline.check(url)
+    probing = breaker.check(path)
+    try:
+        attempt = 0
+        while True:
+            deadline.check(url)
+            scheduler.wait(resource, deadline, url)
+
+            started = time.perf_counter()
+            try:
+                response = client.request(method, url, timeout=deadline.timeout(timeout), **kwargs)
+            except requests.exceptions.RequestException:
+                metrics.inc("github_requests_total", endpoint=endpoint, method=method, status="error")
+                record_circuit_result(breaker, path, endpoint, failed=True)
+                raise
+            metrics.observe("github_request_seconds", time.perf_counter() - started, endpoint=endpoint, method=method)
+            metrics.inc("github_requests_total", endpoint=endpoint, method=method, status=response.status_code)
+            metrics.inc("github_response_bytes_total", len(response.content), endpoint=endpoint)
+            metrics.inc("github_request_bytes_total", len(response.request.body or b""), endpoint=endpoint)
+            scheduler.update(response)
+
+            delay = scheduler.retry_delay(response, attempt)
+            # 더 기다릴 시간이 없으면 마지막 응답을 그대로 돌려줌 (호출하는 쪽에서 오류로 처리)
+            if delay is None or not deadline.allows(delay):
+                # 재시도를 모두 마친 요청 하나를 실패 / 성공 1번으로 셈
+                # rate limit 응답은 경로의 장애가 아니므로 실패로 세지 않고, 연속 실패 횟수를 지우지 않도록 성공으로도 세지 않음
+                if not scheduler.is_rate_limited(response):
+                    record_circuit_result(breaker, path, endpoint, failed=response.status_code >= 500)
+                return response
+            metrics.inc("github_retries_total", endpoint=endpoint, status=response.status_code)
+            print(f"GitHub API 응답 {response.status_code}, {delay:.1f}초 후 재시도합니다. ({url})")
+            scheduler.sleep(delay)
+            attempt += 1
+    finally:
+        # 시험 요청이 결과를 기록하지 못하고 끝나도(DeadlineExceeded 등) 경로가 계속 시험 중으로 남지 않도록 함
+        if probing:
+            breaker.release(path)
+
+def record_circuit_result(breaker, path, endpoint, failed):
+    """
+    요청 하나의 최종 결과를 circuit breaker에 기록합니다.
+    """
+    if not failed:
+        breaker.record_success(path)
+    elif breaker.record_failure(path):
+        get_metrics().inc("github_circuit_opened_total", endpoint=endpoint)
+
+def github_get(url, params=None, headers=None):
+    """
+    GitHub API에 GET 요청을 보냅니다.
+    이전에 받은 응답이 캐시에 있으면 조건부 요청을 보내고, 304 응답이면 캐시된 응답을 돌려줍니다.
+
+    Args:
+        url (str): 요청 URL
+        params (dict): query parameter
+        headers (dict): 요청 헤더 (None이면 GITHUB_HEADERS)
+
+    Returns:
+        requests.Response: 성공한 응답
+
+    Raises:
+        requests.exceptions.RequestException: API 요청 실패
+    """
+    if headers is None:
+        headers = GITHUB_HEADERS
+
+    cache = get_response_cache()
+    entry = None
+    if cache is not None:
+        cache_key = cache.make_key(url, params, headers)
+        entry = cache.load(cache_key)
+        if entry is not None:
+            headers = {**headers, **cache.conditional_headers(entry)}
+
+    response = send_github_request("GET", url, headers=headers, params=params)
+    if entry is not None and response.status_code == 304:
+        return cache.to_response(entry, response)
+
+    # check HTTP response status code and raise exception if there is an error
+    response.raise_for_status()
+    if cache is not None:
+        cache.save(cache_key, response)
+    return response
+
+def github_post(url, json=None, headers=None):
+    """
+    GitHub API에 POST 요청을 보냅니다. (GraphQL API 등)
+
+    Args:
+        url (str): 요청 URL
+        json (dict): 요청 본문
+        headers (dict): 요청 헤더 (None이면 GITHUB_HEADERS)
+
+    Returns:
+        requests.Response: 성공한 응답
+
+    Raises:
+        requests.exceptions.RequestException: API 요청 실패
+    """
+    if headers is None:
+        headers = GITHUB_HEADERS
+
+    response = send_github_request("POST", url, headers=headers, json=json)
+    response.raise_for_status()
+    return response
+
+def iter_pages(url, params=None, headers=None):
+    """
+    Link 헤더의 rel="next"를 따라가며 목록 API의 모든 페이지를 가져옵니다.
+    페이지가 도착할 때마다 항목을 하나씩 yield 하므로 마지막 페이지를
+    기다리지 않고 바로 처리를 시작할 수 있습니다.
+
+    Args:
+        url (str): 첫 페이지 요청 URL
+        params (dict): 첫 페이지 query parameter (다음 페이지 URL에는 이미 포함됨)
+        headers (dict): 요청 헤더 (None이면 GITHUB_HEADERS)
+
+    Yields:
+        dict: 목록 API의 항목 (repository, pull request 등)
+
+    Raises:
+        requests.exceptions.RequestException: API 요청 실패
+    """
+    while url:
+        response = github_get(url, params, headers)
+        yield from response.json()
+
+        url = response.links.get("next", {}).get("url")
+        params = None
@@ -0,0 +1,177 @@
+import os
+import threading
+import time
+import requests
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 같은 경로(URL path)로 보낸 요청이 재시도까지 모두 실패(연결 오류 / timeout / 5xx)하기를
+# 이 횟수만큼 연속으로 반복하면 그 경로로는 요청을 멈춤
+GITHUB_CIRCUIT_THRESHOLD = int(os.getenv("GITHUB_CIRCUIT_THRESHOLD", "5"))
+# 멈춘 경로에 다시 요청해 볼 때까지 기다리는 시간 (초)
+GITHUB_CIRCUIT_COOLDOWN = float(os.getenv("GITHUB_CIRCUIT_COOLDOWN", "60"))
+
+class DeadlineExceeded(requests.exceptions.RequestException):
+    """
+    실행 시간 제한을 넘어 요청을 보내지 않았습니다.
+    """
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """
+    연속으로 실패한 경로라 요청을 보내지 않았습니다.
+    """
+
+class RunDeadline:
+    """
+    실행 전체의 마감 시각입니다. 모든 GitHub 요청은 보내기 전에 마감 시각을 확인하고,
+    timeout과 재시도 대기 시간도 남은 시간을 넘지 않게 줄입니다.
+
+    여러 프로세스가 같은 마감 시각을 쓰도록 epoch 시각(time.time)으로 저장합니다.
+    """
+
+    def __init__(self):
+        self.deadline = None
+
+    def start(self, budget):
+        """
+        지금부터 budget초 뒤를 마감 시각으로 정합니다. (0 이하면 제한 없음)
+        """
+        self.deadline = time.time() + budget if budget > 0 else None
+
+    def set(self, deadline):
+        """
+        다른 프로세스에서 정한 마감 시각을 그대로 씁니다. (None이면 제한 없음)
+        """
+        self.deadline = deadline
+
+    def remaining(self):
+        """
+        Returns:
+            float: 마감까지 남은 시간(초, 제한이 없으면 None)
+        """
+        if self.deadline is None:
+            return None
+        return self.deadline - time.time()
+
+    def check(self, url):
+        """
+        Raises:
+            DeadlineExceeded: 마감 시각이 지났음
+        """
+        remaining = self.remaining()
+        if remaining is not None and remaining <= 0:
+            raise DeadlineExceeded(f"실행 시간 제한을 넘어 요청하지 않았습니다: {url}")
+
+    def allows(self, delay):
+        """
+        delay초 기다린 뒤에도 마감 전이면 True를 돌려줍니다.
+        """
+        remaining = self.remaining()
+        return remaining is None or delay < remaining
+
+    def timeout(self, timeout):
+        """
+        요청 timeout을 남은 시간에 맞춰 줄입니다.
+
+        Args:
+            timeout (tuple): (연결 timeout, 응답 읽기 timeout) 또는 timeout 하나
+
+        Returns:
+            tuple: 남은 시간을 넘지 않는 timeout (timeout 하나를 받았으면 float)
+        """
+        remaining = self.remaining()
+        if remaining is None or timeout is None:
+            return timeout
+        remaining = max(0.1, remaining)
+        if isinstance(timeout, tuple):
+            return tuple(min(value, remaining) for value in timeout)
+        return min(timeout, remaining)
+
+class CircuitBreaker:
+    """
+    경로(예: /repos/o/r/pulls)별 연속 실패 횟수를 세고, threshold번 연속 실패하면 cooldown 동안
+    그 경로로 요청을 보내지 않습니다. 실패는 재시도를 모두 마친 요청 하나당 1번으로 셉니다.
+    cooldown이 지나면 요청 하나만 보내 보고(half-open), 성공하면 다시 열고 실패하면 다시 cooldown 동안 멈춥니다.
+
+    여러 스레드에서 동시에 사용할 수 있습니다.
+    """
+
+    def __init__(self, threshold=GITHUB_CIRCUIT_THRESHOLD, cooldown=GITHUB_CIRCUIT_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.lock = threading.Lock()
+        # { path: 연속 실패 횟수 }
+        self.failures = {}
+        # { path: 다시 요청해 볼 수 있는 시각 }
+        self.open_until = {}
+        # 시험 요청을 보내는 중인 path
+        self.probing = set()
+
+    def check(self, path):
+        """
+        요청을 보내기 전에 호출합니다.
+
+        Returns:
+            bool: 이 요청이 시험 요청이면 True (요청이 끝나면 결과와 관계없이 release를 호출해야 함)
+
+        Raises:
+            CircuitOpenError: 경로가 멈춘 상태
+        """
+        if self.threshold <= 0:
+            return False
+        with self.lock:
+            open_until = self.open_until.get(path)
+            if open_until is None:
+                return False
+            if time.monotonic() < open_until or path in self.probing:
+                raise CircuitOpenError(f"연속 {self.failures.get(path, 0)}번 실패한 경로라 요청하지 않았습니다: {path}")
+            self.probing.add(path)
+            return True
+
+    def release(self, path):
+        """
+        시험 요청이 끝났음을 기록합니다.
+        성공 / 실패를 기록하기 전에 예외(DeadlineExceeded 등)로 끝나거나 rate limit 응답이라 결과를 기록하지 않아도
+        다음 요청이 다시 시험해 볼 수 있도록 합니다.
+        """
+        with self.lock:
+            self.probing.discard(path)
+
+    def record_success(self, path):
+        with self.lock:
+            self.failures.pop(path, None)
+            self.open_until.pop(path, None)
+            self.probing.discard(path)
+
+    def record_failure(self, path):
+        """
+        실패를 기록합니다.
+
+        Returns:
+            bool: 이번 실패로 경로를 멈췄으면 True
+        """
+        if self.threshold <= 0:
+            return False
+        with self.lock:
+            self.failures[path] = self.failures.get(path, 0) + 1
+            self.probing.discard(path)
+            if self.failures[path] < self.threshold:
+                return False
+            self.open_until[path] = time.monotonic() + self.cooldown
+            return True
+
+run_deadline = RunDeadline()
+circuit_breaker = CircuitBreaker()
+
+def get_run_deadline():
+    """
+    프로세스에서 공유하는 실행 마감 시각을 가져옵니다.
+    """
+    return run_deadline
+
+def get_circuit_breaker():
+    """
+    프로세스에서 공유하는 GitHub 경로별 circuit breaker를 가져옵니다.
+    """
+    return circuit_breaker
@@ -0,0 +1,315 @@
+import requests
+import math
+import os
+from dotenv import load_dotenv
+
+from github_api_client import github_post
+from github_api_ratelimit import get_rate_limit_scheduler
+
+load_dotenv()
+
+# GitHub GraphQL API 설정
+GITHUB_API_BASE = os.getenv("GITHUB_API_BASE", "https://api.github.com")
+GITHUB_GRAPHQL_URL = f"{GITHUB_API_BASE}/graphql"
+
+# 쿼리 1번에 허용할 최대 rate limit 비용 (GitHub 기준 point)
+GITHUB_GRAPHQL_MAX_COST = int(os.getenv("GITHUB_GRAPHQL_MAX_COST", "10"))
+
+# 첫 쿼리에서 repository마다 가져올 PR 수 (이후 실제 PR 수를 보고 조정)
+INITIAL_PR_PAGE_SIZE = 10
+# PR마다 가져올 label 수
+LABEL_PAGE_SIZE = 20
+
+# format_pull_request가 사용하는 필드만 요청
+PULL_REQUEST_FIELDS = f"""
+fragment PullRequestFields on PullRequest {{
+  number
+  title
+  body
+  state
+  createdAt
+  updatedAt
+  url
+  isDraft
+  author {{ login }}
+  labels(first: {LABEL_PAGE_SIZE}) {{ nodes {{ name }} }}
+}}
+"""
+
+REPOSITORIES_QUERY = """
+query($first: Int!, $after: String, $prFirst: Int!, $privacy: RepositoryPrivacy, $states: [PullRequestState!]) {
+  rateLimit { cost remaining }
+  viewer {
+    repositories(first: $first, after: $after, privacy: $privacy,
+                 affiliations: [OWNER, COLLABORATOR, ORGANIZATION_MEMBER],
+                 orderBy: {field: CREATED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        name
+        url
+        description
+        isPrivate
+        owner { login }
+        pullRequests(first: $prFirst, states: $states, orderBy: {field: UPDATED_AT, direction: DESC}) {
+          pageInfo { hasNextPage endCursor }
+          nodes { ...PullRequestFields }
+        }
+      }
+    }
+  }
+}
+""" + PULL_REQUEST_FIELDS
+
+PULL_REQUESTS_QUERY = """
+query($owner: String!, $name: String!, $first: Int!, $after: String, $states: [PullRequestState!]) {
+  rateLimit { cost remaining }
+  repository(owner: $owner, name: $name) {
+    pullRequests(first: $first, after: $after, states: $states, orderBy: {field: UPDATED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes { ...PullRequestFields }
+    }
+  }
+}
+""" + PULL_REQUEST_FIELDS
+
+# REST API의 state / type 값을 GraphQL enum으로 변환
+PULL_REQUEST_STATES = {
+    "open": ["OPEN"],
+    "closed": ["CLOSED", "MERGED"],
+    "all": None
+}
+REPOSITORY_PRIVACY = {
+    "private": "PRIVATE",
+    "public": "PUBLIC"
+}
+
+class GraphQLError(requests.exceptions.RequestException):
+    """
+    GraphQL 응답에 errors가 포함된 경우 발생합니다.
+    """
+
+def run_query(query, variables):
+    """
+    GraphQL 쿼리를 실행합니다.
+
+    Args:
+        query (str): GraphQL 쿼리
+        variables (dict): 쿼리 변수
+
+    Returns:
+        dict: 응답의 data 부분
+
+    Raises:
+        requests.exceptions.RequestException: API 요청 실패 또는 GraphQL 에러
+    """
+    response = github_post(GITHUB_GRAPHQL_URL, json={"query": query, "variables": variables})
+    result = response.json()
+    if result.get("errors"):
+        messages = ", ".join(error.get("message", "") for error in result["errors"])
+        raise GraphQLError(f"GraphQL query failed: {messages}")
+
+    data = result["data"]
+    if data.get("rateLimit"):
+        get_rate_limit_scheduler().record_cost("graphql", data["rateLimit"]["cost"])
+    return data
+
+def estimate_query_cost(repo_page_size, pr_page_size):
+    """
+    repository 목록 쿼리의 rate limit 비용을 추정합니다.
+    GitHub은 connection마다 필요한 요청 수를 더해 100으로 나눈 값(최소 1)을 비용으로 계산합니다.
+
+    Args:
+        repo_page_size (int): 한 번에 가져올 repository 수
+        pr_page_size (int): repository마다 가져올 PR 수
+
+    Returns:
+        int: 예상 비용
+    """
+    # repositories 1번 + repository마다 pullRequests 1번 + PR마다 labels 1번
+    requests_needed = 1 + repo_page_size + repo_page_size * pr_page_size
+    return max(1, math.ceil(requests_needed / 100))
+
+def choose_page_sizes(pr_page_size, max_cost=None):
+    """
+    쿼리 1번의 비용이 max_cost를 넘지 않도록 repository 페이지 크기를 정합니다.
+
+    Args:
+        pr_page_size (int): repository마다 가져올 PR 수 (1~100)
+        max_cost (int): 쿼리 1번에 허용할 최대 비용 (None이면 GITHUB_GRAPHQL_MAX_COST)
+
+    Returns:
+        tuple: (repository 페이지 크기, PR 페이지 크기)
+    """
+    if max_cost is None:
+        max_cost = GITHUB_GRAPHQL_MAX_COST
+
+    pr_page_size = min(100, max(1, pr_page_size))
+    repo_page_size = 100
+    while repo_page_size > 1 and estimate_query_cost(repo_page_size, pr_page_size) > max_cost:
+        repo_page_size -= 1
+    return repo_page_size, pr_page_size
+
+def to_rest_repository(node):
+    """
+    GraphQL repository 노드를 REST API repository 형태의 dict로 변환합니다.
+    """
+    return {
+        "name": node["name"],
+        "full_name": f"{node['owner']['login']}/{node['name']}",
+        "html_url": node["url"],
+        "description": node["description"],
+        "private": node["isPrivate"]
+    }
+
+def to_rest_pull_request(node):
+    """
+    GraphQL pull request 노드를 REST API pull request 형태의 dict로 변환합니다.
+    """
+    author = node["author"] or {"login": "ghost"}
+    return {
+        "number": node["number"],
+        "title": node["title"],
+        "body": node["body"],
+        "state": "open" if node["state"] == "OPEN" else "closed",
+        "user": {"login": author["login"]},
+        "created_at": node["createdAt"],
+        "updated_at": node["updatedAt"],
+        "html_url": node["url"],
+        "draft": node["isDraft"],
+        "labels": [{"name": label["name"]} for label in node["labels"]["nodes"]]
+    }
+
+def fetch_remaining_pull_requests(owner, repo, after, states):
+    """
+    repository 목록 쿼리에서 다 가져오지 못한 PR을 이어서 가져옵니다.
+
+    Args:
+        owner (str): repository 소유자
+        repo (str): repository 이름
+        after (str): 이어서 가져올 cursor
+        states (list): GraphQL PullRequestState 목록 (None이면 전체)
+
+    Returns:
+        tuple: (REST 형태의 pull request 목록, 사용한 비용)
+
+    Raises:
+        GraphQLError: repository를 찾을 수 없음 (목록을 가져온 뒤 지워졌거나 이름이 바뀌었거나 권한이 없어짐)
+        requests.exceptions.RequestException: API 요청 실패
+    """
+    pull_requests = []
+    cost = 0
+    has_next_page = True
+    while has_next_page:
+        data = run_query(PULL_REQUESTS_QUERY, {
+            "owner": owner,
+            "name": repo,
+            "first": 100,
+            "after": after,
+            "states": states
+        })
+        cost += data["rateLimit"]["cost"]
+        if data["repository"] is None:
+            raise GraphQLError(f"repository를 찾을 수 없습니다: {owner}/{repo}")
+        connection = data["repository"]["pullRequests"]
+        pull_requests.extend(to_rest_pull_request(node) for node in connection["nodes"])
+        has_next_page = connection["pageInfo"]["hasNextPage"]
+        after = connection["pageInfo"]["endCursor"]
+    return pull_requests, cost
+
+def get_all_pull_requests_graphql(owner, state="open", repo_type="private", failures=None, owner_type="self"):
+    """
+    GitHub GraphQL API로 모든 repository와 pull request를 한꺼번에 가져옵니다.
+    repository마다 REST 요청을 보내는 대신 repository 페이지마다 쿼리 1번으로
+    PR까지 함께 가져오며, 반환 형태는 get_all_pull_requests와 같습니다.
+
+    Args:
+        owner (str): 사용자명 또는 organization 이름 (REST와 같이 인증된 사용자의 repository를 조회)
+        state (str): PR 상태 ("open"(default), "closed", "all")
+        repo_type (str): repository 타입 ("all", "private"(default), "public")
+        failures (dict): 전달하면 PR 조회에 실패한 { 레포이름: 에러 메시지 }가 채워짐
+        owner_type (str): owner 종류 (viewer의 repository를 조회하므로 "self"만 지원)
+
+    Returns:
+        dict: { 레포이름 : { "repository": 레포정보, "pull_requests": 풀리퀘스트정보 } , ...}
+
+    Raises:
+        ValueError: owner_type이 "self"가 아님
+    """
+    if owner_type != "self":
+        raise ValueError(f"GraphQL 조회는 토큰 사용자 본인의 repository만 지원합니다: {owner_type}:{owner}")
+    print(f"'{owner}'의 {repo_type} repository들을 GraphQL로 검색 중...")
+
+    if failures is None:
+        failures = {}
+
+    states = PULL_REQUEST_STATES.get(state)
+    privacy = REPOSITORY_PRIVACY.get(repo_type)
+
+    all_pull_requests = {}
+    repo_count = 0
+    total_cost = 0
+    pr_page_size = INITIAL_PR_PAGE_SIZE
+    after = None
+    has_next_page = True
+
+    while has_next_page:
+        repo_page_size, pr_page_size = choose_page_sizes(pr_page_size)
+        try:
+            data = run_query(REPOSITORIES_QUERY, {
+                "first": repo_page_size,
+                "after": after,
+                "prFirst": pr_page_size,
+                "privacy": privacy,
+                "states": states
+            })
+        except requests.exceptions.RequestException as e:
+            print(f"Repository list fetching failed: {e}")
+            # 이후 페이지의 repository는 조회하지 못했으므로 owner 전체를 실패로 기록
+            failures["*"] = str(e)
+            break
+
+        total_cost += data["rateLimit"]["cost"]
+        connection = data["viewer"]["repositories"]
+        has_next_page = connection["pageInfo"]["hasNextPage"]
+        after = connection["pageInfo"]["endCursor"]
+
+        largest_page = 0
+        overflowed = False
+        for node in connection["nodes"]:
+            repo_count += 1
+            repo_name = node["name"]
+            pr_connection = node["pullRequests"]
+            pull_requests = [to_rest_pull_request(pr) for pr in pr_connection["nodes"]]
+            largest_page = max(largest_page, len(pull_requests))
+
+            if pr_connection["pageInfo"]["hasNextPage"]:
+                overflowed = True
+                try:
+                    remaining, cost = fetch_remaining_pull_requests(
+                        node["owner"]["login"], repo_name, pr_connection["pageInfo"]["endCursor"], states
+                    )
+                except requests.exceptions.RequestException as e:
+                    failures[repo_name] = str(e)
+                    print(f"  - {repo_name} → PR 조회 실패: {e}")
+                    continue
+                pull_requests.extend(remaining)
+                total_cost += cost
+
+            if pull_requests:
+                all_pull_requests[repo_name] = {
+                    "repository": to_rest_repository(node),
+                    "pull_requests": pull_requests
+                }
+                print(f"  - {repo_name} → {len(pull_requests)}개의 PR 발견")
+
+        # PR이 페이지를 넘친 repository가 있으면 PR 페이지를 늘려 추가 쿼리를 줄이고,
+        # PR이 적으면 PR 페이지를 줄여 같은 비용으로 더 많은 repository를 가져옴
+        if overflowed:
+            pr_page_size = pr_page_size * 2
+        elif largest_page * 2 <= pr_page_size:
+            pr_page_size = max(INITIAL_PR_PAGE_SIZE, pr_page_size // 2)
+
+    print(f"총 {repo_count}개의 repository를 찾았습니다. (GraphQL 비용: {total_cost})")
+    if failures:
+        print(f"⚠️  {len(failures)}개 repository의 PR 조회 실패: {', '.join(failures)}")
+    return all_pull_requests
@@ -1,87 +1,264 @@
 import requests
+import hashlib
 import json
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from datetime import datetime
 import os
+import time
 from dotenv import load_dotenv
 
+from github_api_client import iter_pages
+from github_api_repo_cache import iter_cached_repositories
+from github_api_graphql import get_all_pull_requests_graphql
+from github_api_search import get_all_pull_requests_search
+from github_api_ratelimit import get_rate_limit_scheduler
+from github_api_deadline import get_run_deadline
+from slack_delivery import get_slack_delivery_queue
+from slack_dedup import get_sent_message_store
+from slack_web_api import get_slack_digest_publisher
+from pr_watermarks import HighWaterMarks
+from pr_index import PullRequestIndex
+from pr_metrics import get_metrics
+from pr_enrichment import enrich_results
+from pr_analytics import analyze_pull_requests
+from pr_records import PullRequestRecord, RepositoryRecord, compact_pull_requests, repository_full_name
+from pr_snapshot import (
+    PullRequestSnapshot, resolve_gone_pull_requests, format_closed_pull_requests, make_summary_data,
+    count_closed_by_repository
+)
+from slack_sub1 import send_daily_summary
+from slack_message_builder import SlackMessageBuilder, SLACK_MAX_MESSAGE_CHARS, PR_BODY_MAX_CHARS
+
 load_dotenv()
 
 # Slack Webhook URL (실제 webhook URL로 교체하세요)
 SLACK_WEBHOOK_URL = os.getenv("SLACK_WEBHOOK_URL")
 
 # GitHub API 설정
-GITHUB_TOKEN = os.getenv("PR_GITHUB_TOKEN")
-GITHUB_API_BASE = "https://api.github.com"
+GITHUB_API_BASE = os.getenv("GITHUB_API_BASE", "https://api.github.com")
+
+# 동시에 PR을 조회할 repository 수 (1이면 순차 실행)
+GITHUB_MAX_WORKERS = int(os.getenv("GITHUB_MAX_WORKERS", "8"))
+
+# PR 조회 방식 ("rest"(default): repository마다 REST 요청, "graphql": GraphQL 일괄 조회,
+#               "search": 검색 API로 owner의 PR을 한 번에 조회, PR이 있는 repository 정보만 따로 요청)
+GITHUB_FETCH_BACKEND = os.getenv("GITHUB_FETCH_BACKEND", "rest")
+
+# 1이면 지난 실행 이후 변경된 PR만 가져와서 알림 (high-water mark 사용)
+PR_NOTIFY_INCREMENTAL = os.getenv("PR_NOTIFY_INCREMENTAL", "0") == "1"
+# 변경분만 가져올 때의 페이지 크기
+INCREMENTAL_PAGE_SIZE = 20
+
+# digest 방식 ("full"(default): 모든 open PR, "diff": 지난 digest 이후 새로 열렸거나 변경 / merge / close 된 PR만)
+# diff는 전체 open PR 목록과 비교해야 하므로 PR_NOTIFY_INCREMENTAL은 무시
+PR_NOTIFY_DIGEST_MODE = os.getenv("PR_NOTIFY_DIGEST_MODE", "full")
+
+# 1이면 로컬 PR index(SQLite)를 변경분만 갱신하고 알림은 index에서 만듦
+PR_NOTIFY_USE_INDEX = os.getenv("PR_NOTIFY_USE_INDEX", "0") == "1"
+
+# 1이면 digest에 넣을 PR마다 merge 가능 여부 / 리뷰 / CI 상태를 가져와 표시 (head SHA별로 캐시)
+PR_NOTIFY_ENRICH = os.getenv("PR_NOTIFY_ENRICH", "0") == "1"
+
+# digest 전송 방식
+#   "webhook"(default) → 실행할 때마다 incoming webhook으로 digest 전체를 새로 보냄
+#   "web_api"          → Slack Web API(SLACK_BOT_TOKEN)로 처음 한 번 보내고, 다음부터는 같은 메시지를 바뀐 부분만 고침
+SLACK_TRANSPORT = os.getenv("SLACK_TRANSPORT", "webhook")
+
+# 1이면 PR을 가져오는 대로 렌더링해서 보냄 (pr_pipeline, 전체 목록 digest와 REST 조회 방식에서만 사용)
+# 첫 메시지가 나머지 repository를 가져오는 동안 나가고 메모리 사용량이 queue 크기로 제한됨
+PR_NOTIFY_PIPELINE = os.getenv("PR_NOTIFY_PIPELINE", "0") == "1"
+# PR_NOTIFY_PIPELINE의 실행 단위 중복 확인 기간 (초)
+# pipeline은 PR을 다 가져오기 전에 보내기 시작하므로 PR 목록으로 중복을 확인할 수 없어서, 같은 owner들의 digest를
+# 이 기간 안에 한 번만 보냄 (PR이 바뀌어도 다시 보내지 않으므로 cron이 몰아서 실행되는 기간만큼으로 짧게 둠)
+PR_PIPELINE_DEDUP_WINDOW = float(os.getenv("PR_PIPELINE_DEDUP_WINDOW", "3600"))
+
+# 실행 전체의 시간 제한 (초, 0이면 제한 없음)
+# 이 시간 안에 가져온 PR만으로 digest를 만들고, 가져오지 못한 repository는 digest 끝에 따로 적음
+PR_NOTIFY_RUN_BUDGET = float(os.getenv("PR_NOTIFY_RUN_BUDGET", "600"))
+# 시간 제한 중 렌더링과 Slack 전송을 위해 남겨 둘 시간 (초)
+PR_NOTIFY_SEND_RESERVE = float(os.getenv("PR_NOTIFY_SEND_RESERVE", "60"))
+# digest 끝에 적을 조회하지 못한 repository의 최대 수
+SKIPPED_REPOSITORIES_LIMIT = 20
+
+# 알림 대상 owner 목록 (쉼표로 구분)
+#   "org:이름"  → organization (/orgs/{org}/repos)
+#   "user:이름" → 다른 사용자 (/users/{username}/repos)
+#   "이름"      → 토큰의 사용자 본인 (/user/repos, collaborator / organization member repository 포함)
+PR_NOTIFY_OWNERS = os.getenv("PR_NOTIFY_OWNERS", "samdasoo2l")
+# owner를 나눠 조회할 프로세스 수 (0이면 owner 수와 CPU 수 중 작은 값, 1이면 프로세스를 나누지 않음)
+PR_NOTIFY_OWNER_PROCESSES = int(os.getenv("PR_NOTIFY_OWNER_PROCESSES", "0"))
+# 1이면 repository 목록 캐시를 무시하고 목록을 다시 가져옴 (새로 만든 repository를 TTL을 기다리지 않고 반영할 때)
+# 캐시를 지우기만 하려면 python github_api_repo_cache.py invalidate [--owner 이름]
+PR_NOTIFY_REFRESH_REPOS = os.getenv("PR_NOTIFY_REFRESH_REPOS", "0") == "1"
+
+# digest를 보낼 채널
+DIGEST_CHANNEL = "#general"
+# digest 첫 메시지의 제목
+DIGEST_TITLE = "*모든 PR 목록:*\n"
+DIFF_DIGEST_TITLE = "*지난 알림 이후 새로 열렸거나 변경된 PR:*\n"
+INCREMENTAL_DIGEST_TITLE = "*지난 실행 이후 변경된 PR:*\n"
 
-def get_repositories(owner, repo_type="all"):
+def parse_owners(value):
+    """
+    PR_NOTIFY_OWNERS 형식의 문자열을 owner 목록으로 바꿉니다.
+    
+    Args:
+        value (str): 예) "samdasoo2l, org:my-org, user:octocat"
+    
+    Returns:
+        list: [(owner, owner_type), ...] (owner_type은 "self", "user", "org")
+    """
+    owners = []
+    for item in value.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        owner_type, _, owner = item.rpartition(":")
+        if owner_type not in ("", "user", "org"):
+            raise ValueError(f"알 수 없는 owner 형식입니다: {item}")
+        owners.append((owner, owner_type or "self"))
+    return owners
+
+def repositories_url(owner, owner_type="self"):
+    """
+    owner 종류에 맞는 repository 목록 API URL을 만듭니다.
+    """
+    if owner_type == "org":
+        return f"{GITHUB_API_BASE}/orgs/{owner}/repos"
+    if owner_type == "user":
+        return f"{GITHUB_API_BASE}/users/{owner}/repos"
+    return f"{GITHUB_API_BASE}/user/repos"
+
+def iter_repositories(owner, repo_type="all", force_refresh=False, owner_type="self"):
     """
     type에 따라 사용자나 organization의
-    type에 맞는 모든 repository 목록을 가져옵니다.
+    type에 맞는 모든 repository를 페이지 단위로 가져오며 하나씩 yield 합니다.
+    repository 목록은 자주 바뀌지 않으므로 캐시된 목록이 있으면 그것을 사용합니다.
     
     Args:
         owner (str): 사용자명 또는 organization 이름
         repo_type (str): repository 타입 ("all"(default), "private", "public")
+        force_refresh (bool): True면 캐시를 무시하고 목록을 다시 가져옴
+        owner_type (str): owner 종류 ("self"(default): 토큰의 사용자 본인, "user": 다른 사용자, "org": organization)
     
-    Returns:
-        list: repository 목록
-    """
-    headers = {
-        "Authorization": f"token {GITHUB_TOKEN}",
-        "Accept": "application/vnd.github.v3+json"
-    }
+    Yields:
+        dict: repository 정보
     
-    url = f"{GITHUB_API_BASE}/user/repos"
+    Raises:
+        requests.exceptions.RequestException: API 요청 실패
+    """
+    url = repositories_url(owner, owner_type)
     params = {
         "type": repo_type,
         "per_page": 100,
         "sort": "created",
         "direction": "desc"
     }
+    # /users/{username}/repos는 type으로 private / public을 고를 수 없으므로 받은 뒤 거름
+    visibility = None
+    if owner_type == "user" and repo_type in ("private", "public"):
+        params["type"] = "owner"
+        visibility = repo_type == "private"
+    
+    for repo in iter_cached_repositories(owner, repo_type, url, params, force_refresh):
+        if visibility is None or repo["private"] == visibility:
+            yield repo
+
+def get_repositories(owner, repo_type="all", force_refresh=False, owner_type="self", failures=None):
+    """
+    type에 따라 사용자나 organization의
+    type에 맞는 모든 repository 목록을 가져옵니다.
+    
+    Args:
+        owner (str): 사용자명 또는 organization 이름
+        repo_type (str): repository 타입 ("all"(default), "private", "public")
+        force_refresh (bool): True면 캐시를 무시하고 목록을 다시 가져옴
+        owner_type (str): owner 종류 ("self"(default), "user", "org")
+        failures (dict): 전달하면 목록 조회에 실패했을 때 { "*": 에러 메시지 }가 채워짐
     
+    Returns:
+        list: repository 목록 (실패하면 빈 목록)
+    """
     try:
-        response = requests.get(url, headers=headers, params=params)
-        response.raise_for_status()
-        
-        repositories = response.json()
-        return repositories
+        return list(iter_repositories(owner, repo_type, force_refresh, owner_type))
         
     except requests.exceptions.RequestException as e:
         print(f"Repository list fetching failed: {e}")
+        if failures is not None:
+            failures["*"] = str(e)
         return []
 
-def get_pull_requests(owner, repo, state="open"):
+def iter_pull_requests(owner, repo, state="open", since=None):
     """
-    GitHub repository에서 pull request 목록을 가져옵니다.
+    GitHub repository의 pull request를 페이지 단위로 가져오며 하나씩 yield 합니다.
+    since를 주면 updated_at이 since 이후인 PR만 yield 하고,
+    그보다 오래된 PR이 나오면 다음 페이지를 요청하지 않고 멈춥니다.
     
     Args:
         owner (str): repository 소유자 (username 또는 organization)
         repo (str): repository 이름
         state (str): PR 상태 ("open"(default), "closed", "all")
+        since (str): 마지막으로 본 updated_at (ISO 8601, None이면 전체)
     
-    Returns:
-        list: pull request 목록
-    """
-    headers = {
-        "Authorization": f"token {GITHUB_TOKEN}",
-        "Accept": "application/vnd.github.v3+json"
-    }
+    Yields:
+        dict: pull request 정보
     
+    Raises:
+        requests.exceptions.RequestException: API 요청 실패
+        json.JSONDecodeError: 응답 JSON 파싱 실패
+    """
     url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}/pulls"
     params = {
         "state": state,
-        "per_page": 100,  # max number of pull requests to fetch at once
+        # max number of pull requests per page (since가 있으면 보통 첫 페이지에서 끝나므로 작게)
+        "per_page": 100 if since is None else INCREMENTAL_PAGE_SIZE,
         "sort": "updated",
         "direction": "desc"
     }
     
+    for pr in iter_pages(url, params):
+        # updated 내림차순이므로 since 이전 PR이 나오면 나머지도 모두 변경 없음
+        if since is not None and pr["updated_at"] <= since:
+            return
+        yield pr
+
+def fetch_pull_requests(owner, repo, state="open", since=None, compact=False):
+    """
+    GitHub repository에서 모든 페이지의 pull request 목록을 가져옵니다.
+    get_pull_requests와 달리 요청 실패 시 예외를 그대로 전달합니다.
+    
+    Args:
+        owner (str): repository 소유자 (username 또는 organization)
+        repo (str): repository 이름
+        state (str): PR 상태 ("open"(default), "closed", "all")
+        since (str): 마지막으로 본 updated_at (ISO 8601, None이면 전체)
+        compact (bool): True면 페이지를 받는 즉시 PullRequestRecord로 바꾸고 원본 응답은 버림
+    
+    Returns:
+        list: pull request 목록
+    
+    Raises:
+        requests.exceptions.RequestException: API 요청 실패
+        json.JSONDecodeError: 응답 JSON 파싱 실패
+    """
+    if compact:
+        return [PullRequestRecord.from_api(pr) for pr in iter_pull_requests(owner, repo, state, since)]
+    return list(iter_pull_requests(owner, repo, state, since))
+
+def get_pull_requests(owner, repo, state="open"):
+    """
+    GitHub repository에서 pull request 목록을 가져옵니다.
+    
+    Args:
+        owner (str): repository 소유자 (username 또는 organization)
+        repo (str): repository 이름
+        state (str): PR 상태 ("open"(default), "closed", "all")
+    
+    Returns:
+        list: pull request 목록 (실패 시 빈 목록)
+    """
     try:
-        response = requests.get(url, headers=headers, params=params)
-        # check HTTP response status code and raise exception if there is an error
-        response.raise_for_status()
-        
-        pull_requests = response.json()
-        return pull_requests
-        
+        return fetch_pull_requests(owner, repo, state)
     except requests.exceptions.RequestException as e:
         print(f"API request failed: {e}")
         return []
@@ -89,61 +266,300 @@ def get_pull_requests(owner, repo, state="open"):
         print(f"JSON parsing failed: {e}")
         return []
 
-def get_all_pull_requests(owner, state="open", repo_type="private"):
+def get_all_pull_requests(owner, state="open", repo_type="private", max_workers=None, failures=None, backend=None,
+                          watermarks=None, compact=False, owner_type="self", listed=None, force_refresh=False):
     """
     특정 사용자나 organization의 모든 repository에서 pull request를 가져옵니다.
+    repository별 PR 조회는 최대 max_workers개까지 동시에 실행됩니다.
     
     Args:
         owner (str): 사용자명 또는 organization 이름
         state (str): PR 상태 ("open"(default), "closed", "all")
         repo_type (str): repository 타입 ("all", "private"(default), "public")
+        max_workers (int): 동시 조회 수 (None이면 GITHUB_MAX_WORKERS, 1이면 순차 실행)
+        failures (dict): 전달하면 PR 조회에 실패한 { 레포이름: 에러 메시지 }가 채워짐
+        backend (str): 조회 방식 ("rest", "graphql", "search", None이면 GITHUB_FETCH_BACKEND)
+            graphql은 토큰 사용자 본인의 repository(owner_type="self")만 지원
+            search는 owner가 소유한 repository의 PR만 찾음 (collaborator로 참여한 repository는 제외)
+        watermarks (HighWaterMarks): 전달하면 마지막 실행 이후 변경된 PR만 가져오고
+            high-water mark를 올림 (REST 방식만 지원, 저장은 호출하는 쪽에서 save)
+        compact (bool): True면 repository와 PR을 받는 즉시 필요한 필드만 남긴
+            RepositoryRecord / PullRequestRecord로 바꿔 메모리 사용량을 줄임
+        owner_type (str): owner 종류 ("self"(default), "user", "org")
+        listed (list): 전달하면 repository 목록에서 찾은 모든 repository의 full_name이 채워짐 (REST 방식만 지원)
+        force_refresh (bool): True면 repository 목록 캐시를 무시하고 목록을 다시 가져옴 (REST 방식만 지원)
     
     Returns:
         dict: repository별 pull request 목록
         없으면 패스 있으면 레포이름에 레포지토리로 레포정보랑 풀리퀘스트로 풀리퀘스트 정보 전달
         { 레포이름 : { "repository": 레포정보, "pull_requests": 풀리퀘스트정보 } , ...}
+        순서는 repository 목록 순서와 같습니다.
     """
-    print(f"'{owner}'의 {repo_type} repository들을 검색 중...")
+    if backend is None:
+        backend = GITHUB_FETCH_BACKEND
+    if backend == "graphql":
+        if owner_type == "self":
+            all_pull_requests = get_all_pull_requests_graphql(owner, state, repo_type, failures, owner_type)
+            return compact_pull_requests(all_pull_requests) if compact else all_pull_requests
+        print(f"GraphQL 조회는 토큰 사용자 본인의 repository만 지원하므로 '{owner}'({owner_type})는 REST로 조회합니다.")
+    if backend == "search":
+        all_pull_requests = get_all_pull_requests_search(owner, state, repo_type, failures, owner_type)
+        return compact_pull_requests(all_pull_requests) if compact else all_pull_requests
     
-    # 모든 repository 가져오기
-    repositories = get_repositories(owner, repo_type)
-    
-    if not repositories:
-        print(f"'{owner}'의 repository를 찾을 수 없습니다.")
-        return {}
+    print(f"'{owner}'의 {repo_type} repository들을 검색 중...")
     
-    print(f"총 {len(repositories)}개의 repository를 찾았습니다.")
+    if failures is None:
+        failures = {}
+    if max_workers is None:
+        max_workers = GITHUB_MAX_WORKERS
     
     all_pull_requests = {}
     
-    for repo in repositories:
-        repo_name = repo["name"]
-        # repo_private = repo["private"]
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        # repository 목록은 페이지가 도착하는 대로 PR 조회를 바로 시작
+        futures = []
+        try:
+            for repo in iter_repositories(owner, repo_type, force_refresh, owner_type):
+                if compact:
+                    repo = RepositoryRecord.from_api(repo)
+                if listed is not None:
+                    listed.append(repository_full_name(owner, repo))
+                since = watermarks.get(owner, repo["name"], state) if watermarks is not None else None
+                repo_owner = repository_full_name(owner, repo).split("/")[0]
+                futures.append((repo, executor.submit(fetch_pull_requests, repo_owner, repo["name"], state, since,
+                                                      compact)))
+        except requests.exceptions.RequestException as e:
+            print(f"Repository list fetching failed: {e}")
+            # 실패한 페이지 이후의 repository는 조회하지 못했으므로 owner 전체를 실패로 기록
+            # (digest에 빠진 repository로 표시하고, diff 방식에서 PR이 사라진 것으로 보지 않음)
+            failures["*"] = str(e)
         
-        # # private repository만 처리 (repo_type이 "private"인 경우)
-        # if repo_type == "private" and not repo_private:
-        #     continue
-            
-        # # if repo_private ture print private, else print public
-        # print(f"  - {repo_name} ({'private' if repo_private else 'public'})")
+        if not futures:
+            print(f"'{owner}'의 repository를 찾을 수 없습니다.")
+            return {}
         
-        # 해당 repository의 pull request 가져오기
-        pull_requests = get_pull_requests(owner, repo_name, state)
+        print(f"총 {len(futures)}개의 repository를 찾았습니다.")
         
-        if pull_requests:
-            all_pull_requests[repo_name] = {
-                "repository": repo,
-                "pull_requests": pull_requests
-            }
-            print(f"    → {len(pull_requests)}개의 PR 발견")
-        else:
-            print(f"    → PR 없음")
+        # 완료 순서가 아니라 제출 순서대로 결과를 모아 항상 같은 순서를 유지
+        metrics = get_metrics()
+        for repo, future in futures:
+            repo_name = repo["name"]
+            try:
+                pull_requests = future.result()
+            except (requests.exceptions.RequestException, json.JSONDecodeError) as e:
+                metrics.inc("repository_fetch_failures_total", owner=owner)
+                failures[repo_name] = str(e)
+                print(f"  - {repo_name} → PR 조회 실패: {e}")
+                continue
+            
+            metrics.inc("repositories_fetched_total", owner=owner)
+            metrics.inc("pull_requests_fetched_total", len(pull_requests), owner=owner)
+            if pull_requests and watermarks is not None:
+                watermarks.advance(owner, repo_name, state, max(pr["updated_at"] for pr in pull_requests))
+            
+            if pull_requests:
+                all_pull_requests[repo_name] = {
+                    "repository": repo,
+                    "pull_requests": pull_requests
+                }
+                print(f"  - {repo_name} → {len(pull_requests)}개의 PR 발견")
+            elif watermarks is not None and watermarks.get(owner, repo_name, state) is not None:
+                # high-water mark 이후 변경분만 가져왔으면 빈 결과는 PR이 없다는 뜻이 아님
+                print(f"  - {repo_name} → 변경 없음")
+            else:
+                print(f"  - {repo_name} → PR 없음")
+    
+    if failures:
+        print(f"⚠️  {len(failures)}개 repository의 PR 조회 실패: {', '.join(failures)}")
     return all_pull_requests
 
+def fetch_owner_pull_requests(owner, owner_type="self", state="open", repo_type="private", incremental=False,
+                              deadline=None, force_refresh=False):
+    """
+    owner 한 명의 PR을 가져오고 걸린 시간과 API 사용량을 함께 돌려줍니다.
+    ProcessPoolExecutor에서 실행되므로 결과는 pickle 할 수 있는 값만 담습니다.
+    
+    Args:
+        owner (str): 사용자명 또는 organization 이름
+        owner_type (str): owner 종류 ("self"(default), "user", "org")
+        state (str): PR 상태 ("open"(default), "closed", "all")
+        repo_type (str): repository 타입 ("all", "private"(default), "public")
+        incremental (bool): True면 high-water mark 이후 변경된 PR만 가져옴
+        deadline (float): 실행 마감 시각 (epoch 초, 작업 프로세스에 부모 프로세스의 마감 시각을 전달)
+        force_refresh (bool): True면 repository 목록 캐시를 무시하고 목록을 다시 가져옴
+    
+    Returns:
+        dict: { "owner", "pull_requests", "failures", "watermarks", "elapsed", "rate_limit" }
+            (watermarks는 저장하지 않은 high-water mark, 호출하는 쪽에서 합쳐서 save)
+    """
+    if deadline is not None:
+        get_run_deadline().set(deadline)
+    scheduler = get_rate_limit_scheduler()
+    before = scheduler.summary()
+    started = time.perf_counter()
+    
+    failures = {}
+    watermarks = HighWaterMarks() if incremental else None
+    all_pull_requests = get_all_pull_requests(owner, state, repo_type, failures=failures, watermarks=watermarks,
+                                              compact=True, owner_type=owner_type, force_refresh=force_refresh)
+    
+    after = scheduler.summary()
+    return {
+        "owner": owner,
+        "pull_requests": all_pull_requests,
+        "failures": failures,
+        "watermarks": watermarks.marks if watermarks is not None else None,
+        "elapsed": time.perf_counter() - started,
+        # ProcessPoolExecutor에서 실행했을 때 부모 프로세스에서 합칠 metric (fetch_owner_pull_requests_in_worker가 작업마다 비움)
+        "metrics": get_metrics().snapshot(),
+        "rate_limit": {
+            "consumed": {resource: count - before["consumed"].get(resource, 0)
+                         for resource, count in after["consumed"].items()},
+            "remaining": after["remaining"],
+            "retries": after["retries"] - before["retries"]
+        }
+    }
+
+def get_all_owners_pull_requests(owners, state="open", repo_type="private", processes=None, incremental=False,
+                                 force_refresh=False):
+    """
+    여러 owner의 PR을 owner별로 나눠 여러 프로세스에서 동시에 가져옵니다.
+    (owner 안의 repository별 조회는 각 프로세스에서 스레드로 동시에 실행)
+    
+    Args:
+        owners (list): [(owner, owner_type), ...] (parse_owners의 결과)
+        state (str): PR 상태 ("open"(default), "closed", "all")
+        repo_type (str): repository 타입 ("all", "private"(default), "public")
+        processes (int): 프로세스 수 (None이면 PR_NOTIFY_OWNER_PROCESSES, 1이면 현재 프로세스에서 순서대로 실행)
+        incremental (bool): True면 high-water mark 이후 변경된 PR만 가져옴
+        force_refresh (bool): True면 repository 목록 캐시를 무시하고 목록을 다시 가져옴
+    
+    Returns:
+        list: owner 순서대로 fetch_owner_pull_requests의 결과 목록
+    """
+    if processes is None:
+        processes = PR_NOTIFY_OWNER_PROCESSES or min(len(owners), os.cpu_count() or 1)
+    
+    deadline = get_run_deadline().deadline
+    if processes <= 1 or len(owners) <= 1:
+        return [fetch_owner_pull_requests(owner, owner_type, state, repo_type, incremental, deadline, force_refresh)
+                for owner, owner_type in owners]
+    
+    results = []
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = [
+            (owner, executor.submit(fetch_owner_pull_requests_in_worker, owner, owner_type, state, repo_type,
+                                    incremental, deadline, force_refresh))
+            for owner, owner_type in owners
+        ]
+        for owner, future in futures:
+            try:
+                result = future.result()
+                get_metrics().merge(result["metrics"])
+                results.append(result)
+            # 한 owner의 실패로 다른 owner의 결과까지 버리지 않도록 모든 예외를 기록만 함
+            except Exception as e:
+                print(f"'{owner}'의 PR 조회 실패: {e}")
+                results.append({"owner": owner, "pull_requests": {}, "failures": {"*": str(e)},
+                                "watermarks": None, "elapsed": 0.0, "metrics": None,
+                                "rate_limit": {"consumed": {}, "remaining": {}, "retries": 0}})
+    return results
+
+def fetch_owner_pull_requests_in_worker(*args):
+    """
+    ProcessPoolExecutor 작업 프로세스에서 fetch_owner_pull_requests를 실행합니다.
+    작업 프로세스는 여러 owner에 재사용되고 처음에는 fork로 부모의 metric 값을 복사하므로,
+    결과의 metric snapshot에 이번 owner의 값만 담기도록 작업마다 metric을 비우고 시작합니다.
+    (부모에서 합칠 때 두 번 세지 않도록)
+    """
+    get_metrics().reset()
+    return fetch_owner_pull_requests(*args)
+
+def merge_owner_pull_requests(results):
+    """
+    owner별 결과를 get_all_pull_requests와 같은 구조의 dict 하나로 합칩니다.
+    owner가 여럿이면 repository 이름이 겹치지 않도록 "owner/레포이름"을 key로 씁니다.
+    """
+    if len(results) == 1:
+        return results[0]["pull_requests"]
+    merged = {}
+    for result in results:
+        for repo_name, data in result["pull_requests"].items():
+            merged[f"{result['owner']}/{repo_name}"] = data
+    return merged
+
+def merge_rate_limit_summaries(summaries):
+    """
+    owner별 API 사용량을 합칩니다. (사용량과 재시도는 더하고, 남은 예산은 가장 작은 값)
+    """
+    merged = {"consumed": {}, "remaining": {}, "retries": 0}
+    for summary in summaries:
+        for resource, count in summary["consumed"].items():
+            merged["consumed"][resource] = merged["consumed"].get(resource, 0) + count
+        for resource, remaining in summary["remaining"].items():
+            merged["remaining"][resource] = min(remaining, merged["remaining"].get(resource, remaining))
+        merged["retries"] += summary["retries"]
+    return merged
+
+def format_owner_timings(results):
+    """
+    owner별 조회 결과와 걸린 시간을 한 줄씩 정리합니다.
+    """
+    lines = ["*owner별 조회 시간:*"]
+    for result in results:
+        pr_count = sum(len(data["pull_requests"]) for data in result["pull_requests"].values())
+        line = f"• {result['owner']}: repository {len(result['pull_requests'])}개, PR {pr_count}개, {result['elapsed']:.1f}초"
+        if result["failures"]:
+            line += f" (조회 실패 {len(result['failures'])}개)"
+        lines.append(line)
+    return "\n".join(lines)
+
+def format_skipped_repositories(results, limit=SKIPPED_REPOSITORIES_LIMIT):
+    """
+    조회하지 못해 digest에서 빠진 repository를 정리합니다. (시간 제한 초과, circuit breaker, 요청 실패)
+
+    Returns:
+        str: Slack 메시지 (빠진 repository가 없으면 None)
+    """
+    skipped = []
+    for result in results:
+        for repo_name, error in result["failures"].items():
+            if repo_name == "*":
+                name = f"{result['owner']} (전체)"
+            elif len(results) > 1:
+                name = f"{result['owner']}/{repo_name}"
+            else:
+                name = repo_name
+            skipped.append(f"• {name}: {error[:120]}")
+    if not skipped:
+        return None
+    lines = [f"*조회하지 못해 이번 목록에서 빠진 repository ({len(skipped)}개):*"] + skipped[:limit]
+    if len(skipped) > limit:
+        lines.append(f"… 외 {len(skipped) - limit}개")
+    return "\n".join(lines)
+
+def digest_fingerprint(results, mode=PR_NOTIFY_DIGEST_MODE):
+    """
+    digest를 만들 PR 목록(번호와 updated_at)과 조회 실패 목록으로 hash를 만듭니다.
+    값이 같으면 렌더링 결과도 같으므로 렌더링 전에 중복 전송을 확인하는 데 씁니다.
+    """
+    hasher = hashlib.sha256(mode.encode("utf-8"))
+    for result in sorted(results, key=lambda result: result["owner"]):
+        hasher.update(f"\n@{result['owner']}".encode("utf-8"))
+        for repo_name, data in sorted(result["pull_requests"].items()):
+            for pr in data["pull_requests"]:
+                hasher.update(f"\n{repo_name}#{pr['number']}:{pr['updated_at']}".encode("utf-8"))
+        for repo_name in sorted(result["failures"]):
+            hasher.update(f"\n!{repo_name}".encode("utf-8"))
+    return hasher.hexdigest()
+
 def format_pull_request(pr):
     """
     Pull request 정보를 보기 좋게 포맷팅합니다.
+    PullRequestRecord는 이미 같은 key로 읽을 수 있으므로 복사하지 않고 그대로 돌려줍니다.
     """
+    if isinstance(pr, PullRequestRecord):
+        return pr
     return {
         "number": pr["number"],
         "body": pr["body"],
@@ -155,9 +571,83 @@ def format_pull_request(pr):
         "url": pr["html_url"],
         "draft": pr["draft"],
         "mergeable": pr.get("mergeable"),
-        "labels": [label["name"] for label in pr["labels"]]
+        "labels": [label["name"] for label in pr["labels"]],
+        "review_state": pr.get("review_state"),
+        "ci_state": pr.get("ci_state")
     }
 
+def iter_pull_requests_msgs(all_pull_requests, max_chars=SLACK_MAX_MESSAGE_CHARS, body_limit=PR_BODY_MAX_CHARS,
+                            title=DIGEST_TITLE):
+    """
+    모든 repository의 pull request를 Slack 메시지 크기에 맞게 나눠 렌더링합니다.
+    메시지가 완성될 때마다 바로 yield 하며, 가능한 한 repository 경계에서 나눕니다.
+    
+    Args:
+        all_pull_requests (dict): get_all_pull_requests의 결과
+        max_chars (int): 메시지 1개의 최대 글자 수 (None이면 나누지 않음)
+        body_limit (int): PR 본문 최대 글자 수 (0이나 None이면 자르지 않음)
+        title (str): 첫 메시지의 제목
+    
+    Yields:
+        str: Slack 메시지
+    """
+    builder = SlackMessageBuilder(title=title, max_chars=max_chars, body_limit=body_limit)
+    for repo_name, data in all_pull_requests.items():
+        formatted_prs = [format_pull_request(pr) for pr in data["pull_requests"]]
+        yield from builder.add_repository(repo_name, data["repository"], formatted_prs)
+    yield from builder.finish()
+
+def render_repository_msgs(repo_name, data, max_chars=SLACK_MAX_MESSAGE_CHARS, body_limit=PR_BODY_MAX_CHARS):
+    """
+    repository 하나를 다른 repository와 합치지 않고 따로 렌더링합니다. (SlackDigestPublisher용)
+    메시지 경계가 다른 repository의 PR 수에 따라 밀리지 않으므로 바뀐 repository의 메시지만 고칠 수 있습니다.
+
+    Args:
+        repo_name (str): 표시할 repository 이름
+        data (dict): {"repository": ..., "pull_requests": [...]}
+        max_chars (int): 메시지 1개의 최대 글자 수
+        body_limit (int): PR 본문 최대 글자 수 (0이나 None이면 자르지 않음)
+
+    Returns:
+        list: [(key, 메시지), ...] (repository가 메시지 1개보다 크면 "repo:이름#0", "repo:이름#1", ...)
+    """
+    builder = SlackMessageBuilder(title="", max_chars=max_chars, body_limit=body_limit)
+    formatted_prs = [format_pull_request(pr) for pr in data["pull_requests"]]
+    msgs = builder.add_repository(repo_name, data["repository"], formatted_prs) + builder.finish()
+    return [(f"repo:{repo_name}#{index}", msg) for index, msg in enumerate(msgs)]
+
+def iter_keyed_pull_requests_msgs(all_pull_requests, max_chars=SLACK_MAX_MESSAGE_CHARS, body_limit=PR_BODY_MAX_CHARS,
+                                  title=DIGEST_TITLE):
+    """
+    제목 메시지와 repository별 메시지를 (key, 메시지)로 렌더링합니다.
+
+    Yields:
+        tuple: (key, Slack 메시지)
+    """
+    yield "title", title
+    for repo_name, data in all_pull_requests.items():
+        yield from render_repository_msgs(repo_name, data, max_chars, body_limit)
+
+def make_pull_requests_msgs(all_pull_requests, max_chars=SLACK_MAX_MESSAGE_CHARS, body_limit=PR_BODY_MAX_CHARS,
+                            title=DIGEST_TITLE, keyed=False):
+    """
+    모든 repository의 pull request를 Slack 메시지 크기에 맞게 나눈 메시지 목록을 만듭니다.
+    
+    Args:
+        keyed (bool): True면 repository마다 메시지를 나눠 (key, 메시지) 목록으로 만듦 (SlackDigestPublisher용)
+
+    Returns:
+        list: Slack 메시지 목록 (PR이 없으면 빈 목록)
+    """
+    if not all_pull_requests:
+        print("어떤 repository에서도 pull request를 찾을 수 없습니다.")
+        return []
+    render = iter_keyed_pull_requests_msgs if keyed else iter_pull_requests_msgs
+    with get_metrics().timer("render_seconds"):
+        msgs = list(render(all_pull_requests, max_chars, body_limit, title))
+    get_metrics().inc("slack_messages_rendered_total", len(msgs))
+    return msgs
+
 def make_pull_requests_msg(all_pull_requests):
     """
     모든 repository의 pull request를 출력합니다.
@@ -166,25 +656,7 @@ def make_pull_requests_msg(all_pull_requests):
         print("어떤 repository에서도 pull request를 찾을 수 없습니다.")
         return
 
-    msg = "*모든 PR 목록:*\n"
-    for repo_name, data in all_pull_requests.items():
-        repository = data["repository"]
-        pull_requests = data["pull_requests"]
-
-        msg += f"📁 Repository: {repo_name}\n"
-        msg += f"   URL: {repository['html_url']}\n"
-        msg += f"   설명: {repository.get('description', '설명 없음')}\n"
-        msg += f"   PR 개수: {len(pull_requests)}\n"
-        msg += f"{'='*50}\n"
-        for pr in pull_requests:
-            formatted_pr = format_pull_request(pr)
-            msg += f"  #{formatted_pr['number']} - {formatted_pr['title']}\n"
-            msg += f"    작성자: {formatted_pr['author']}\n"
-            msg += f"    본문: {formatted_pr['body']}\n"
-            msg += f"    생성일: {formatted_pr['created_at']}\n"
-            msg += f"    URL: {formatted_pr['url']}\n"
-            msg += f"{'='*50}\n"
-    return msg
+    return "".join(iter_pull_requests_msgs(all_pull_requests, max_chars=None, body_limit=None))
 
 # def print_all_pull_requests(all_pull_requests):
     """
@@ -230,7 +702,7 @@ def make_pull_requests_msg(all_pull_requests):
             print()
 
 
-def send_slack_message(message, channel="#general", username="Bot", icon_emoji=":robot_face:"):
+def send_slack_message(message, channel="#general", username="Bot", icon_emoji=":robot_face:", dedup=True):
     """
     Send message using Slack webhook.
     
@@ -239,6 +711,7 @@ def send_slack_message(message, channel="#general", username="Bot", icon_emoji="
         channel (str): channel name (e.g. "#general", "@username")
         username (str): bot name
         icon_emoji (str): bot icon emoji
+        dedup (bool): False면 메시지 단위 중복 확인을 하지 않음 (digest는 digest 단위로만 중복 확인)
     """
     payload = {
         "text": message,
@@ -249,31 +722,228 @@ def send_slack_message(message, channel="#general", username="Bot", icon_emoji="
     if SLACK_WEBHOOK_URL is None:
         print("SLACK_WEBHOOK_URL need to be set.")
         return False
-    try:
-        response = requests.post(SLACK_WEBHOOK_URL, json=payload)
-        response.raise_for_status()
-        print(f"Message sent successfully: {response.status_code}")
-        return True
-    except requests.exceptions.RequestException as e:
-        print(f"Message sending failed: {e}")
+    # webhook 전송 간격 제한과 429 / 5xx 재시도는 전송 큐에서 처리
+    return get_slack_delivery_queue().submit(SLACK_WEBHOOK_URL, payload, dedup=dedup)
+
+
+def send_digest(owners, results, watermarks=None):
+    """
+    owner별 조회 결과로 digest를 렌더링해 DIGEST_CHANNEL로 보냅니다.
+    모두 보냈을 때만 high-water mark / snapshot을 저장합니다.
+
+    Args:
+        owners (list): parse_owners 결과
+        results (list): owner별 조회 결과
+        watermarks (HighWaterMarks): 변경분만 가져왔으면 저장할 high-water mark
+
+    Returns:
+        bool: 모든 메시지를 보냈으면 True
+    """
+    snapshot = None
+    publisher = get_slack_digest_publisher() if SLACK_TRANSPORT == "web_api" else None
+    # Web API 방식은 메시지를 key로 기존 메시지와 맞추므로 repository마다 나눠 렌더링
+    keyed = publisher is not None
+    if PR_NOTIFY_DIGEST_MODE == "diff":
+        # 지난 digest와 비교해 새로 열렸거나 변경된 PR만 렌더링하고, 목록에서 사라진 PR만 merge / close 여부를 확인
+        snapshot = PullRequestSnapshot()
+        changes = resolve_gone_pull_requests(snapshot.diff(results))
+        print(f"새 PR {len(changes['new'])}개 / 변경 {len(changes['updated'])}개 / 그대로 {changes['unchanged']}개 / "
+              f"merge {len(changes['merged'])}개 / close {len(changes['closed'])}개")
+        msgs = []
+        if changes["new"] or changes["updated"]:
+            if PR_NOTIFY_ENRICH:
+                enrich_results(changes["changed_results"])
+            msgs = make_pull_requests_msgs(merge_owner_pull_requests(changes["changed_results"]),
+                                           title=DIFF_DIGEST_TITLE, keyed=keyed)
+        closed_msg = format_closed_pull_requests(changes)
+        if closed_msg:
+            msgs.append(("closed", closed_msg) if keyed else closed_msg)
+    elif watermarks is not None:
+        # 변경분만 가져왔으므로 전체 목록이 아니라 변경된 PR로 알리고, 변경이 없으면 보내지 않음
+        msgs = []
+        if any(result["pull_requests"] for result in results):
+            if PR_NOTIFY_ENRICH:
+                enrich_results(results)
+            msgs = make_pull_requests_msgs(merge_owner_pull_requests(results), title=INCREMENTAL_DIGEST_TITLE,
+                                           keyed=keyed)
+        else:
+            print("지난 실행 이후 변경된 PR이 없습니다.")
+    else:
+        if PR_NOTIFY_ENRICH:
+            enrich_results(results)
+        all_open_prs = merge_owner_pull_requests(results)
+        msgs = make_pull_requests_msgs(all_open_prs, keyed=keyed)
+    if len(owners) > 1:
+        owner_timings = format_owner_timings(results)
+        print(owner_timings)
+        if msgs:
+            msgs.append(("owners", owner_timings) if keyed else owner_timings)
+    # 시간 제한이나 오류로 가져오지 못한 repository가 있으면 가져온 PR만으로 보내고 빠진 repository를 알림
+    skipped_msg = format_skipped_repositories(results)
+    if skipped_msg:
+        print(skipped_msg)
+        msgs.append(("skipped", skipped_msg) if keyed else skipped_msg)
+    sent = True
+    if publisher is not None:
+        # 채널에 있는 digest 메시지를 바뀐 section이 있는 것만 고침
+        # (전체 목록 digest는 PR이 없어도 반영해서 남은 메시지를 지우고, 변경분 digest는 바뀐 것이 있을 때만 새로 보냄)
+        sent = publish_digest(publisher, msgs, results, delta=PR_NOTIFY_DIGEST_MODE == "diff")
+    elif msgs:
+        # Slack 메시지 크기 제한에 맞춰 나눈 메시지를 순서대로 전송
+        # 중복 확인은 main에서 digest 단위로 했으므로 메시지마다 다시 확인하지 않음
+        # (내용이 같은 메시지만 건너뛰면 바뀐 부분만 "(계속)" 메시지로 흩어져 나감)
+        sent = all([send_slack_message(msg, DIGEST_CHANNEL, dedup=False) for msg in msgs])
+    if snapshot is not None and sent:
+        # 일일 요약에는 이번에 가져온 전체 open PR의 나이 / 오래된 PR / 작성자 / 라벨 / repository별 통계를 함께 넣음
+        summary_data = make_summary_data(changes)
+        # repository별 통계에는 지난 digest 이후 merge / close 된 PR 수도 넣음
+        closed = count_closed_by_repository(changes, qualify_owner=len(results) > 1)
+        summary_data.update(analyze_pull_requests(merge_owner_pull_requests(results), closed=closed))
+        sent = send_daily_summary(summary_data)
+    # 전송에 실패하면 다음 실행에서 같은 변경분을 다시 알리도록 high-water mark / snapshot을 저장하지 않음
+    if sent and watermarks is not None:
+        watermarks.save()
+    if sent and snapshot is not None:
+        snapshot.save(changes["current"])
+    return sent
+
+def publish_digest(publisher, msgs, results, delta=False):
+    """
+    digest를 SlackDigestPublisher로 채널의 기존 메시지에 반영합니다.
+    조회에 실패한 repository가 있으면 digest가 줄어든 것인지 알 수 없으므로 남는 메시지를 지우지 않고,
+    repository 목록을 가져오지 못한 owner가 있으면 채널의 메시지를 그대로 둡니다.
+
+    Args:
+        publisher (SlackDigestPublisher): 전송기
+        msgs (list): 렌더링된 digest 메시지 목록 [(key, 메시지), ...]
+        results (list): owner별 조회 결과 (failures를 확인)
+        delta (bool): True면 지난 알림 이후 변경분 digest
+            (이전 실행의 변경분 메시지를 고치거나 지우지 않고 새로 보내며, 보낼 메시지가 없으면 아무것도 하지 않음)
+
+    Returns:
+        bool: 모두 반영했으면 True (repository 목록을 가져오지 못했으면 False)
+    """
+    failures = [result["failures"] for result in results if result["failures"]]
+    if any("*" in failed for failed in failures):
+        print("repository 목록을 가져오지 못한 owner가 있어 채널의 digest 메시지를 고치지 않습니다.")
+        get_metrics().inc("digests_skipped_total")
         return False
+    if delta:
+        if not msgs:
+            return True
+        return publisher.publish(DIGEST_CHANNEL, msgs, prune=False, record=False)
+    return publisher.publish(DIGEST_CHANNEL, msgs, prune=not failures)
 
+def write_run_summary(rate_limit, started):
+    """
+    GitHub API 사용량을 출력하고 실행 요약 metric을 저장합니다. (PR_METRICS_PATH / PR_METRICS_PROMETHEUS_PATH)
+
+    Args:
+        rate_limit (dict): RateLimitScheduler.summary 결과
+        started (float): 실행을 시작한 time.perf_counter 값
+    """
+    print(f"GitHub API 사용량: {rate_limit['consumed']} / 남은 예산: {rate_limit['remaining']} / 재시도: {rate_limit['retries']}회")
+    
+    metrics = get_metrics()
+    for resource, count in rate_limit["consumed"].items():
+        metrics.set_gauge("github_rate_limit_consumed", count, resource=resource)
+    for resource, remaining in rate_limit["remaining"].items():
+        metrics.set_gauge("github_rate_limit_remaining", remaining, resource=resource)
+    metrics.set_gauge("run_seconds", time.perf_counter() - started)
+    metrics.write()
 
 def main():
     """
     메인 함수
     """
-    # 여기에 실제 사용자/organization 정보를 입력하세요
-    owner = "samdasoo2l"  # 사용자명 또는 organization 이름
+    # 사용자/organization 목록은 PR_NOTIFY_OWNERS로 설정하세요 (예: "samdasoo2l,org:my-org")
+    owners = parse_owners(PR_NOTIFY_OWNERS)
+    started = time.perf_counter()
+    # 렌더링과 전송 시간을 남겨 두고 GitHub 조회에 쓸 마감 시각을 정함
+    if PR_NOTIFY_RUN_BUDGET > 0:
+        get_run_deadline().start(max(1, PR_NOTIFY_RUN_BUDGET - PR_NOTIFY_SEND_RESERVE))
     
-    print(f"GitHub Owner: {owner}")
+    print(f"GitHub Owner: {', '.join(owner for owner, _ in owners)}")
     print("=" * 50)
     
     # 모든 private repository에서 open PR 가져오기
     print("\n[모든 Private Repository의 Open Pull Requests]")
-    all_open_prs = get_all_pull_requests(owner, state="open", repo_type="private")
-    msg = make_pull_requests_msg(all_open_prs)
-    send_slack_message(msg, "#general")
+    if PR_NOTIFY_PIPELINE:
+        if (PR_NOTIFY_DIGEST_MODE == "full" and GITHUB_FETCH_BACKEND == "rest" and not PR_NOTIFY_USE_INDEX
+                and not PR_NOTIFY_INCREMENTAL):
+            # pr_pipeline이 이 모듈을 import 하므로 순환 import를 피하기 위해 여기서 import
+            from pr_pipeline import run_digest_pipeline
+            # 실행 단위 중복 확인: 전송 전에 전체 PR 목록이 없어 digest_fingerprint를 쓸 수 없으므로,
+            # PR_PIPELINE_DEDUP_WINDOW 안에 같은 owner들의 digest를 이미 보냈으면 PR이 바뀌었어도 조회부터 건너뜀
+            sent_messages = get_sent_message_store()
+            digest_key = None
+            if sent_messages is not None:
+                digest_key = sent_messages.claim(DIGEST_CHANNEL, {"pipeline_run": PR_NOTIFY_OWNERS},
+                                                 window=PR_PIPELINE_DEDUP_WINDOW)
+            if sent_messages is not None and digest_key is None:
+                print(f"{PR_PIPELINE_DEDUP_WINDOW / 60:.0f}분 안에 같은 owner들의 pipeline digest를 이미 보냈으므로 "
+                      f"조회와 전송을 건너뜁니다.")
+                get_metrics().inc("digests_skipped_total")
+            else:
+                sent = False
+                try:
+                    sent = run_digest_pipeline(owners, state="open", repo_type="private",
+                                               force_refresh=PR_NOTIFY_REFRESH_REPOS)
+                finally:
+                    if digest_key is not None:
+                        sent_messages.complete(digest_key, sent)
+            write_run_summary(get_rate_limit_scheduler().summary(), started)
+            return
+        print("PR_NOTIFY_PIPELINE은 전체 목록 digest와 REST 조회 방식에서만 사용할 수 있어 한 번에 가져와 보냅니다.")
+    watermarks = None
+    if PR_NOTIFY_USE_INDEX:
+        # 변경된 PR만 GitHub에서 가져와 index에 반영하고, 전체 open PR 목록은 index에서 읽음
+        index = PullRequestIndex()
+        results = []
+        for owner, owner_type in owners:
+            owner_started = time.perf_counter()
+            failures = {}
+            index.refresh(owner, repo_type="private", failures=failures, owner_type=owner_type,
+                          force_refresh=PR_NOTIFY_REFRESH_REPOS)
+            results.append({
+                "owner": owner,
+                "pull_requests": index.load_all_pull_requests(owner, state="open", repo_type="private"),
+                "failures": failures,
+                "elapsed": time.perf_counter() - owner_started
+            })
+        index.close()
+        rate_limit = get_rate_limit_scheduler().summary()
+    else:
+        # owner별로 프로세스를 나눠 조회
+        incremental = PR_NOTIFY_INCREMENTAL and PR_NOTIFY_DIGEST_MODE != "diff"
+        results = get_all_owners_pull_requests(owners, state="open", repo_type="private", incremental=incremental,
+                                               force_refresh=PR_NOTIFY_REFRESH_REPOS)
+        rate_limit = merge_rate_limit_summaries([result["rate_limit"] for result in results])
+        if incremental:
+            watermarks = HighWaterMarks()
+            for result in results:
+                if result["watermarks"] is not None:
+                    watermarks.merge(result["watermarks"])
+    
+    # 같은 PR 목록으로 만든 digest를 SLACK_DEDUP_WINDOW 안에 이미 보냈으면 렌더링부터 건너뜀
+    # (workflow cron이 01시 동안 매분 실행되므로 대부분의 실행은 여기서 끝남)
+    sent_messages = get_sent_message_store()
+    digest_key = None
+    if sent_messages is not None:
+        digest_key = sent_messages.claim(DIGEST_CHANNEL, {"digest": digest_fingerprint(results)})
+    if sent_messages is not None and digest_key is None:
+        print("같은 PR 목록의 digest를 이미 보냈으므로 렌더링과 전송을 건너뜁니다.")
+        get_metrics().inc("digests_skipped_total")
+    else:
+        # 렌더링이나 전송 중 예외가 나도 claim을 풀어 다음 실행(매분 cron)이 다시 보낼 수 있게 함
+        sent = False
+        try:
+            sent = send_digest(owners, results, watermarks)
+        finally:
+            if digest_key is not None:
+                sent_messages.complete(digest_key, sent)
+    
+    write_run_summary(rate_limit, started)
     
     # 모든 private repository에서 closed PR 가져오기 (최근 것들)
     # print("\n[모든 Private Repository의 Recent Closed Pull Requests]")
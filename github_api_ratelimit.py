@@ -0,0 +1,177 @@
+import os
+import random
+import threading
+import time
+from dotenv import load_dotenv
+
+from github_api_deadline import DeadlineExceeded
+
+load_dotenv()
+
+# 남은 요청 수가 이 값보다 적으면 reset 시각까지 요청 간격을 벌림
+GITHUB_RATE_LIMIT_SLOWDOWN = int(os.getenv("GITHUB_RATE_LIMIT_SLOWDOWN", "200"))
+# rate limit / 일시적 서버 오류 응답의 최대 재시도 횟수
+GITHUB_MAX_RETRIES = int(os.getenv("GITHUB_MAX_RETRIES", "5"))
+# 재시도 대기 시간 (초): BACKOFF_BASE * 2^시도횟수, 최대 BACKOFF_MAX
+GITHUB_BACKOFF_BASE = float(os.getenv("GITHUB_BACKOFF_BASE", "1"))
+GITHUB_BACKOFF_MAX = float(os.getenv("GITHUB_BACKOFF_MAX", "60"))
+
+class RateLimitScheduler:
+    """
+    GitHub API 응답의 X-RateLimit-* 헤더로 resource(core, search, graphql)별 남은 예산을 추적하고
+    요청 전에 필요한 만큼 기다리게 합니다.
+
+    - 남은 요청이 slowdown(한도의 1/4을 넘지 않음) 미만이면 reset 시각까지 남은 요청을 고르게 나눠 보냅니다.
+    - 예산을 다 쓰면 reset 시각까지 기다립니다.
+    - 429 / secondary rate limit(403) / 5xx 응답은 Retry-After를 따르거나
+      jitter를 넣은 exponential backoff로 재시도하며, 그동안 다른 스레드의 요청도 멈춥니다.
+
+    여러 스레드에서 동시에 사용할 수 있습니다.
+    """
+
+    def __init__(self, slowdown=GITHUB_RATE_LIMIT_SLOWDOWN, max_retries=GITHUB_MAX_RETRIES,
+                 backoff_base=GITHUB_BACKOFF_BASE, backoff_max=GITHUB_BACKOFF_MAX, sleep=time.sleep):
+        self.slowdown = slowdown
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.sleep = sleep
+        self.lock = threading.Lock()
+        # { resource: { "limit", "remaining", "reset" } }
+        self.budgets = {}
+        # { resource: 사용한 예산 }
+        self.consumed = {}
+        self.retries = 0
+        self.paused_until = 0
+
+    def wait(self, resource="core", deadline=None, url=None):
+        """
+        요청을 보내기 전에 호출합니다. 필요하면 기다린 뒤 돌아옵니다.
+
+        Args:
+            resource (str): 요청이 쓰는 rate limit resource
+            deadline (RunDeadline): 주면 기다리는 동안 실행 마감 시각이 지나는지 확인
+            url (str): 오류 메시지에 적을 요청 URL
+
+        Raises:
+            DeadlineExceeded: 기다리면 실행 마감 시각이 지남 (기다리지 않고 바로 raise)
+        """
+        delay = self.delay_for(resource)
+        if delay > 0:
+            if deadline is not None and not deadline.allows(delay):
+                raise DeadlineExceeded(f"rate limit 대기({delay:.0f}초)가 실행 시간 제한을 넘어 요청하지 않았습니다: {url}")
+            self.sleep(delay)
+
+    def delay_for(self, resource="core"):
+        """
+        다음 요청 전에 기다려야 하는 시간(초)을 계산하고 요청 1개분의 예산을 미리 차감합니다.
+        """
+        with self.lock:
+            now = time.time()
+            delay = max(0, self.paused_until - now)
+
+            budget = self.budgets.get(resource)
+            if budget is None or budget["reset"] <= now:
+                return delay
+
+            if budget["remaining"] <= 0:
+                delay = max(delay, budget["reset"] - now + 1)
+            # search(분당 30회)처럼 한도가 작은 resource는 처음부터 느려지지 않도록 한도의 1/4까지만 적용
+            elif budget["remaining"] < min(self.slowdown, budget["limit"] // 4 or self.slowdown):
+                delay = max(delay, (budget["reset"] - now) / budget["remaining"])
+            # 응답이 오기 전에 다른 스레드가 같은 예산을 보지 않도록 미리 차감
+            budget["remaining"] -= 1
+            return delay
+
+    def update(self, response):
+        """
+        응답 헤더로 남은 예산과 사용한 예산을 갱신합니다.
+        GraphQL은 요청마다 비용이 달라서 record_cost로 따로 기록합니다.
+        """
+        headers = response.headers
+        resource = headers.get("X-RateLimit-Resource", "core")
+        with self.lock:
+            if "X-RateLimit-Remaining" in headers and "X-RateLimit-Reset" in headers:
+                self.budgets[resource] = {
+                    "limit": int(headers.get("X-RateLimit-Limit", 0)),
+                    "remaining": int(headers["X-RateLimit-Remaining"]),
+                    "reset": int(headers["X-RateLimit-Reset"])
+                }
+            # 304 응답은 rate limit에 포함되지 않음
+            if response.status_code != 304 and resource != "graphql":
+                self.consumed[resource] = self.consumed.get(resource, 0) + 1
+
+    def record_cost(self, resource, cost):
+        """
+        응답 본문으로만 알 수 있는 비용(GraphQL rateLimit.cost 등)을 기록합니다.
+        """
+        with self.lock:
+            self.consumed[resource] = self.consumed.get(resource, 0) + cost
+
+    def is_rate_limited(self, response):
+        """
+        429 / secondary rate limit(403) 응답이면 True를 돌려줍니다.
+        """
+        status = response.status_code
+        headers = response.headers
+        return status == 429 or (status == 403 and (
+            "Retry-After" in headers
+            or headers.get("X-RateLimit-Remaining") == "0"
+            or "rate limit" in response.text.lower()
+        ))
+
+    def retry_delay(self, response, attempt):
+        """
+        응답을 재시도해야 하면 기다릴 시간(초)을, 아니면 None을 돌려줍니다.
+
+        Args:
+            response (requests.Response): 받은 응답
+            attempt (int): 지금까지 재시도한 횟수
+
+        Returns:
+            float: 재시도 전 대기 시간 (재시도하지 않으면 None)
+        """
+        status = response.status_code
+        headers = response.headers
+        rate_limited = self.is_rate_limited(response)
+        if not rate_limited and status < 500:
+            return None
+        if attempt >= self.max_retries:
+            return None
+
+        if "Retry-After" in headers:
+            delay = float(headers["Retry-After"])
+        elif rate_limited and headers.get("X-RateLimit-Remaining") == "0" and "X-RateLimit-Reset" in headers:
+            delay = int(headers["X-RateLimit-Reset"]) - time.time() + 1
+        else:
+            delay = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+        # 동시에 멈춘 요청들이 한꺼번에 다시 몰리지 않도록 jitter 추가
+        delay = max(0, delay) + random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt) / 2)
+
+        with self.lock:
+            self.retries += 1
+            if rate_limited:
+                self.paused_until = max(self.paused_until, time.time() + delay)
+        return delay
+
+    def summary(self):
+        """
+        지금까지 사용한 예산과 남은 예산을 돌려줍니다.
+
+        Returns:
+            dict: { "consumed": {resource: 사용량}, "remaining": {resource: 남은 양}, "retries": 재시도 횟수 }
+        """
+        with self.lock:
+            return {
+                "consumed": dict(self.consumed),
+                "remaining": {resource: budget["remaining"] for resource, budget in self.budgets.items()},
+                "retries": self.retries
+            }
+
+rate_limit_scheduler = RateLimitScheduler()
+
+def get_rate_limit_scheduler():
+    """
+    프로세스에서 공유하는 rate limit scheduler를 가져옵니다.
+    """
+    return rate_limit_scheduler
@@ -0,0 +1,238 @@
+import argparse
+import json
+import os
+import threading
+import time
+from dotenv import load_dotenv
+
+from github_api_client import github_get, iter_pages
+
+load_dotenv()
+
+# repository 목록 캐시 파일 위치 (PR_REPO_CACHE_PATH를 비우면 캐시 사용 안 함)
+PR_REPO_CACHE_PATH = os.getenv(
+    "PR_REPO_CACHE_PATH", os.path.join(os.getenv("PR_NOTIFY_STATE_DIR", ".pr_notify_state"), "repositories.json")
+)
+# 이 시간(초) 안에는 GitHub에 묻지 않고 캐시된 목록을 그대로 사용
+GITHUB_REPO_CACHE_TTL = float(os.getenv("GITHUB_REPO_CACHE_TTL", "3600"))
+# TTL이 지나도 첫 페이지가 그대로면 계속 사용하지만, 이 시간(초)이 지나면 전체 목록을 다시 가져옴
+# (첫 페이지 밖의 repository가 삭제되거나 이름이 바뀐 경우를 반영하기 위함)
+GITHUB_REPO_CACHE_MAX_AGE = float(os.getenv("GITHUB_REPO_CACHE_MAX_AGE", str(24 * 3600)))
+
+# 캐시에 저장하는 repository 필드 (알림과 목록 출력에 쓰는 것만)
+REPOSITORY_FIELDS = (
+    "id", "name", "full_name", "private", "html_url", "description", "fork", "archived",
+    "created_at", "updated_at", "pushed_at"
+)
+
+class RepositoryListCache:
+    """
+    owner / repository 타입 / endpoint별 repository 목록 캐시입니다.
+
+    - 마지막 확인 후 ttl이 지나지 않았으면 요청 없이 캐시된 목록을 돌려줍니다.
+    - ttl이 지났으면 첫 페이지만 요청해(대부분 ETag 캐시로 304 응답) ETag나 최신 repository가
+      그대로인지 확인하고, 바뀌지 않았으면 나머지 페이지는 요청하지 않습니다.
+    - 바뀌었거나 max_age가 지났거나 force_refresh면 전체 목록을 다시 가져옵니다.
+    """
+
+    def __init__(self, path, ttl=GITHUB_REPO_CACHE_TTL, max_age=GITHUB_REPO_CACHE_MAX_AGE):
+        self.path = path
+        self.ttl = ttl
+        self.max_age = max_age
+        self.lock = threading.Lock()
+        self.entries = self.load()
+        # 이 프로세스에서 바꾸거나 지운 key (저장할 때 다른 프로세스가 저장한 항목과 합치기 위해 사용)
+        self.changed_keys = set()
+
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def key(self, owner, repo_type, url):
+        return f"{owner}:{repo_type}:{url}"
+
+    def iter_repositories(self, owner, repo_type, url, params, force_refresh=False):
+        """
+        repository 목록을 하나씩 yield 합니다. 새로 가져오는 경우 페이지가 도착하는 대로 yield 하고
+        마지막 페이지까지 받은 뒤에 캐시에 저장합니다.
+
+        Args:
+            owner (str): 사용자명 또는 organization 이름
+            repo_type (str): repository 타입
+            url (str): 목록 API URL
+            params (dict): 첫 페이지 query parameter
+            force_refresh (bool): True면 캐시를 무시하고 전체 목록을 다시 가져옴
+
+        Yields:
+            dict: repository 정보 (REPOSITORY_FIELDS만 포함)
+
+        Raises:
+            requests.exceptions.RequestException: API 요청 실패
+        """
+        key = self.key(owner, repo_type, url)
+        with self.lock:
+            entry = self.entries.get(key)
+        now = time.time()
+
+        if entry is not None and not force_refresh and now - entry["checked_at"] < self.ttl:
+            yield from entry["repositories"]
+            return
+
+        # 첫 페이지로 목록이 바뀌었는지 확인 (전체 목록을 가져올 때도 첫 페이지로 그대로 사용)
+        response = github_get(url, params)
+        first_page = [self.project(repo) for repo in response.json()]
+        next_url = response.links.get("next", {}).get("url")
+        probe = self.make_probe(response, first_page)
+
+        if (entry is not None and not force_refresh and next_url and entry["probe"] == probe
+                and now - entry["fetched_at"] < self.max_age):
+            with self.lock:
+                entry["checked_at"] = now
+                self.changed_keys.add(key)
+                self.save()
+            yield from entry["repositories"]
+            return
+
+        repositories = list(first_page)
+        yield from first_page
+        if next_url:
+            for repo in iter_pages(next_url):
+                repo = self.project(repo)
+                repositories.append(repo)
+                yield repo
+
+        with self.lock:
+            self.entries[key] = {
+                "fetched_at": now,
+                "checked_at": now,
+                "probe": probe,
+                "repositories": repositories
+            }
+            self.changed_keys.add(key)
+            self.save()
+
+    def project(self, repo):
+        return {field: repo[field] for field in REPOSITORY_FIELDS if field in repo}
+
+    def make_probe(self, response, first_page):
+        """
+        첫 페이지가 바뀌었는지 비교할 값을 만듭니다.
+        ETag가 있으면 ETag를, 없으면 가장 최근에 만든 repository와 첫 페이지의 이름 목록을 씁니다.
+        """
+        if response.headers.get("ETag"):
+            return {"etag": response.headers["ETag"]}
+        return {
+            "newest_created_at": max((repo.get("created_at") or "" for repo in first_page), default=None),
+            "names": [repo["name"] for repo in first_page]
+        }
+
+    def invalidate(self, owner=None):
+        """
+        캐시된 목록을 지웁니다. owner를 주면 그 owner의 목록만 지웁니다.
+        """
+        with self.lock:
+            self.entries.update(self.load())
+            for key in list(self.entries):
+                if owner is None or key.startswith(f"{owner}:"):
+                    del self.entries[key]
+                    self.changed_keys.add(key)
+            self.save()
+
+    def save(self):
+        """
+        캐시를 파일에 기록합니다. (lock을 잡은 상태에서 호출)
+        owner별로 여러 프로세스가 같은 파일을 쓰므로 파일에 있는 다른 프로세스의 항목은 유지합니다.
+        """
+        entries = self.load()
+        for key in self.changed_keys:
+            if key in self.entries:
+                entries[key] = self.entries[key]
+            else:
+                entries.pop(key, None)
+        self.entries = entries
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+
+repository_list_cache = None
+repository_list_cache_lock = threading.Lock()
+
+def get_repository_list_cache():
+    """
+    프로세스에서 공유하는 repository 목록 캐시를 가져옵니다.
+
+    Returns:
+        RepositoryListCache: 캐시 (PR_REPO_CACHE_PATH가 비어 있으면 None)
+    """
+    global repository_list_cache
+    if not PR_REPO_CACHE_PATH:
+        return None
+    with repository_list_cache_lock:
+        if repository_list_cache is None:
+            repository_list_cache = RepositoryListCache(PR_REPO_CACHE_PATH)
+    return repository_list_cache
+
+def iter_cached_repositories(owner, repo_type, url, params, force_refresh=False):
+    """
+    캐시를 거쳐 repository 목록을 하나씩 yield 합니다. 캐시를 쓰지 않으면 모든 페이지를 그대로 가져옵니다.
+
+    Args:
+        owner (str): 사용자명 또는 organization 이름
+        repo_type (str): repository 타입
+        url (str): 목록 API URL
+        params (dict): 첫 페이지 query parameter
+        force_refresh (bool): True면 캐시를 무시하고 전체 목록을 다시 가져옴
+
+    Yields:
+        dict: repository 정보
+
+    Raises:
+        requests.exceptions.RequestException: API 요청 실패
+    """
+    cache = get_repository_list_cache()
+    if cache is None:
+        yield from iter_pages(url, params)
+        return
+    yield from cache.iter_repositories(owner, repo_type, url, params, force_refresh)
+
+def invalidate_repository_cache(owner=None):
+    """
+    캐시된 repository 목록을 지웁니다. 다음 실행은 목록 전체를 다시 가져옵니다.
+    (새로 만들거나 지운 repository를 TTL / max_age를 기다리지 않고 반영할 때 사용)
+
+    Args:
+        owner (str): 주면 그 owner의 목록만 지움 (None이면 전체)
+
+    Returns:
+        bool: 캐시를 지웠으면 True (PR_REPO_CACHE_PATH가 비어 있어 캐시를 쓰지 않으면 False)
+    """
+    cache = get_repository_list_cache()
+    if cache is None:
+        return False
+    cache.invalidate(owner)
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description="repository 목록 캐시 관리")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    invalidate_parser = commands.add_parser("invalidate", help="캐시된 repository 목록 지우기")
+    invalidate_parser.add_argument("--owner", help="이 owner의 목록만 지움 (없으면 전체)")
+
+    args = parser.parse_args()
+    if args.command == "invalidate":
+        if invalidate_repository_cache(args.owner):
+            print(f"repository 목록 캐시를 지웠습니다. ({args.owner or '전체'})")
+        else:
+            print("PR_REPO_CACHE_PATH가 비어 있어 repository 목록 캐시를 쓰지 않습니다.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+import requests
+from dotenv import load_dotenv
+
+from github_api_client import github_get
+
+load_dotenv()
+
+GITHUB_API_BASE = os.getenv("GITHUB_API_BASE", "https://api.github.com")
+GITHUB_SEARCH_URL = f"{GITHUB_API_BASE}/search/issues"
+
+# 검색 API는 query 하나에 최대 1,000개까지만 돌려줌
+SEARCH_RESULT_CAP = 1000
+SEARCH_PAGE_SIZE = 100
+# 날짜 범위를 나눌 때 시작 시각 (GitHub 서비스 시작 이전)
+SEARCH_START = datetime(2008, 1, 1, tzinfo=timezone.utc)
+# repository 정보를 동시에 가져올 요청 수
+SEARCH_REPOSITORY_WORKERS = 8
+
+# get_all_pull_requests의 state → 검색 qualifier
+SEARCH_STATES = {
+    "open": "is:open",
+    "closed": "is:closed",
+    "all": None
+}
+
+def format_search_time(value):
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def build_search_query(owner, state="open", repo_type="private", owner_type="self"):
+    """
+    owner의 PR을 찾는 검색 query를 만듭니다. (created 범위는 iter_search_results에서 붙임)
+    """
+    qualifiers = ["is:pr", f"{'org' if owner_type == 'org' else 'user'}:{owner}"]
+    if SEARCH_STATES.get(state):
+        qualifiers.append(SEARCH_STATES[state])
+    if repo_type in ("private", "public"):
+        qualifiers.append(f"is:{repo_type}")
+    return " ".join(qualifiers)
+
+def search_page(query, url=GITHUB_SEARCH_URL, page_size=SEARCH_PAGE_SIZE):
+    """
+    검색 결과 한 페이지를 가져옵니다.
+
+    Returns:
+        tuple: (응답 JSON, 다음 페이지 URL 또는 None)
+    """
+    params = {"q": query, "per_page": page_size, "sort": "created", "order": "desc"} if url == GITHUB_SEARCH_URL else None
+    response = github_get(url, params)
+    return response.json(), response.links.get("next", {}).get("url")
+
+def iter_search_results(query, start=SEARCH_START, end=None):
+    """
+    검색 결과를 모든 페이지에 걸쳐 하나씩 yield 합니다.
+    결과가 1,000개를 넘으면 created 범위를 반으로 나눠 각각 다시 검색합니다.
+
+    Args:
+        query (str): created 범위를 제외한 검색 query
+        start (datetime): created 범위 시작
+        end (datetime): created 범위 끝 (None이면 지금)
+
+    Yields:
+        dict: 검색 결과 항목 (issue 형태)
+
+    Raises:
+        requests.exceptions.RequestException: API 요청 실패
+    """
+    if end is None:
+        end = datetime.now(timezone.utc).replace(microsecond=0)
+    ranged_query = f"{query} created:{format_search_time(start)}..{format_search_time(end)}"
+    data, next_url = search_page(ranged_query)
+
+    if data["total_count"] > SEARCH_RESULT_CAP and (end - start).total_seconds() > 1:
+        # 첫 페이지는 버리고 두 범위로 나눠 다시 검색 (범위 끝은 양쪽에 포함되므로 1초 겹치지 않게)
+        middle = (start + (end - start) / 2).replace(microsecond=0)
+        yield from iter_search_results(query, start, middle)
+        yield from iter_search_results(query, middle + timedelta(seconds=1), end)
+        return
+
+    if data["total_count"] > SEARCH_RESULT_CAP:
+        print(f"⚠️  검색 결과가 {SEARCH_RESULT_CAP}개를 넘어 일부만 가져옵니다: {ranged_query}")
+    yield from data["items"]
+    while next_url:
+        data, next_url = search_page(ranged_query, next_url)
+        yield from data["items"]
+
+def to_pull_request(item):
+    """
+    검색 결과 항목(issue 형태)을 /pulls 응답과 같은 key를 가진 dict로 바꿉니다.
+    검색 결과에는 head / mergeable이 없으므로 비워 둡니다.
+    """
+    return {
+        "number": item["number"],
+        "title": item["title"],
+        "body": item.get("body"),
+        "state": item["state"],
+        "user": item["user"],
+        "created_at": item["created_at"],
+        "updated_at": item["updated_at"],
+        "html_url": item["html_url"],
+        "draft": item.get("draft", False),
+        "mergeable": None,
+        "labels": item.get("labels", [])
+    }
+
+def get_all_pull_requests_search(owner, state="open", repo_type="private", failures=None, owner_type="self",
+                                 max_workers=SEARCH_REPOSITORY_WORKERS):
+    """
+    GitHub 검색 API로 owner의 모든 PR을 몇 번의 요청으로 가져옵니다.
+    repository마다 /pulls를 요청하지 않고, PR이 있는 repository의 정보만 따로 가져옵니다.
+    (검색 API는 별도 rate limit(search)을 쓰며 rate limit scheduler가 간격을 조절함)
+
+    Args:
+        owner (str): 사용자명 또는 organization 이름
+        state (str): PR 상태 ("open"(default), "closed", "all")
+        repo_type (str): repository 타입 ("all", "private"(default), "public")
+        failures (dict): 전달하면 조회에 실패한 { 레포이름: 에러 메시지 }가 채워짐 (검색 자체가 실패하면 "*")
+        owner_type (str): owner 종류 ("self"(default), "user", "org")
+        max_workers (int): repository 정보를 동시에 가져올 요청 수
+
+    Returns:
+        dict: { 레포이름 : { "repository": 레포정보, "pull_requests": [PR, ...] } , ...}
+            repository는 만든 순서 역순(REST 방식과 같은 순서), PR은 updated 내림차순
+    """
+    if failures is None:
+        failures = {}
+    query = build_search_query(owner, state, repo_type, owner_type)
+    print(f"'{owner}'의 PR 검색 중... ({query})")
+
+    # { repository API URL: [PR, ...] }
+    grouped = {}
+    try:
+        for item in iter_search_results(query):
+            grouped.setdefault(item["repository_url"], []).append(to_pull_request(item))
+    except (requests.exceptions.RequestException, ValueError) as e:
+        failures["*"] = str(e)
+        print(f"PR 검색 실패: {e}")
+        return {}
+
+    print(f"PR이 있는 repository {len(grouped)}개를 찾았습니다.")
+    repositories = []
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = [(url, executor.submit(github_get, url)) for url in grouped]
+        for url, future in futures:
+            try:
+                repositories.append((future.result().json(), grouped[url]))
+            except (requests.exceptions.RequestException, ValueError) as e:
+                repo_name = url.rsplit("/", 1)[-1]
+                failures[repo_name] = str(e)
+                print(f"  - {repo_name} → repository 정보 조회 실패: {e}")
+
+    all_pull_requests = {}
+    for repo, pull_requests in sorted(repositories, key=lambda item: item[0]["created_at"], reverse=True):
+        pull_requests.sort(key=lambda pr: pr["updated_at"], reverse=True)
+        all_pull_requests[repo["name"]] = {
+            "repository": repo,
+            "pull_requests": pull_requests
+        }
+        print(f"  - {repo['name']} → {len(pull_requests)}개의 PR 발견")
+    return all_pull_requests
@@ -2,28 +2,41 @@ import requests
 import os
 from dotenv import load_dotenv
 
+from github_api_client import github_get
+from github_api_repo_cache import iter_cached_repositories
+
 load_dotenv()
 
-GITHUB_TOKEN = os.getenv("PR_GITHUB_TOKEN")
-GITHUB_API_BASE = "https://api.github.com"
+GITHUB_API_BASE = os.getenv("GITHUB_API_BASE", "https://api.github.com")
 
-def get_my_private_repositories():
-    headers = {
-        "Authorization": f"token {GITHUB_TOKEN}",
-        "Accept": "application/vnd.github.v3+json"
-    }
+def get_authenticated_login():
+    """
+    토큰의 사용자 이름을 가져옵니다. (ETag 캐시를 거치므로 보통 304 응답)
+    """
+    return github_get(f"{GITHUB_API_BASE}/user").json()["login"]
+
+def iter_my_private_repositories(force_refresh=False):
+    """
+    인증된 사용자의 private repository를 모든 페이지에 걸쳐 하나씩 yield 합니다.
+    캐시된 목록이 있으면 그것을 사용하고, force_refresh면 다시 가져옵니다.
+    """
     url = f"{GITHUB_API_BASE}/user/repos"
+    # 첫 페이지로 목록이 바뀌었는지 확인하므로 push할 때마다 순서가 바뀌는 updated 대신 이름 순으로 가져옴
     params = {
         "type": "private",
         "per_page": 100,
-        "sort": "updated",
-        "direction": "desc"
+        "sort": "full_name",
+        "direction": "asc"
     }
+    # 토큰마다 목록이 다르므로 토큰 사용자의 이름으로 캐시
+    owner = get_authenticated_login()
+    for repo in iter_cached_repositories(owner, "private", url, params, force_refresh):
+        if repo["private"]:
+            yield repo
+
+def get_my_private_repositories(force_refresh=False):
     try:
-        response = requests.get(url, headers=headers, params=params)
-        response.raise_for_status()
-        repositories = response.json()
-        private_repos = [repo for repo in repositories if repo["private"]]
+        private_repos = list(iter_my_private_repositories(force_refresh))
         print(f"Private repositories: {len(private_repos)}개")
         for repo in private_repos:
             print(f"- {repo['name']} | {repo['html_url']}")
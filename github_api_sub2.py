@@ -3,13 +3,41 @@ import json
 import os
 from dotenv import load_dotenv
 
+from github_api_repo_cache import iter_cached_repositories
+
 load_dotenv()
 
 # GitHub API 설정
-GITHUB_TOKEN = os.getenv("PR_GITHUB_TOKEN")
-GITHUB_API_BASE = "https://api.github.com"
+GITHUB_API_BASE = os.getenv("GITHUB_API_BASE", "https://api.github.com")
+
+def iter_user_repositories(username, repo_type="all", force_refresh=False):
+    """
+    사용자의 repository를 모든 페이지에 걸쳐 하나씩 yield 합니다 (private repository 포함).
+    캐시된 목록이 있으면 그것을 사용합니다.
+    
+    Args:
+        username (str): GitHub 사용자명
+        repo_type (str): repository 타입 ("all"(default), "owner", "member", "public")
+        force_refresh (bool): True면 캐시를 무시하고 목록을 다시 가져옴
+    
+    Yields:
+        dict: repository 정보
+    
+    Raises:
+        requests.exceptions.RequestException: API 요청 실패
+    """
+    url = f"{GITHUB_API_BASE}/users/{username}/repos"
+    # 첫 페이지로 목록이 바뀌었는지 확인하므로 push할 때마다 순서가 바뀌는 updated 대신 이름 순으로 가져옴
+    params = {
+        "type": repo_type,
+        "per_page": 100,
+        "sort": "full_name",
+        "direction": "asc"
+    }
+    
+    yield from iter_cached_repositories(username, repo_type, url, params, force_refresh)
 
-def get_user_repositories(username, repo_type="all"):
+def get_user_repositories(username, repo_type="all", force_refresh=False):
     """
     사용자의 repository 목록을 가져옵니다 (private repository 포함).
     
@@ -20,28 +48,13 @@ def get_user_repositories(username, repo_type="all"):
             - "owner": 소유한 repository만 (public + private) ✅
             - "member": 멤버인 repository만 (public + private) ✅
             - "public": public repository만 ❌
+        force_refresh (bool): True면 캐시를 무시하고 목록을 다시 가져옴
     
     Returns:
         list: repository 목록
     """
-    headers = {
-        "Authorization": f"token {GITHUB_TOKEN}",
-        "Accept": "application/vnd.github+json"
-    }
-    
-    url = f"{GITHUB_API_BASE}/users/{username}/repos"
-    params = {
-        "type": "all",
-        "per_page": 100,
-        "sort": "updated",
-        "direction": "desc"
-    }
-    
     try:
-        response = requests.get(url, headers=headers, params=params)
-        response.raise_for_status()
-        
-        repositories = response.json()
+        repositories = list(iter_user_repositories(username, repo_type, force_refresh))
         print(f"repositories: {len(repositories)}!!!!")
         return repositories
         
@@ -0,0 +1,246 @@
+"""
+GitHub pull_request webhook을 받아 바로 Slack으로 알림을 보내는 서버입니다.
+
+    python github_webhook_server.py serve
+    python github_webhook_server.py replay payload.json --url http://127.0.0.1:8080/github/webhook
+
+GitHub repository(또는 organization) 설정의 Webhooks에서
+Payload URL은 이 서버 주소 + GITHUB_WEBHOOK_PATH, Content type은 application/json,
+Secret은 GITHUB_WEBHOOK_SECRET과 같은 값으로 등록하고 "Pull requests" 이벤트를 선택하세요.
+"""
+import argparse
+import hashlib
+import hmac
+import json
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from dotenv import load_dotenv
+
+from http_client import get_http_client
+from slack_sub1 import send_github_pr_notification, send_github_pr_status_notification
+
+load_dotenv()
+
+# webhook 서명 검증에 사용할 secret (GitHub webhook 설정의 Secret과 같은 값)
+GITHUB_WEBHOOK_SECRET = os.getenv("GITHUB_WEBHOOK_SECRET")
+GITHUB_WEBHOOK_HOST = os.getenv("GITHUB_WEBHOOK_HOST", "0.0.0.0")
+GITHUB_WEBHOOK_PORT = int(os.getenv("GITHUB_WEBHOOK_PORT", "8080"))
+GITHUB_WEBHOOK_PATH = os.getenv("GITHUB_WEBHOOK_PATH", "/github/webhook")
+# 알림을 보낼 Slack 채널
+GITHUB_WEBHOOK_CHANNEL = os.getenv("GITHUB_WEBHOOK_CHANNEL", "#github")
+# 중복 전송을 확인하기 위해 기억할 최근 delivery ID 수
+GITHUB_WEBHOOK_DEDUP_SIZE = int(os.getenv("GITHUB_WEBHOOK_DEDUP_SIZE", "10000"))
+# GitHub webhook payload 최대 크기 (25MB)
+GITHUB_WEBHOOK_MAX_BODY = 25 * 1024 * 1024
+
+def sign_payload(secret, body):
+    """
+    GitHub와 같은 방식으로 X-Hub-Signature-256 헤더 값을 만듭니다.
+    """
+    return "sha256=" + hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+
+def verify_signature(secret, body, signature):
+    """
+    X-Hub-Signature-256 헤더가 body와 secret으로 만든 서명과 같은지 확인합니다.
+    (timing attack을 막기 위해 hmac.compare_digest로 비교)
+    """
+    if not signature:
+        return False
+    return hmac.compare_digest(sign_payload(secret, body), signature)
+
+class DeliveryDeduplicator:
+    """
+    최근에 처리한 X-GitHub-Delivery ID를 기억해 같은 이벤트가 다시 오면 무시합니다.
+    (GitHub의 redeliver나 응답 지연으로 인한 재전송)
+    """
+
+    def __init__(self, max_size=GITHUB_WEBHOOK_DEDUP_SIZE):
+        self.max_size = max_size
+        self.lock = threading.Lock()
+        self.seen = OrderedDict()
+
+    def is_duplicate(self, delivery_id):
+        """
+        이미 처리한 delivery ID면 True를 돌려줍니다.
+        """
+        with self.lock:
+            if delivery_id in self.seen:
+                self.seen.move_to_end(delivery_id)
+                return True
+            return False
+
+    def add(self, delivery_id):
+        """
+        처리를 마친 delivery ID를 기록합니다.
+        (처리에 실패한 이벤트는 기록하지 않아야 GitHub의 redeliver로 다시 처리할 수 있음)
+        """
+        with self.lock:
+            self.seen[delivery_id] = True
+            self.seen.move_to_end(delivery_id)
+            if len(self.seen) > self.max_size:
+                self.seen.popitem(last=False)
+
+def route_event(event, payload, channel=GITHUB_WEBHOOK_CHANNEL, wait=False):
+    """
+    webhook 이벤트를 알맞은 Slack 알림으로 보냅니다.
+
+    Args:
+        event (str): X-GitHub-Event 헤더 값
+        payload (dict): webhook payload
+        channel (str): Slack 채널
+        wait (bool): True면 Slack 전송이 끝날 때까지 기다림 (서버에서는 False로 바로 응답)
+
+    Returns:
+        str: 처리 결과 ("opened", "merged", "closed", "reopened", ...) 알림을 보내지 않았으면 None
+    """
+    if event != "pull_request":
+        return None
+
+    action = payload.get("action")
+    pr = payload["pull_request"]
+    repo_name = payload["repository"]["full_name"]
+    # 같은 PR의 이벤트가 반복돼도(close → reopen → close) 알림 내용이 같으므로 updated_at으로 이벤트를 구분
+    event_id = pr.get("updated_at")
+    if action == "opened":
+        send_github_pr_notification(repo_name, pr["number"], pr["title"], pr["user"]["login"], pr["html_url"],
+                                    channel, wait, event_id)
+        return "opened"
+    if action in ("closed", "reopened", "ready_for_review"):
+        status = "merged" if action == "closed" and pr.get("merged") else action
+        send_github_pr_status_notification(repo_name, pr["number"], pr["title"], status, pr["html_url"],
+                                           channel, wait, event_id)
+        return status
+    return None
+
+class WebhookHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        server = self.server
+        if self.path.split("?")[0] != server.path:
+            self.reply(404, "not found")
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        if length > GITHUB_WEBHOOK_MAX_BODY:
+            self.reply(413, "payload too large")
+            return
+        body = self.rfile.read(length)
+
+        if not verify_signature(server.secret, body, self.headers.get("X-Hub-Signature-256")):
+            self.reply(401, "invalid signature")
+            return
+
+        event = self.headers.get("X-GitHub-Event")
+        delivery_id = self.headers.get("X-GitHub-Delivery")
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            self.reply(400, "invalid json")
+            return
+
+        if delivery_id and server.deduplicator.is_duplicate(delivery_id):
+            print(f"중복 delivery 무시: {delivery_id}")
+            self.reply(200, "duplicate")
+            return
+
+        try:
+            result = route_event(event, payload, server.channel)
+        except (KeyError, TypeError) as e:
+            print(f"webhook 처리 실패 ({event}, {delivery_id}): {e}")
+            self.reply(400, "unexpected payload")
+            return
+        # 처리에 성공한 뒤에만 기록 (실패한 이벤트는 redeliver되면 다시 처리)
+        if delivery_id:
+            server.deduplicator.add(delivery_id)
+
+        if result is None:
+            self.reply(200, "ignored")
+        else:
+            print(f"webhook {event} → {result} ({delivery_id})")
+            # Slack 전송은 전송 큐에서 처리하므로 바로 응답 (GitHub는 10초 안에 응답이 없으면 실패로 처리)
+            self.reply(202, result)
+
+    def reply(self, status, text):
+        body = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+class WebhookServer(ThreadingHTTPServer):
+    """
+    요청마다 스레드를 하나씩 써서 동시에 들어오는 webhook을 처리하는 서버입니다.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, secret, path=GITHUB_WEBHOOK_PATH, channel=GITHUB_WEBHOOK_CHANNEL,
+                 deduplicator=None):
+        super().__init__(address, WebhookHandler)
+        self.secret = secret
+        self.path = path
+        self.channel = channel
+        self.deduplicator = deduplicator or DeliveryDeduplicator()
+
+def replay_payload(url, payload_path, event="pull_request", secret=GITHUB_WEBHOOK_SECRET, delivery_id=None):
+    """
+    저장해 둔 webhook payload를 GitHub처럼 서명해서 서버로 보냅니다. (로컬 테스트용)
+
+    Args:
+        url (str): webhook 서버 URL
+        payload_path (str): payload JSON 파일 경로
+        event (str): X-GitHub-Event 헤더 값
+        secret (str): 서명에 사용할 secret
+        delivery_id (str): X-GitHub-Delivery 헤더 값 (None이면 새로 만듦, 같은 값으로 보내면 중복 처리 확인 가능)
+
+    Returns:
+        requests.Response: 서버 응답
+    """
+    with open(payload_path, "rb") as f:
+        body = f.read()
+    headers = {
+        "Content-Type": "application/json",
+        "X-GitHub-Event": event,
+        "X-GitHub-Delivery": delivery_id or str(uuid.uuid4()),
+        "X-Hub-Signature-256": sign_payload(secret, body)
+    }
+    return get_http_client().post(url, data=body, headers=headers)
+
+def main():
+    parser = argparse.ArgumentParser(description="GitHub webhook 수신 서버")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="webhook 수신 서버 실행")
+    serve_parser.add_argument("--host", default=GITHUB_WEBHOOK_HOST)
+    serve_parser.add_argument("--port", type=int, default=GITHUB_WEBHOOK_PORT)
+
+    replay_parser = commands.add_parser("replay", help="저장한 payload를 서명해서 서버로 전송")
+    replay_parser.add_argument("payload", help="webhook payload JSON 파일")
+    replay_parser.add_argument("--url", default=f"http://127.0.0.1:{GITHUB_WEBHOOK_PORT}{GITHUB_WEBHOOK_PATH}")
+    replay_parser.add_argument("--event", default="pull_request")
+    replay_parser.add_argument("--delivery", help="X-GitHub-Delivery 값 (중복 처리 확인용)")
+
+    args = parser.parse_args()
+    if not GITHUB_WEBHOOK_SECRET:
+        print("GITHUB_WEBHOOK_SECRET need to be set.")
+        return
+
+    if args.command == "serve":
+        server = WebhookServer((args.host, args.port), GITHUB_WEBHOOK_SECRET)
+        print(f"GitHub webhook 대기 중: http://{args.host}:{args.port}{GITHUB_WEBHOOK_PATH}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        server.server_close()
+    else:
+        response = replay_payload(args.url, args.payload, args.event, delivery_id=args.delivery)
+        print(f"{response.status_code} {response.text}")
+
+if __name__ == "__main__":
+    main()
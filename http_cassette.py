@@ -0,0 +1,222 @@
+import base64
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import deque
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# "record": 실제 GitHub / Slack 요청과 응답을 cassette 파일에 기록
+# "replay": 네트워크 없이 cassette에 기록된 응답을 돌려줌 (비우면 사용 안 함)
+HTTP_CASSETTE_MODE = os.getenv("HTTP_CASSETTE_MODE", "")
+HTTP_CASSETTE_PATH = os.getenv(
+    "HTTP_CASSETTE_PATH", os.path.join(os.getenv("PR_NOTIFY_STATE_DIR", ".pr_notify_state"), "cassette.jsonl.gz")
+)
+# replay할 때 기록된 응답 시간에 곱해서 기다릴 배수 (0이면 기다리지 않음, 1이면 기록된 시간 그대로)
+HTTP_CASSETTE_LATENCY = float(os.getenv("HTTP_CASSETTE_LATENCY", "0"))
+
+# cassette에 기록하지 않는 요청 헤더 (인증 정보)
+REDACTED_HEADERS = ("authorization", "cookie", "proxy-authorization")
+# 같은 요청인지 비교할 때 쓰는 조건부 요청 헤더 (있으면 304 응답이 기록됐을 수 있음)
+CONDITIONAL_HEADERS = ("if-none-match", "if-modified-since")
+
+def cassette_url(url):
+    """
+    cassette에 기록할 URL을 만듭니다.
+    Slack webhook URL은 경로 자체가 비밀 값이므로 host만 남깁니다.
+    """
+    parsed = urlparse(url)
+    if "/services/" in parsed.path:
+        return f"{parsed.scheme}://{parsed.netloc}/services/***"
+    return url
+
+def exchange_keys(method, url, body, headers):
+    """
+    요청을 cassette의 응답과 맞출 때 쓰는 key를 만듭니다.
+
+    Returns:
+        tuple: (본문까지 같은 요청의 key, method / URL만 같은 요청의 key)
+    """
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    conditional = any(name in CONDITIONAL_HEADERS for name in (name.lower() for name in headers))
+    loose = f"{method} {cassette_url(url)} {'conditional' if conditional else ''}".rstrip()
+    return f"{loose} {hashlib.sha256(body or b'').hexdigest()[:16]}", loose
+
+class HttpCassette:
+    """
+    HTTP 요청 / 응답을 기록하고 다시 재생하는 cassette 파일입니다.
+
+    파일은 gzip으로 압축한 JSON lines이며, 한 줄이 요청 하나(method, URL, 인증 헤더를 뺀 요청 헤더,
+    본문 hash, 응답 상태 / 헤더 / 본문, 걸린 시간)입니다. 기록할 때는 응답을 받을 때마다
+    gzip member 하나씩 파일 끝에 붙이므로 여러 프로세스가 같은 파일에 기록할 수 있습니다.
+    (다시 기록하려면 파일을 지우고 실행)
+
+    재생할 때는 method / URL / 본문 / 조건부 요청 여부가 같은 응답을 기록된 순서대로 돌려주고,
+    본문이 다르면(Slack 메시지 시각 등) method / URL만 같은 응답을 씁니다.
+    같은 요청을 기록된 횟수보다 많이 보내면 마지막 응답을 다시 씁니다.
+    ETag 캐시 등 상태에 따라 보내는 요청이 달라지므로 기록할 때와 같은 PR_NOTIFY_STATE_DIR
+    (처음 기록했다면 빈 디렉터리)에서 재생해야 합니다.
+    응답 본문(PR 내용 등)이 그대로 들어 있으므로 cassette 파일은 비공개로 다뤄야 합니다.
+    """
+
+    def __init__(self, path, mode, latency=HTTP_CASSETTE_LATENCY, sleep=time.sleep):
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self.sleep = sleep
+        self.lock = threading.Lock()
+        self.exchanges = []
+        # { key: deque[exchange 번호] }
+        self.by_key = {}
+        self.by_loose_key = {}
+        self.used = set()
+        # { method / URL key: 마지막으로 쓴 exchange 번호 }
+        self.last_used = {}
+        if mode == "replay":
+            self.load()
+
+    def load(self):
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            for line in f:
+                exchange = json.loads(line)
+                index = len(self.exchanges)
+                self.exchanges.append(exchange)
+                self.by_key.setdefault(exchange["key"], deque()).append(index)
+                self.by_loose_key.setdefault(exchange["loose_key"], deque()).append(index)
+        print(f"HTTP cassette에서 응답 {len(self.exchanges)}개를 읽었습니다. ({self.path})")
+
+    def record(self, request, response, elapsed):
+        """
+        받은 응답 하나를 cassette 파일 끝에 기록합니다.
+        """
+        key, loose_key = exchange_keys(request.method, request.url, request.body, request.headers)
+        body = response.content
+        try:
+            body, encoding = body.decode("utf-8"), "utf-8"
+        except UnicodeDecodeError:
+            body, encoding = base64.b64encode(body).decode("ascii"), "base64"
+        exchange = {
+            "key": key,
+            "loose_key": loose_key,
+            "method": request.method,
+            "url": cassette_url(request.url),
+            "request_headers": {
+                name: value for name, value in request.headers.items() if name.lower() not in REDACTED_HEADERS
+            },
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": dict(response.headers),
+            "body": body,
+            "body_encoding": encoding,
+            "elapsed": round(elapsed, 6),
+            "recorded_at": time.time()
+        }
+        # gzip member 하나를 write 한 번으로 붙여서 다른 프로세스의 기록과 섞이지 않게 함
+        member = gzip.compress((json.dumps(exchange, ensure_ascii=False) + "\n").encode("utf-8"))
+        with self.lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+            try:
+                os.write(fd, member)
+            finally:
+                os.close(fd)
+
+    def find(self, request):
+        """
+        요청에 맞는 기록된 응답을 찾습니다.
+
+        Returns:
+            dict: 기록된 요청 / 응답 (없으면 None)
+        """
+        key, loose_key = exchange_keys(request.method, request.url, request.body, request.headers)
+        with self.lock:
+            for indexes in (self.by_key.get(key), self.by_loose_key.get(loose_key)):
+                while indexes and indexes[0] in self.used:
+                    indexes.popleft()
+                if indexes:
+                    index = indexes.popleft()
+                    self.used.add(index)
+                    self.last_used[loose_key] = index
+                    return self.exchanges[index]
+            # 기록된 횟수보다 많이 요청하면 마지막으로 쓴 응답을 다시 씀
+            index = self.last_used.get(loose_key)
+            return self.exchanges[index] if index is not None else None
+
+    def replay(self, request):
+        """
+        기록된 응답으로 requests.Response를 만듭니다. latency가 있으면 기록된 시간만큼 기다립니다.
+
+        Raises:
+            requests.exceptions.ConnectionError: cassette에 없는 요청
+        """
+        exchange = self.find(request)
+        if exchange is None:
+            raise requests.exceptions.ConnectionError(
+                f"HTTP cassette에 기록되지 않은 요청입니다: {request.method} {cassette_url(request.url)}",
+                request=request
+            )
+        if self.latency > 0:
+            self.sleep(exchange["elapsed"] * self.latency)
+
+        response = requests.models.Response()
+        response.status_code = exchange["status"]
+        response.reason = exchange["reason"]
+        response.url = request.url
+        response.headers = CaseInsensitiveDict(exchange["headers"])
+        if exchange["body_encoding"] == "base64":
+            response._content = base64.b64decode(exchange["body"])
+        else:
+            response._content = exchange["body"].encode("utf-8")
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers) or "utf-8"
+        response.request = request
+        return response
+
+class CassetteAdapter(HTTPAdapter):
+    """
+    HttpClient가 사용하는 transport adapter입니다.
+    record 모드에서는 실제로 요청을 보내고 응답을 cassette에 기록하며,
+    replay 모드에서는 요청을 보내지 않고 cassette의 응답을 돌려줍니다.
+    """
+
+    def __init__(self, cassette, **kwargs):
+        self.cassette = cassette
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        if self.cassette.mode == "replay":
+            return self.cassette.replay(request)
+        started = time.perf_counter()
+        response = super().send(request, **kwargs)
+        # 본문을 모두 받은 시간까지 기록
+        response.content
+        self.cassette.record(request, response, time.perf_counter() - started)
+        return response
+
+http_cassette = None
+http_cassette_lock = threading.Lock()
+
+def get_http_cassette():
+    """
+    프로세스에서 공유하는 HTTP cassette를 가져옵니다.
+
+    Returns:
+        HttpCassette: cassette (HTTP_CASSETTE_MODE가 비어 있으면 None)
+    """
+    global http_cassette
+    if HTTP_CASSETTE_MODE not in ("record", "replay"):
+        return None
+    with http_cassette_lock:
+        if http_cassette is None:
+            http_cassette = HttpCassette(HTTP_CASSETTE_PATH, HTTP_CASSETTE_MODE)
+    return http_cassette
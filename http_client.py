@@ -0,0 +1,81 @@
+import os
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from dotenv import load_dotenv
+
+from http_cassette import CassetteAdapter, get_http_cassette
+
+load_dotenv()
+
+# 요청 timeout (초): 연결 / 응답 읽기
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "30"))
+# host마다 유지할 keep-alive 연결 수 (configure_host로 host별로 바꿀 수 있음)
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "4"))
+
+class HttpClient:
+    """
+    GitHub API와 Slack webhook 요청이 함께 사용하는 HTTP client입니다.
+    keep-alive 연결을 재사용하는 requests.Session 하나를 갖고 있어
+    요청마다 TCP/TLS 연결을 새로 맺지 않으며, 모든 요청에 timeout을 적용합니다.
+    여러 스레드에서 동시에 사용할 수 있습니다.
+
+    HTTP_CASSETTE_MODE가 record / replay면 모든 요청이 CassetteAdapter를 거쳐 기록되거나
+    기록된 응답으로 재생됩니다. (http_cassette)
+    """
+
+    def __init__(self, pool_maxsize=HTTP_POOL_MAXSIZE, timeout=(HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.mount("https://", self.make_adapter(pool_maxsize))
+        self.session.mount("http://", self.make_adapter(pool_maxsize))
+
+    def make_adapter(self, pool_maxsize):
+        # 연결 자체가 실패한 경우만 재시도 (응답을 받은 요청의 재시도는 호출하는 쪽에서 처리)
+        retries = Retry(total=2, connect=2, read=0, status=0, other=0, backoff_factor=0.3)
+        cassette = get_http_cassette()
+        if cassette is not None:
+            return CassetteAdapter(cassette, pool_connections=1, pool_maxsize=pool_maxsize, pool_block=False,
+                                   max_retries=retries)
+        return HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize, pool_block=False, max_retries=retries)
+
+    def configure_host(self, base_url, pool_maxsize):
+        """
+        base_url로 시작하는 요청에 사용할 연결 수를 따로 정합니다.
+
+        Args:
+            base_url (str): 대상 host의 URL (예: "https://api.github.com")
+            pool_maxsize (int): 유지할 keep-alive 연결 수 (동시 요청 수에 맞춤)
+        """
+        self.session.mount(base_url, self.make_adapter(pool_maxsize))
+
+    def request(self, method, url, **kwargs):
+        """
+        요청을 보냅니다. timeout을 지정하지 않으면 기본 timeout을 사용합니다.
+
+        Returns:
+            requests.Response: 받은 응답 (상태 코드는 확인하지 않음)
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+http_client = None
+http_client_lock = threading.Lock()
+
+def get_http_client():
+    """
+    프로세스에서 공유하는 HTTP client를 가져옵니다.
+    """
+    global http_client
+    with http_client_lock:
+        if http_client is None:
+            http_client = HttpClient()
+    return http_client
@@ -0,0 +1,285 @@
+import math
+import os
+import time
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from datetime import datetime
+from itertools import compress
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 마지막 변경 후 이 일수가 지난 PR을 오래된 PR로 셈 (쉼표로 구분, 첫 번째 값이 작성자 / repository별 기준)
+PR_STALE_DAYS = tuple(int(days) for days in os.getenv("PR_STALE_DAYS", "7,14,30").split(",") if days.strip())
+# repository별 새 PR / 변경된 PR을 셀 기간 (일)
+PR_ANALYTICS_WINDOW_DAYS = int(os.getenv("PR_ANALYTICS_WINDOW_DAYS", "7"))
+# 요약에 넣을 작성자 / 라벨 / repository 수
+PR_ANALYTICS_TOP = int(os.getenv("PR_ANALYTICS_TOP", "5"))
+
+DAY_SECONDS = 24 * 3600
+AGE_PERCENTILES = (0.5, 0.9, 0.99)
+
+def parse_time(value):
+    """
+    GitHub의 ISO 8601 시각(예: "2024-01-01T00:00:00Z")을 epoch 초로 바꿉니다.
+    """
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+def percentile(sorted_values, q):
+    """
+    정렬된 값에서 nearest-rank 방식으로 분위수를 구합니다. (값이 없으면 0)
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, min(len(sorted_values), math.ceil(q * len(sorted_values))))
+    return sorted_values[rank - 1]
+
+class Dictionary:
+    """
+    문자열 값(repository, 작성자, 라벨)을 0부터 시작하는 번호로 바꿔 column에는 번호만 저장합니다.
+    """
+
+    def __init__(self):
+        self.values = []
+        self.ids = {}
+
+    def encode(self, value):
+        value_id = self.ids.get(value)
+        if value_id is None:
+            value_id = self.ids[value] = len(self.values)
+            self.values.append(value)
+        return value_id
+
+    def decode_counts(self, counts):
+        return {self.values[value_id]: count for value_id, count in counts.items()}
+
+class PullRequestTable:
+    """
+    PR 목록을 column별 array로 저장한 표입니다.
+
+    PR마다 dict를 들고 있지 않고 repository / 작성자 번호(array("I")), 생성 / 변경 시각(array("d"))을
+    column으로 저장하고, 라벨과 리뷰 요청은 PR별 시작 위치(offsets)와 값 목록을 따로 둡니다.
+    그래서 PR이 수만 개여도 PR마다 dict나 record를 새로 만들지 않고 숫자 array 몇 개만 남습니다.
+
+    표를 만들 때와 나이 / 기간 mask를 만들 때는 여전히 PR마다 Python 반복을 한 번씩 거칩니다.
+    개수 집계는 Counter / compress / sorted / bisect에 column을 통째로 넘겨 C에서 세고,
+    작성자 / repository 이름은 마지막에 번호별 결과에만 붙입니다.
+    """
+
+    def __init__(self):
+        self.repositories = Dictionary()
+        # 작성자와 리뷰어는 같은 사용자 번호를 씀
+        self.people = Dictionary()
+        self.labels = Dictionary()
+        self.repository = array("I")
+        self.author = array("I")
+        self.created = array("d")
+        self.updated = array("d")
+        self.draft = array("b")
+        self.label_offsets = array("I", [0])
+        self.label = array("I")
+        self.reviewer_offsets = array("I", [0])
+        self.reviewer = array("I")
+
+    def __len__(self):
+        return len(self.repository)
+
+    @classmethod
+    def from_pull_requests(cls, all_pull_requests):
+        """
+        get_all_pull_requests 결과(API 응답 dict나 PullRequestRecord)로 표를 만듭니다.
+
+        Args:
+            all_pull_requests (dict): { 레포이름 : { "repository": 레포정보, "pull_requests": [PR, ...] } , ...}
+
+        Returns:
+            PullRequestTable: 표
+        """
+        table = cls()
+        for repo_name, data in all_pull_requests.items():
+            repo_id = table.repositories.encode(repo_name)
+            for pr in data["pull_requests"]:
+                table.append(repo_id, pr)
+        return table
+
+    def append(self, repo_id, pr):
+        if isinstance(pr, dict):
+            author = pr["user"]["login"] if "user" in pr else pr["author"]
+            labels = [label["name"] if isinstance(label, dict) else label for label in pr.get("labels", ())]
+            reviewers = [reviewer["login"] for reviewer in pr.get("requested_reviewers") or ()]
+        else:
+            author = pr.author
+            labels = pr.labels
+            reviewers = pr.requested_reviewers
+        self.repository.append(repo_id)
+        self.author.append(self.people.encode(author))
+        self.created.append(parse_time(pr["created_at"]))
+        self.updated.append(parse_time(pr["updated_at"]))
+        self.draft.append(1 if pr.get("draft") else 0)
+        self.label.extend(self.labels.encode(label) for label in labels)
+        self.label_offsets.append(len(self.label))
+        self.reviewer.extend(self.people.encode(reviewer) for reviewer in reviewers)
+        self.reviewer_offsets.append(len(self.reviewer))
+
+    def ages(self, now):
+        """
+        PR별 생성 후 지난 시간(초) column을 만듭니다.
+        """
+        return array("d", [now - created for created in self.created])
+
+    def idle_times(self, now):
+        """
+        PR별 마지막 변경 후 지난 시간(초) column을 만듭니다.
+        """
+        return array("d", [now - updated for updated in self.updated])
+
+    def stale_counts(self, now, stale_days=PR_STALE_DAYS):
+        """
+        마지막 변경 후 기준 일수가 지난 PR 수를 기준마다 셉니다.
+
+        Returns:
+            dict: { 일수: PR 수 }
+        """
+        idle = sorted(self.idle_times(now))
+        return {days: len(idle) - bisect_right(idle, days * DAY_SECONDS) for days in stale_days}
+
+    def age_percentiles(self, now, percentiles=AGE_PERCENTILES):
+        """
+        PR 나이(일)의 분위수를 구합니다.
+
+        Returns:
+            dict: { "p50": 일수, "p90": 일수, ... }
+        """
+        ages = sorted(self.ages(now))
+        return {f"p{round(q * 100)}": round(percentile(ages, q) / DAY_SECONDS, 1) for q in percentiles}
+
+    def count_by(self, column, mask=None):
+        """
+        column 값(번호)별 PR 수를 셉니다. mask를 주면 mask가 1인 PR만 셉니다.
+        """
+        return Counter(column if mask is None else compress(column, mask))
+
+    def author_stats(self, now, stale_days=PR_STALE_DAYS, top=PR_ANALYTICS_TOP):
+        """
+        작성자별 open PR 수, 오래된 PR 수, 리뷰 요청을 받은 PR 수를 셉니다.
+
+        Returns:
+            list: [{ "author", "open", "stale", "review_requests" }, ...] (open PR과 리뷰 요청이 많은 순으로 top개)
+        """
+        stale = self.stale_mask(now, stale_days)
+        opened = self.count_by(self.author)
+        stale_by_author = self.count_by(self.author, stale)
+        review_requests = self.count_by(self.reviewer)
+        people = set(opened) | set(review_requests)
+        stats = [
+            {
+                "author": self.people.values[person],
+                "open": opened.get(person, 0),
+                "stale": stale_by_author.get(person, 0),
+                "review_requests": review_requests.get(person, 0)
+            }
+            for person in people
+        ]
+        stats.sort(key=lambda stat: (-(stat["open"] + stat["review_requests"]), stat["author"]))
+        return stats[:top]
+
+    def label_counts(self, top=PR_ANALYTICS_TOP):
+        """
+        라벨별 PR 수를 셉니다.
+
+        Returns:
+            list: [(라벨, PR 수), ...] (많은 순으로 top개)
+        """
+        counts = self.labels.decode_counts(Counter(self.label))
+        return sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:top]
+
+    def repository_stats(self, now, stale_days=PR_STALE_DAYS, window_days=PR_ANALYTICS_WINDOW_DAYS,
+                         top=PR_ANALYTICS_TOP, closed=None):
+        """
+        repository별 open PR 수, 기간 안에 새로 열린 / 변경된 PR 수, 오래된 PR 수, 가장 오래된 PR의 나이와
+        지난 digest 이후 merge / close 된 PR 수를 구합니다.
+
+        Args:
+            closed (dict): pr_snapshot.count_closed_by_repository 결과 { "merged": {레포이름: 수}, "closed": {...} }
+                (None이면 merge / close 된 PR 수는 0, open PR이 없는 repository도 닫힌 PR이 있으면 포함)
+
+        Returns:
+            list: [{ "repo", "open", "opened", "updated", "stale", "oldest_days", "merged", "closed" }, ...]
+                (open PR이 많은 순으로 top개)
+        """
+        since = now - window_days * DAY_SECONDS
+        opened = self.count_by(self.repository)
+        recently_opened = self.count_by(self.repository, array("b", [created >= since for created in self.created]))
+        recently_updated = self.count_by(self.repository, array("b", [updated >= since for updated in self.updated]))
+        stale = self.count_by(self.repository, self.stale_mask(now, stale_days))
+        oldest = {}
+        for repo_id, created in zip(self.repository, self.created):
+            if created < oldest.get(repo_id, now):
+                oldest[repo_id] = created
+
+        merged_by_repo = closed["merged"] if closed else {}
+        closed_by_repo = closed["closed"] if closed else {}
+
+        stats = [
+            {
+                "repo": self.repositories.values[repo_id],
+                "open": count,
+                "opened": recently_opened.get(repo_id, 0),
+                "updated": recently_updated.get(repo_id, 0),
+                "stale": stale.get(repo_id, 0),
+                "oldest_days": round((now - oldest.get(repo_id, now)) / DAY_SECONDS, 1),
+                "merged": merged_by_repo.get(self.repositories.values[repo_id], 0),
+                "closed": closed_by_repo.get(self.repositories.values[repo_id], 0)
+            }
+            for repo_id, count in opened.items()
+        ]
+        # open PR이 모두 닫힌 repository는 표에 없으므로 따로 추가
+        for repo_name in sorted((set(merged_by_repo) | set(closed_by_repo)) - set(self.repositories.ids)):
+            stats.append({"repo": repo_name, "open": 0, "opened": 0, "updated": 0, "stale": 0, "oldest_days": 0.0,
+                          "merged": merged_by_repo.get(repo_name, 0), "closed": closed_by_repo.get(repo_name, 0)})
+        stats.sort(key=lambda stat: (-stat["open"], -(stat["merged"] + stat["closed"]), stat["repo"]))
+        return stats[:top]
+
+    def stale_mask(self, now, stale_days=PR_STALE_DAYS):
+        """
+        첫 번째 기준 일수보다 오래 변경되지 않은 PR이면 1인 column을 만듭니다.
+        """
+        threshold = now - (stale_days[0] if stale_days else 0) * DAY_SECONDS
+        return array("b", [updated < threshold for updated in self.updated])
+
+    def summary(self, now=None, stale_days=PR_STALE_DAYS, window_days=PR_ANALYTICS_WINDOW_DAYS, top=PR_ANALYTICS_TOP,
+                closed=None):
+        """
+        send_daily_summary에 넣을 통계를 계산합니다. (closed는 repository_stats 참고)
+
+        Returns:
+            dict: { "analyzed_prs", "draft_prs", "age_percentiles", "stale_prs", "top_authors", "top_labels",
+                    "top_repositories", "window_days" }
+        """
+        if now is None:
+            now = time.time()
+        return {
+            "analyzed_prs": len(self),
+            "draft_prs": sum(self.draft),
+            "age_percentiles": self.age_percentiles(now),
+            "stale_prs": self.stale_counts(now, stale_days),
+            "top_authors": self.author_stats(now, stale_days, top),
+            "top_labels": self.label_counts(top),
+            "top_repositories": self.repository_stats(now, stale_days, window_days, top, closed),
+            "window_days": window_days
+        }
+
+def analyze_pull_requests(all_pull_requests, now=None, closed=None):
+    """
+    get_all_pull_requests 결과로 PR 통계를 계산합니다.
+
+    Args:
+        all_pull_requests (dict): { 레포이름 : { "repository": 레포정보, "pull_requests": [PR, ...] } , ...}
+        now (float): 기준 시각 (epoch 초, None이면 지금)
+        closed (dict): repository별 merge / close 된 PR 수 (pr_snapshot.count_closed_by_repository 결과)
+
+    Returns:
+        dict: PullRequestTable.summary 결과
+    """
+    return PullRequestTable.from_pull_requests(all_pull_requests).summary(now, closed=closed)
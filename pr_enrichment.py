@@ -0,0 +1,211 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from dotenv import load_dotenv
+
+from github_api_client import github_get, iter_pages
+from pr_metrics import get_metrics
+from pr_records import repository_full_name
+from pr_watermarks import PR_NOTIFY_STATE_DIR
+
+load_dotenv()
+
+GITHUB_API_BASE = os.getenv("GITHUB_API_BASE", "https://api.github.com")
+
+# head SHA별 PR 상세 정보(merge 가능 여부, 리뷰, CI 상태) 캐시 파일
+PR_ENRICHMENT_CACHE_PATH = os.path.join(PR_NOTIFY_STATE_DIR, "enrichment.json")
+# PR 상세 정보를 동시에 가져올 PR 수
+PR_ENRICHMENT_WORKERS = int(os.getenv("PR_ENRICHMENT_WORKERS", "4"))
+# 이 시간(초) 동안 보지 않은 PR의 캐시는 지움
+PR_ENRICHMENT_CACHE_MAX_AGE = 30 * 24 * 3600
+
+# 결과가 아직 정해지지 않은 CI 상태 (캐시하지 않고 다음 실행에서 다시 확인)
+PENDING_CI_STATES = ("pending",)
+
+def enrichment_key(owner, repo, pr):
+    return f"{owner}/{repo}#{pr['number']}"
+
+def summarize_reviews(reviews):
+    """
+    리뷰 목록을 리뷰어별 마지막 의견으로 요약합니다.
+
+    Returns:
+        str: "changes_requested"(변경 요청이 하나라도 있음), "approved", "commented", 리뷰가 없으면 None
+    """
+    latest = {}
+    for review in reviews:
+        state = review.get("state")
+        if state in ("APPROVED", "CHANGES_REQUESTED", "DISMISSED"):
+            latest[review["user"]["login"]] = state
+        elif state == "COMMENTED":
+            latest.setdefault(review["user"]["login"], state)
+    states = set(latest.values())
+    if "CHANGES_REQUESTED" in states:
+        return "changes_requested"
+    if "APPROVED" in states:
+        return "approved"
+    if "COMMENTED" in states:
+        return "commented"
+    return None
+
+def fetch_enrichment(owner, repo, number, cached=None):
+    """
+    PR 하나의 상세 정보, 리뷰, head commit의 combined status를 가져옵니다.
+
+    mergeable은 base branch가 움직이면 PR의 head와 updated_at이 그대로여도 바뀌므로 상세 정보는 항상 다시 가져옵니다.
+    (github_get이 ETag로 조건부 요청하므로 바뀌지 않은 PR은 304로 끝남)
+    리뷰와 CI 상태는 cached의 head SHA와 updated_at이 상세 정보와 같으면 다시 요청하지 않고 그대로 씁니다.
+
+    Args:
+        owner (str): repository 소유자
+        repo (str): repository 이름
+        number (int): PR 번호
+        cached (dict): 이 PR의 캐시 항목 (없으면 None)
+
+    Returns:
+        tuple: ({ "head_sha", "base_sha", "updated_at", "mergeable", "review_state", "ci_state" },
+                캐시의 리뷰 / CI 상태를 썼으면 True)
+
+    Raises:
+        requests.exceptions.RequestException: API 요청 실패
+    """
+    url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}/pulls/{number}"
+    detail = github_get(url).json()
+    head_sha = detail["head"]["sha"]
+    entry = {
+        "head_sha": head_sha,
+        "base_sha": (detail.get("base") or {}).get("sha"),
+        "updated_at": detail["updated_at"],
+        "mergeable": detail.get("mergeable")
+    }
+    if cached is not None and cached["head_sha"] == head_sha and cached["updated_at"] == detail["updated_at"]:
+        entry["review_state"] = cached["review_state"]
+        entry["ci_state"] = cached["ci_state"]
+        return entry, True
+
+    reviews = list(iter_pages(f"{url}/reviews", {"per_page": 100}))
+    status = github_get(f"{GITHUB_API_BASE}/repos/{owner}/{repo}/commits/{head_sha}/status").json()
+    entry["review_state"] = summarize_reviews(reviews)
+    # status를 하나도 보고하지 않은 commit은 state가 "pending"이고 total_count가 0
+    entry["ci_state"] = status["state"] if status.get("total_count") else None
+    return entry, False
+
+class PullRequestEnricher:
+    """
+    목록 API에 없는 PR 정보(merge 가능 여부, 리뷰 상태, CI 상태)를 채웁니다.
+
+    merge 가능 여부는 base branch가 움직이면 바뀌므로 PR마다 상세 정보를 항상 다시 확인합니다. (ETag로 조건부 요청)
+    리뷰와 CI 상태는 PR의 head SHA로 캐시해서 head와 updated_at이 그대로인 PR은 다시 요청하지 않습니다.
+    (리뷰가 달리면 updated_at이 바뀜) GitHub가 아직 계산 중인 값(mergeable이 null,
+    CI가 pending)은 캐시하지 않고 다음 실행에서 다시 확인합니다.
+    """
+
+    def __init__(self, path=PR_ENRICHMENT_CACHE_PATH, max_workers=PR_ENRICHMENT_WORKERS):
+        self.path = path
+        self.max_workers = max_workers
+        try:
+            with open(path, encoding="utf-8") as f:
+                self.entries = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.entries = {}
+
+    def cached(self, key, pr):
+        """
+        캐시된 리뷰 / CI 상태를 이 PR에 그대로 쓸 수 있으면 캐시 항목을 돌려줍니다.
+        """
+        entry = self.entries.get(key)
+        head_sha = pr.get("head_sha") or (pr.get("head") or {}).get("sha")
+        if entry is None or entry["updated_at"] != pr["updated_at"]:
+            return None
+        # 검색 API로 가져온 PR은 head SHA가 없으므로 updated_at만 비교 (push하면 updated_at도 바뀜)
+        if head_sha is not None and entry["head_sha"] != head_sha:
+            return None
+        return entry
+
+    def enrich(self, owner, all_pull_requests):
+        """
+        get_all_pull_requests 결과의 PR마다 mergeable, review_state, ci_state를 채웁니다.
+        (API 응답 dict는 key를 추가하고, PullRequestRecord는 필드를 바꿈)
+
+        Args:
+            owner (str): 사용자명 또는 organization 이름
+            all_pull_requests (dict): { 레포이름 : { "repository": 레포정보, "pull_requests": [PR, ...] } , ...}
+
+        Returns:
+            dict: { "cached": 리뷰 / CI 상태를 캐시에서 채운 PR 수, "fetched": 모두 새로 가져온 PR 수, "failed": 실패한 PR 수 }
+        """
+        counts = {"cached": 0, "fetched": 0, "failed": 0}
+        metrics = get_metrics()
+        pending = []
+        now = time.time()
+        for repo_name, data in all_pull_requests.items():
+            # 협업자로 참여한 repository는 소유자가 owner와 다르므로 PR API URL은 full_name으로 만듦
+            full_name = repository_full_name(owner, data["repository"])
+            for pr in data["pull_requests"]:
+                key = enrichment_key(owner, repo_name, pr)
+                pending.append((key, full_name, pr, self.cached(key, pr)))
+
+        if pending:
+            with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(pending)))) as executor:
+                futures = [(key, pr, executor.submit(fetch_enrichment, *full_name.split("/"), pr["number"], cached))
+                           for key, full_name, pr, cached in pending]
+                for key, pr, future in futures:
+                    try:
+                        entry, reused = future.result()
+                    except (requests.exceptions.RequestException, ValueError, KeyError) as e:
+                        print(f"  - {key} 상세 정보 조회 실패: {e}")
+                        counts["failed"] += 1
+                        continue
+                    self.apply(pr, entry)
+                    counts["cached" if reused else "fetched"] += 1
+                    if entry["mergeable"] is not None and entry["ci_state"] not in PENDING_CI_STATES:
+                        self.entries[key] = {**entry, "checked_at": now}
+                    elif key in self.entries:
+                        # mergeable을 계산 중이어도 캐시의 리뷰 / CI 상태는 계속 쓸 수 있으므로 지우지 않음
+                        self.entries[key]["checked_at"] = now
+
+        for outcome in ("cached", "fetched", "failed"):
+            metrics.inc("pull_request_enrichments_total", counts[outcome], outcome=outcome)
+        return counts
+
+    def apply(self, pr, entry):
+        for field in ("mergeable", "review_state", "ci_state"):
+            if isinstance(pr, dict):
+                pr[field] = entry[field]
+            else:
+                setattr(pr, field, entry[field])
+
+    def save(self):
+        """
+        캐시를 파일에 기록합니다. 오래 보지 않은 PR(닫힌 PR 등)의 항목은 지웁니다.
+        """
+        now = time.time()
+        self.entries = {
+            key: entry for key, entry in self.entries.items()
+            if now - entry.get("checked_at", 0) < PR_ENRICHMENT_CACHE_MAX_AGE
+        }
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, sort_keys=True)
+        os.replace(temp_path, self.path)
+
+def enrich_results(results, max_workers=PR_ENRICHMENT_WORKERS):
+    """
+    owner별 조회 결과의 PR을 모두 채우고 캐시를 저장합니다.
+
+    Args:
+        results (list): fetch_owner_pull_requests 결과 목록 ({ "owner", "pull_requests", ... })
+        max_workers (int): PR 상세 정보를 동시에 가져올 PR 수
+    """
+    enricher = PullRequestEnricher(max_workers=max_workers)
+    for result in results:
+        counts = enricher.enrich(result["owner"], result["pull_requests"])
+        print(f"'{result['owner']}' PR 상세 정보: 캐시 {counts['cached']}개 / 새로 조회 {counts['fetched']}개 / "
+              f"실패 {counts['failed']}개")
+    enricher.save()
@@ -0,0 +1,455 @@
+"""
+repository와 pull request를 로컬 SQLite에 저장해 두고 네트워크 없이 조회합니다.
+
+    python pr_index.py refresh samdasoo2l
+    python pr_index.py query --author octocat --older-than 7
+    python pr_index.py query --label bug --draft
+    python pr_index.py count repo --draft
+"""
+import argparse
+import json
+import os
+import sqlite3
+import threading
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from dotenv import load_dotenv
+
+from pr_records import PullRequestRecord, RepositoryRecord, repository_full_name
+from pr_watermarks import HighWaterMarks, PR_NOTIFY_STATE_DIR
+
+load_dotenv()
+
+# SQLite 파일 위치
+PR_INDEX_PATH = os.getenv("PR_INDEX_PATH", os.path.join(PR_NOTIFY_STATE_DIR, "pr_index.sqlite3"))
+
+# SCHEMA가 바뀌면 올림 (기록된 값보다 작은 index는 지우고 처음부터 다시 만듦)
+SCHEMA_VERSION = 2
+
+# owner는 목록을 조회한 owner, full_name은 "소유자/이름"
+# (협업자로 참여한 repository는 소유자가 owner와 다르고 이름이 같은 repository가 여럿일 수 있으므로 full_name으로 구분)
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS repositories (
+    owner TEXT NOT NULL,
+    full_name TEXT NOT NULL,
+    name TEXT NOT NULL,
+    html_url TEXT,
+    description TEXT,
+    private INTEGER NOT NULL,
+    PRIMARY KEY (owner, full_name)
+);
+CREATE TABLE IF NOT EXISTS pull_requests (
+    owner TEXT NOT NULL,
+    full_name TEXT NOT NULL,
+    repo TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    title TEXT,
+    body TEXT,
+    state TEXT NOT NULL,
+    author TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    url TEXT,
+    draft INTEGER NOT NULL,
+    mergeable INTEGER,
+    labels TEXT NOT NULL,
+    head_sha TEXT,
+    PRIMARY KEY (owner, full_name, number)
+);
+CREATE TABLE IF NOT EXISTS pull_request_labels (
+    owner TEXT NOT NULL,
+    full_name TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    label TEXT NOT NULL,
+    PRIMARY KEY (owner, full_name, number, label)
+);
+CREATE INDEX IF NOT EXISTS pull_requests_repo ON pull_requests (owner, repo, state);
+CREATE INDEX IF NOT EXISTS pull_requests_author ON pull_requests (author, state);
+CREATE INDEX IF NOT EXISTS pull_requests_state ON pull_requests (state, updated_at);
+CREATE INDEX IF NOT EXISTS pull_requests_updated_at ON pull_requests (updated_at);
+CREATE INDEX IF NOT EXISTS pull_request_labels_label ON pull_request_labels (label);
+"""
+
+# count_pull_requests에서 묶을 수 있는 기준과 SQL 표현식
+GROUP_BY_COLUMNS = {
+    "repo": "p.full_name",
+    "author": "p.author",
+    "state": "p.state",
+    "label": "l.label"
+}
+
+class PullRequestIndex:
+    """
+    get_all_pull_requests의 결과를 repository / PR 단위로 upsert 해두는 SQLite 저장소입니다.
+    repository, author, state, updated_at, label에 index가 있어 보고서를 만들 때 GitHub에 다시 묻지 않습니다.
+
+    refresh는 state="all"과 high-water mark로 마지막 refresh 이후 변경된 PR만 가져오므로
+    open → closed로 바뀐 PR도 index에 반영됩니다.
+    """
+
+    def __init__(self, path=PR_INDEX_PATH):
+        self.path = path
+        # refresh 전용 high-water mark (index 파일과 함께 있어야 의미가 있음)
+        self.watermarks_path = f"{path}.watermarks.json"
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.created = not os.path.exists(path)
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if not self.created and version < SCHEMA_VERSION:
+            # 예전 형식의 index는 GitHub에서 다시 만들 수 있으므로 지우고 전체를 다시 가져옴
+            print("PR index 형식이 바뀌어 index를 다시 만듭니다.")
+            self.connection.executescript(
+                "DROP TABLE IF EXISTS pull_request_labels; DROP TABLE IF EXISTS pull_requests; "
+                "DROP TABLE IF EXISTS repositories;"
+            )
+            self.created = True
+        self.connection.executescript(SCHEMA)
+        self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self):
+        self.connection.close()
+
+    def upsert(self, owner, all_pull_requests):
+        """
+        get_all_pull_requests의 결과를 저장합니다. 같은 PR은 최신 값으로 덮어씁니다.
+
+        Args:
+            owner (str): 사용자명 또는 organization 이름
+            all_pull_requests (dict): { 레포이름 : { "repository": dict, "pull_requests": [dict, ...] } , ...}
+                (API 응답 dict와 RepositoryRecord / PullRequestRecord 모두 가능)
+
+        Returns:
+            int: 저장한 PR 수
+        """
+        count = 0
+        with self.lock, self.connection:
+            for repo_name, data in all_pull_requests.items():
+                repository = data["repository"]
+                if not isinstance(repository, RepositoryRecord):
+                    repository = RepositoryRecord.from_api(repository)
+                full_name = repository_full_name(owner, repository)
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO repositories (owner, full_name, name, html_url, description, private) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (owner, full_name, repository.name, repository.html_url, repository.description,
+                     int(bool(repository.private)))
+                )
+                for pr in data["pull_requests"]:
+                    if not isinstance(pr, PullRequestRecord):
+                        pr = PullRequestRecord.from_api(pr)
+                    self.connection.execute(
+                        "INSERT OR REPLACE INTO pull_requests (owner, full_name, repo, number, title, body, state, "
+                        "author, created_at, updated_at, url, draft, mergeable, labels, head_sha) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (owner, full_name, repository.name, pr.number, pr.title, pr.body, pr.state, pr.author,
+                         pr.created_at, pr.updated_at, pr.url, int(bool(pr.draft)), pr.mergeable,
+                         json.dumps(list(pr.labels)), pr.head_sha)
+                    )
+                    self.connection.execute(
+                        "DELETE FROM pull_request_labels WHERE owner = ? AND full_name = ? AND number = ?",
+                        (owner, full_name, pr.number)
+                    )
+                    self.connection.executemany(
+                        "INSERT OR IGNORE INTO pull_request_labels (owner, full_name, number, label) "
+                        "VALUES (?, ?, ?, ?)",
+                        [(owner, full_name, pr.number, label) for label in pr.labels]
+                    )
+                    count += 1
+        return count
+
+    def prune(self, owner, listed, repo_type="private"):
+        """
+        repository 목록에 없는 repository(지워졌거나 token으로 더 이상 볼 수 없음)와 그 PR을 지웁니다.
+        지우지 않으면 그 PR은 index에서 계속 open으로 남습니다. 목록을 끝까지 가져왔을 때만 호출해야 합니다.
+
+        Args:
+            owner (str): 사용자명 또는 organization 이름
+            listed (list): 이번에 가져온 repository 목록의 full_name
+            repo_type (str): 목록을 가져온 repository 타입 (이 타입의 repository만 비교)
+
+        Returns:
+            int: 지운 repository 수
+        """
+        conditions = ["owner = ?"]
+        if repo_type == "private":
+            conditions.append("private = 1")
+        elif repo_type == "public":
+            conditions.append("private = 0")
+        listed = set(listed)
+        with self.lock, self.connection:
+            missing = [
+                row["full_name"] for row in self.connection.execute(
+                    f"SELECT full_name FROM repositories WHERE {' AND '.join(conditions)}", (owner,)
+                )
+                if row["full_name"] not in listed
+            ]
+            for table in ("pull_request_labels", "pull_requests", "repositories"):
+                self.connection.executemany(
+                    f"DELETE FROM {table} WHERE owner = ? AND full_name = ?",
+                    [(owner, full_name) for full_name in missing]
+                )
+        if missing:
+            print(f"repository 목록에 없는 {len(missing)}개 repository를 index에서 지웠습니다: {', '.join(missing)}")
+        return len(missing)
+
+    def refresh(self, owner, repo_type="private", max_workers=None, failures=None, owner_type="self",
+                force_refresh=False):
+        """
+        마지막 refresh 이후 변경된 PR만 GitHub에서 가져와 index에 반영합니다.
+        처음 실행하면 (index 파일이 없으면) 모든 PR을 가져옵니다.
+
+        Args:
+            owner (str): 사용자명 또는 organization 이름
+            repo_type (str): repository 타입 ("all", "private"(default), "public")
+            max_workers (int): 동시에 PR을 조회할 repository 수
+            failures (dict): 전달하면 조회에 실패한 repository를 { 레포이름: 오류 메시지 }로 기록
+            owner_type (str): owner 종류 ("self"(default), "user", "org")
+            force_refresh (bool): True면 repository 목록 캐시를 무시하고 목록을 다시 가져옴
+
+        Returns:
+            int: 새로 저장하거나 갱신한 PR 수
+        """
+        # github_api_notify가 이 모듈을 import 하므로 순환 import를 피하기 위해 여기서 import
+        from github_api_notify import get_all_pull_requests
+
+        if failures is None:
+            failures = {}
+        listed = []
+
+        watermarks = HighWaterMarks(self.watermarks_path)
+        if self.created:
+            # index를 새로 만들었으면 예전 high-water mark는 무시하고 전체를 가져옴
+            watermarks.marks = {}
+        changed = get_all_pull_requests(owner, state="all", repo_type=repo_type, max_workers=max_workers,
+                                        failures=failures, backend="rest", watermarks=watermarks, compact=True,
+                                        owner_type=owner_type, listed=listed, force_refresh=force_refresh)
+        count = self.upsert(owner, changed)
+        if "*" not in failures:
+            # 목록을 끝까지 가져왔을 때만 목록에서 사라진 repository를 지움
+            self.prune(owner, listed, repo_type)
+        # index에 반영한 뒤에만 high-water mark를 저장해야 중간에 실패해도 변경분을 놓치지 않음
+        watermarks.save()
+        self.created = False
+        return count
+
+    def query_pull_requests(self, owner=None, repo=None, author=None, state="open", label=None, draft=None,
+                            created_before=None, updated_before=None, updated_after=None, limit=None,
+                            full_name=None):
+        """
+        조건에 맞는 PR을 updated_at 내림차순으로 가져옵니다. None인 조건은 무시합니다.
+
+        Args:
+            owner (str): 사용자명 또는 organization 이름
+            repo (str): repository 이름
+            author (str): PR 작성자
+            state (str): PR 상태 ("open"(default), "closed", None이면 전체)
+            label (str): 붙어 있어야 하는 label
+            draft (bool): draft 여부
+            created_before (str): 이 시각 이전에 만든 PR만 (ISO 8601)
+            updated_before (str): 이 시각 이후로 변경이 없는 PR만 (ISO 8601)
+            updated_after (str): 이 시각 이후에 변경된 PR만 (ISO 8601)
+            limit (int): 최대 개수
+            full_name (str): repository의 "소유자/이름" (이름이 같은 repository를 구분할 때)
+
+        Returns:
+            list: (repository 이름, PullRequestRecord) 목록
+        """
+        conditions = []
+        params = []
+        for column, value in (("p.owner", owner), ("p.repo", repo), ("p.full_name", full_name),
+                              ("p.author", author), ("p.state", state)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        if label is not None:
+            conditions.append(
+                "EXISTS (SELECT 1 FROM pull_request_labels l WHERE l.owner = p.owner AND l.full_name = p.full_name "
+                "AND l.number = p.number AND l.label = ?)"
+            )
+            params.append(label)
+        if draft is not None:
+            conditions.append("p.draft = ?")
+            params.append(int(draft))
+        for column, operator, value in (("p.created_at", "<", created_before), ("p.updated_at", "<", updated_before),
+                                        ("p.updated_at", ">", updated_after)):
+            if value is not None:
+                conditions.append(f"{column} {operator} ?")
+                params.append(value)
+
+        sql = "SELECT * FROM pull_requests p"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY p.updated_at DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self.lock:
+            rows = self.connection.execute(sql, params).fetchall()
+        return [(row["repo"], self.to_record(row)) for row in rows]
+
+    def count_pull_requests(self, group_by, owner=None, state="open", draft=None):
+        """
+        기준별 PR 수를 셉니다. (예: repository별 draft 수, 작성자별 open PR 수)
+
+        Args:
+            group_by (str): 묶을 기준 ("repo", "author", "state", "label")
+            owner (str): 사용자명 또는 organization 이름
+            state (str): PR 상태 ("open"(default), "closed", None이면 전체)
+            draft (bool): draft 여부
+
+        Returns:
+            list: (기준 값, PR 수) 목록, 많은 순
+        """
+        column = GROUP_BY_COLUMNS[group_by]
+        sql = f"SELECT {column} AS key, COUNT(*) AS count FROM pull_requests p"
+        if group_by == "label":
+            sql += (" JOIN pull_request_labels l ON l.owner = p.owner AND l.full_name = p.full_name "
+                    "AND l.number = p.number")
+        conditions = []
+        params = []
+        if owner is not None:
+            conditions.append("p.owner = ?")
+            params.append(owner)
+        if state is not None:
+            conditions.append("p.state = ?")
+            params.append(state)
+        if draft is not None:
+            conditions.append("p.draft = ?")
+            params.append(int(draft))
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += f" GROUP BY {column} ORDER BY count DESC, key"
+
+        with self.lock:
+            return [(row["key"], row["count"]) for row in self.connection.execute(sql, params)]
+
+    def load_all_pull_requests(self, owner, state="open", repo_type="private"):
+        """
+        get_all_pull_requests와 같은 구조로 index에 있는 PR을 가져옵니다. (네트워크 요청 없음)
+
+        Args:
+            owner (str): 사용자명 또는 organization 이름
+            state (str): PR 상태 ("open"(default), "closed", "all")
+            repo_type (str): repository 타입 ("all", "private"(default), "public")
+
+        Returns:
+            dict: { 레포이름 : { "repository": RepositoryRecord, "pull_requests": [PullRequestRecord, ...] } , ...}
+        """
+        conditions = ["owner = ?"]
+        params = [owner]
+        if repo_type == "private":
+            conditions.append("private = 1")
+        elif repo_type == "public":
+            conditions.append("private = 0")
+        with self.lock:
+            repositories = self.connection.execute(
+                f"SELECT * FROM repositories WHERE {' AND '.join(conditions)} ORDER BY name", params
+            ).fetchall()
+
+        # 이름이 같은 repository가 여럿이면 "소유자/이름"을 key로 씀
+        names = Counter(row["name"] for row in repositories)
+        all_pull_requests = {}
+        for row in repositories:
+            pull_requests = [
+                pr for _, pr in self.query_pull_requests(owner, state=None if state == "all" else state,
+                                                         full_name=row["full_name"])
+            ]
+            if pull_requests:
+                repo_name = row["name"] if names[row["name"]] == 1 else row["full_name"]
+                all_pull_requests[repo_name] = {
+                    "repository": RepositoryRecord(row["name"], row["html_url"], row["description"],
+                                                   bool(row["private"]), row["full_name"]),
+                    "pull_requests": pull_requests
+                }
+        return all_pull_requests
+
+    def to_record(self, row):
+        return PullRequestRecord(
+            number=row["number"],
+            title=row["title"],
+            body=row["body"],
+            state=row["state"],
+            author=row["author"],
+            created_at=row["created_at"],
+            updated_at=row["updated_at"],
+            url=row["url"],
+            draft=bool(row["draft"]),
+            mergeable=row["mergeable"],
+            labels=tuple(json.loads(row["labels"])),
+            head_sha=row["head_sha"]
+        )
+
+def days_ago(days):
+    """
+    지금부터 days일 전 시각을 GitHub API와 같은 ISO 8601 UTC 문자열로 돌려줍니다.
+    """
+    return (datetime.now(timezone.utc) - timedelta(days=days)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 PR index 관리 / 조회")
+    parser.add_argument("--path", default=PR_INDEX_PATH, help="SQLite 파일 경로")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    refresh_parser = commands.add_parser("refresh", help="변경된 PR만 GitHub에서 가져와 index 갱신")
+    refresh_parser.add_argument("owner", help="사용자명 또는 organization 이름")
+    refresh_parser.add_argument("--repo-type", default="private", choices=["all", "private", "public"])
+    refresh_parser.add_argument("--owner-type", default="self", choices=["self", "user", "org"])
+    refresh_parser.add_argument("--refresh-repos", action="store_true", help="repository 목록 캐시를 무시하고 다시 가져옴")
+
+    query_parser = commands.add_parser("query", help="조건에 맞는 PR 목록")
+    query_parser.add_argument("--owner")
+    query_parser.add_argument("--repo")
+    query_parser.add_argument("--author")
+    query_parser.add_argument("--state", default="open", help="open, closed, all")
+    query_parser.add_argument("--label")
+    query_parser.add_argument("--draft", action="store_true", help="draft PR만")
+    query_parser.add_argument("--older-than", type=int, help="만든 지 N일이 지난 PR만")
+    query_parser.add_argument("--stale-days", type=int, help="N일 동안 변경이 없는 PR만")
+    query_parser.add_argument("--limit", type=int)
+
+    count_parser = commands.add_parser("count", help="기준별 PR 수")
+    count_parser.add_argument("group_by", choices=sorted(GROUP_BY_COLUMNS))
+    count_parser.add_argument("--owner")
+    count_parser.add_argument("--state", default="open", help="open, closed, all")
+    count_parser.add_argument("--draft", action="store_true", help="draft PR만")
+
+    args = parser.parse_args()
+    index = PullRequestIndex(args.path)
+
+    if args.command == "refresh":
+        failures = {}
+        count = index.refresh(args.owner, args.repo_type, failures=failures, owner_type=args.owner_type,
+                              force_refresh=args.refresh_repos)
+        print(f"{count}개의 PR을 갱신했습니다. (실패한 repository {len(failures)}개)")
+    elif args.command == "query":
+        results = index.query_pull_requests(
+            owner=args.owner,
+            repo=args.repo,
+            author=args.author,
+            state=None if args.state == "all" else args.state,
+            label=args.label,
+            draft=True if args.draft else None,
+            created_before=days_ago(args.older_than) if args.older_than is not None else None,
+            updated_before=days_ago(args.stale_days) if args.stale_days is not None else None,
+            limit=args.limit
+        )
+        for repo_name, pr in results:
+            labels = f" [{', '.join(pr.labels)}]" if pr.labels else ""
+            draft = " (draft)" if pr.draft else ""
+            print(f"{repo_name}#{pr.number} {pr.title}{draft}{labels} - {pr.author}, 업데이트 {pr.updated_at}")
+        print(f"총 {len(results)}개")
+    else:
+        for key, count in index.count_pull_requests(args.group_by, owner=args.owner,
+                                                    state=None if args.state == "all" else args.state,
+                                                    draft=True if args.draft else None):
+            print(f"{key}\t{count}")
+
+    index.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 실행이 끝나면 metric 요약(JSON)을 저장할 경로 (비우면 저장하지 않음)
+PR_METRICS_PATH = os.getenv(
+    "PR_METRICS_PATH", os.path.join(os.getenv("PR_NOTIFY_STATE_DIR", ".pr_notify_state"), "metrics.json")
+)
+# Prometheus text format으로 저장할 경로 (node_exporter textfile collector 등, 비우면 저장하지 않음)
+PR_METRICS_PROMETHEUS_PATH = os.getenv("PR_METRICS_PROMETHEUS_PATH", "")
+
+# latency histogram의 bucket 경계 (초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+# endpoint label을 만들 때 바꿀 경로 패턴 (owner / repository 이름 등이 label 수를 늘리지 않도록)
+ENDPOINT_PATTERNS = (
+    (re.compile(r"^/repos/[^/]+/[^/]+"), "/repos/{owner}/{repo}"),
+    (re.compile(r"^/users/[^/]+"), "/users/{user}"),
+    (re.compile(r"^/orgs/[^/]+"), "/orgs/{org}"),
+    (re.compile(r"/commits/[^/]+"), "/commits/{ref}"),
+    (re.compile(r"/\d+(?=/|$)"), "/{number}")
+)
+
+def endpoint_name(url):
+    """
+    요청 URL을 metric label로 쓸 endpoint 이름으로 바꿉니다.
+    (예: https://api.github.com/repos/o/r/pulls?page=2 → "/repos/{owner}/{repo}/pulls")
+    Slack webhook URL은 비밀 값이 들어 있으므로 경로를 남기지 않습니다.
+    """
+    parsed = urlparse(url)
+    if "/services/" in parsed.path:
+        return "slack_webhook"
+    path = parsed.path
+    for pattern, replacement in ENDPOINT_PATTERNS:
+        path = pattern.sub(replacement, path)
+    return path or "/"
+
+class MetricsRegistry:
+    """
+    counter / gauge / histogram을 모아 두는 저장소입니다.
+    여러 스레드에서 동시에 기록할 수 있고, 실행이 끝나면 JSON 요약이나 Prometheus text format으로 내보냅니다.
+
+    metric은 (이름, label) 조합마다 따로 기록됩니다.
+        metrics.inc("github_requests_total", endpoint="/user/repos", status=200)
+        metrics.observe("github_request_seconds", 0.12, endpoint="/user/repos")
+        with metrics.timer("render_seconds"):
+            ...
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            # { (이름, ((label, 값), ...)): 값 }
+            self.counters = {}
+            self.gauges = {}
+            # { (이름, labels): [bucket별 개수..., +Inf 개수, 합계, 최댓값] }
+            self.histograms = {}
+
+    def key(self, name, labels):
+        return (name, tuple(sorted((label, str(value)) for label, value in labels.items())))
+
+    def inc(self, name, value=1, **labels):
+        """
+        counter를 value만큼 올립니다.
+        """
+        key = self.key(name, labels)
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def set_gauge(self, name, value, **labels):
+        """
+        gauge 값을 설정합니다.
+        """
+        key = self.key(name, labels)
+        with self.lock:
+            self.gauges[key] = value
+
+    def observe(self, name, value, **labels):
+        """
+        histogram에 값 하나를 기록합니다.
+        """
+        key = self.key(name, labels)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = [0] * (len(self.buckets) + 1) + [0.0, 0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    histogram[i] += 1
+                    break
+            else:
+                histogram[len(self.buckets)] += 1
+            histogram[-2] += value
+            histogram[-1] = max(histogram[-1], value)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """
+        with 블록의 실행 시간을 histogram에 기록합니다.
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def snapshot(self):
+        """
+        다른 프로세스로 넘길 수 있는(pickle 가능한) 현재 값의 복사본을 만듭니다.
+        """
+        with self.lock:
+            return {
+                "counters": dict(self.counters),
+                "gauges": dict(self.gauges),
+                "histograms": {key: list(histogram) for key, histogram in self.histograms.items()}
+            }
+
+    def merge(self, snapshot):
+        """
+        다른 프로세스의 snapshot을 합칩니다. (counter / histogram은 더하고 gauge는 덮어씀)
+        """
+        with self.lock:
+            for key, value in snapshot["counters"].items():
+                self.counters[key] = self.counters.get(key, 0) + value
+            self.gauges.update(snapshot["gauges"])
+            for key, other in snapshot["histograms"].items():
+                histogram = self.histograms.get(key)
+                if histogram is None:
+                    self.histograms[key] = list(other)
+                    continue
+                for i in range(len(histogram) - 1):
+                    histogram[i] += other[i]
+                histogram[-1] = max(histogram[-1], other[-1])
+
+    def quantile(self, histogram, q):
+        """
+        bucket 개수로 분위수를 추정합니다. (해당 bucket의 상한값, 마지막 bucket이면 최댓값)
+        """
+        count = sum(histogram[:len(self.buckets) + 1])
+        if count == 0:
+            return 0.0
+        rank = q * count
+        cumulative = 0
+        for i, bound in enumerate(self.buckets):
+            cumulative += histogram[i]
+            if cumulative >= rank:
+                return min(bound, histogram[-1])
+        return histogram[-1]
+
+    def summary(self):
+        """
+        JSON으로 저장할 수 있는 요약을 만듭니다.
+
+        Returns:
+            dict: { "counters": {이름: [{"labels", "value"}]}, "gauges": {...},
+                    "histograms": {이름: [{"labels", "count", "sum", "max", "p50", "p90", "p99"}]} }
+        """
+        snapshot = self.snapshot()
+        result = {"counters": {}, "gauges": {}, "histograms": {}}
+        for kind in ("counters", "gauges"):
+            for (name, labels), value in sorted(snapshot[kind].items()):
+                result[kind].setdefault(name, []).append({"labels": dict(labels), "value": value})
+        for (name, labels), histogram in sorted(snapshot["histograms"].items()):
+            result["histograms"].setdefault(name, []).append({
+                "labels": dict(labels),
+                "count": sum(histogram[:len(self.buckets) + 1]),
+                "sum": round(histogram[-2], 6),
+                "max": round(histogram[-1], 6),
+                "p50": self.quantile(histogram, 0.5),
+                "p90": self.quantile(histogram, 0.9),
+                "p99": self.quantile(histogram, 0.99)
+            })
+        return result
+
+    def to_prometheus(self):
+        """
+        Prometheus text exposition format으로 내보냅니다.
+        """
+        snapshot = self.snapshot()
+        lines = []
+        for kind, metric_type in (("counters", "counter"), ("gauges", "gauge")):
+            last_name = None
+            for (name, labels), value in sorted(snapshot[kind].items()):
+                if name != last_name:
+                    lines.append(f"# TYPE {name} {metric_type}")
+                    last_name = name
+                lines.append(f"{name}{format_labels(labels)} {value}")
+
+        last_name = None
+        for (name, labels), histogram in sorted(snapshot["histograms"].items()):
+            if name != last_name:
+                lines.append(f"# TYPE {name} histogram")
+                last_name = name
+            cumulative = 0
+            for i, bound in enumerate(self.buckets):
+                cumulative += histogram[i]
+                lines.append(f"{name}_bucket{format_labels(labels + (('le', str(bound)),))} {cumulative}")
+            cumulative += histogram[len(self.buckets)]
+            lines.append(f"{name}_bucket{format_labels(labels + (('le', '+Inf'),))} {cumulative}")
+            lines.append(f"{name}_sum{format_labels(labels)} {histogram[-2]}")
+            lines.append(f"{name}_count{format_labels(labels)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, json_path=PR_METRICS_PATH, prometheus_path=PR_METRICS_PROMETHEUS_PATH):
+        """
+        JSON 요약과 Prometheus text를 파일에 저장합니다. (경로가 비어 있으면 건너뜀)
+        """
+        for path, content in ((json_path, lambda: json.dumps(self.summary(), indent=2, ensure_ascii=False)),
+                              (prometheus_path, self.to_prometheus)):
+            if not path:
+                continue
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(content())
+            os.replace(temp_path, path)
+
+def escape_label_value(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{label}="{escape_label_value(value)}"' for label, value in labels) + "}"
+
+metrics_registry = MetricsRegistry()
+
+def get_metrics():
+    """
+    프로세스에서 공유하는 metric 저장소를 가져옵니다.
+    """
+    return metrics_registry
@@ -0,0 +1,289 @@
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from dotenv import load_dotenv
+
+from github_api_notify import (
+    DIGEST_CHANNEL, DIGEST_TITLE, GITHUB_MAX_WORKERS, PR_NOTIFY_ENRICH, SLACK_TRANSPORT,
+    fetch_pull_requests, format_pull_request, format_skipped_repositories, iter_repositories, publish_digest,
+    render_repository_msgs, send_slack_message
+)
+from pr_enrichment import PullRequestEnricher
+from pr_metrics import get_metrics
+from pr_records import PullRequestRecord, RepositoryRecord, repository_full_name
+from slack_message_builder import SlackMessageBuilder, SLACK_MAX_MESSAGE_CHARS, PR_BODY_MAX_CHARS
+from slack_web_api import get_slack_digest_publisher
+
+load_dotenv()
+
+# 단계 사이 queue에 쌓아 둘 수 있는 항목 수 (repository 또는 메시지 단위)
+# 뒤 단계가 밀리면 앞 단계가 기다리므로 메모리에 있는 repository 수는 이 값과 GITHUB_MAX_WORKERS로 제한됨
+PR_PIPELINE_QUEUE_SIZE = int(os.getenv("PR_PIPELINE_QUEUE_SIZE", "8"))
+
+# 단계가 끝났음을 다음 단계에 알리는 값
+DONE = object()
+
+class PipelineStopped(Exception):
+    """
+    다른 단계가 실패해서 pipeline을 멈췄습니다.
+    """
+
+class DigestPipeline:
+    """
+    PR 목록을 가져오는 대로 렌더링해서 보내는 digest pipeline입니다.
+
+        fetch → project → render → send
+
+    - fetch: owner마다 repository 목록을 페이지 단위로 받으면서 PR 조회를 max_workers개까지 동시에 실행하고,
+      repository 목록 순서대로 결과를 넘깁니다.
+    - project: API 응답을 RepositoryRecord / PullRequestRecord로 바꾸고 원본은 버립니다.
+      (PR_NOTIFY_ENRICH면 repository 단위로 merge 가능 여부 / 리뷰 / CI 상태를 채움)
+    - render: SlackMessageBuilder로 repository를 하나씩 추가하고 완성된 메시지를 바로 넘깁니다.
+      (SLACK_TRANSPORT=web_api면 repository마다 따로 렌더링해서 (key, 메시지)로 넘김)
+    - send: 메시지를 순서대로 DIGEST_CHANNEL로 보냅니다. (web_api면 모두 모아서 SlackDigestPublisher로 반영)
+
+    단계 사이는 크기가 queue_size인 queue로 이어져 있어 뒤 단계가 느리면 앞 단계가 기다립니다.
+    그래서 첫 메시지는 나머지 repository를 가져오는 동안 나가고, 메모리에는 전체 PR이 아니라
+    queue에 들어 있는 만큼만 남습니다. 한 단계에서 예외가 나면 모든 단계를 멈추고 run에서 다시 raise 합니다.
+    """
+
+    def __init__(self, owners, state="open", repo_type="private", max_workers=GITHUB_MAX_WORKERS,
+                 queue_size=PR_PIPELINE_QUEUE_SIZE, max_chars=SLACK_MAX_MESSAGE_CHARS, body_limit=PR_BODY_MAX_CHARS,
+                 enrich=PR_NOTIFY_ENRICH, force_refresh=False):
+        """
+        Args:
+            owners (list): parse_owners 결과 [(owner, owner_type), ...]
+            state (str): PR 상태 ("open"(default), "closed", "all")
+            repo_type (str): repository 타입 ("all", "private"(default), "public")
+            max_workers (int): 동시에 PR을 조회할 repository 수
+            queue_size (int): 단계 사이 queue의 크기
+            max_chars (int): 메시지 1개의 최대 글자 수
+            body_limit (int): PR 본문 최대 글자 수 (0이나 None이면 자르지 않음)
+            enrich (bool): True면 PR 상세 정보(merge 가능 여부, 리뷰, CI 상태)를 채움
+            force_refresh (bool): True면 repository 목록 캐시를 무시하고 목록을 다시 가져옴
+        """
+        self.owners = owners
+        self.state = state
+        self.repo_type = repo_type
+        self.force_refresh = force_refresh
+        self.max_workers = max(1, max_workers)
+        self.max_chars = max_chars
+        self.body_limit = body_limit
+        self.enricher = PullRequestEnricher() if enrich else None
+        # Web API 방식은 기존 메시지와 비교해야 하므로 모두 렌더링한 뒤 한 번에 반영
+        self.publisher = get_slack_digest_publisher() if SLACK_TRANSPORT == "web_api" else None
+        self.fetched = queue.Queue(queue_size)
+        self.projected = queue.Queue(queue_size)
+        self.messages = queue.Queue(queue_size)
+        self.stopped = threading.Event()
+        self.error = None
+        # fetch_owner_pull_requests 결과와 같은 모양 (format_skipped_repositories에서 사용)
+        self.results = [{"owner": owner, "failures": {}} for owner, _ in owners]
+        self.pull_request_count = 0
+
+    def put(self, target, item):
+        """
+        queue가 차 있으면 자리가 날 때까지 기다립니다. (기다리는 동안 pipeline이 멈추면 PipelineStopped)
+        """
+        while True:
+            if self.stopped.is_set():
+                raise PipelineStopped()
+            try:
+                target.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def get(self, source):
+        while True:
+            if self.stopped.is_set():
+                raise PipelineStopped()
+            try:
+                return source.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+    def stage(self, name, target, output):
+        """
+        단계 하나를 실행합니다. 예외가 나면 기록하고 모든 단계를 멈추며, 끝나면 다음 단계에 DONE을 넘깁니다.
+        """
+        try:
+            with get_metrics().timer("pipeline_stage_seconds", stage=name):
+                target()
+            self.put(output, DONE)
+        except PipelineStopped:
+            pass
+        except Exception as e:
+            self.error = self.error or e
+            self.stopped.set()
+
+    def fetch(self):
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for (owner, owner_type), result in zip(self.owners, self.results):
+                print(f"'{owner}'의 {self.repo_type} repository들을 검색 중...")
+                # repository 목록 순서대로 넘기도록 제출한 순서대로 결과를 꺼냄
+                in_flight = deque()
+                try:
+                    for repo in iter_repositories(owner, self.repo_type, self.force_refresh, owner_type):
+                        repo_owner = repository_full_name(owner, repo).split("/")[0]
+                        future = executor.submit(fetch_pull_requests, repo_owner, repo["name"], self.state)
+                        in_flight.append((owner, repo, future))
+                        if len(in_flight) >= self.max_workers:
+                            self.put(self.fetched, self.collect(*in_flight.popleft()))
+                except requests.exceptions.RequestException as e:
+                    print(f"Repository list fetching failed: {e}")
+                    result["failures"]["*"] = str(e)
+                except PipelineStopped:
+                    for _, _, future in in_flight:
+                        future.cancel()
+                    raise
+                while in_flight:
+                    self.put(self.fetched, self.collect(*in_flight.popleft()))
+
+    def collect(self, owner, repo, future):
+        try:
+            return owner, repo, future.result(), None
+        except (requests.exceptions.RequestException, json.JSONDecodeError) as e:
+            return owner, repo, None, str(e)
+
+    def project(self):
+        metrics = get_metrics()
+        failures = {result["owner"]: result["failures"] for result in self.results}
+        while (item := self.get(self.fetched)) is not DONE:
+            owner, repo, pull_requests, error = item
+            repo_name = repo["name"]
+            if error is not None:
+                metrics.inc("repository_fetch_failures_total", owner=owner)
+                failures[owner][repo_name] = error
+                print(f"  - {repo_name} → PR 조회 실패: {error}")
+                continue
+            metrics.inc("repositories_fetched_total", owner=owner)
+            metrics.inc("pull_requests_fetched_total", len(pull_requests), owner=owner)
+            if not pull_requests:
+                print(f"  - {repo_name} → PR 없음")
+                continue
+            print(f"  - {repo_name} → {len(pull_requests)}개의 PR 발견")
+
+            data = {
+                "repository": RepositoryRecord.from_api(repo),
+                "pull_requests": [PullRequestRecord.from_api(pr) for pr in pull_requests]
+            }
+            if self.enricher is not None:
+                self.enricher.enrich(owner, {repo_name: data})
+            self.pull_request_count += len(data["pull_requests"])
+            # owner가 여럿이면 merge_owner_pull_requests처럼 "owner/레포이름"으로 표시
+            name = f"{owner}/{repo_name}" if len(self.owners) > 1 else repo_name
+            self.put(self.projected, (name, data))
+        if self.enricher is not None:
+            self.enricher.save()
+
+    def render(self):
+        if self.publisher is not None:
+            self.render_keyed()
+            return
+        metrics = get_metrics()
+        builder = SlackMessageBuilder(title=DIGEST_TITLE, max_chars=self.max_chars, body_limit=self.body_limit)
+        rendered = 0
+        while (item := self.get(self.projected)) is not DONE:
+            repo_name, data = item
+            formatted_prs = [format_pull_request(pr) for pr in data["pull_requests"]]
+            for message in builder.add_repository(repo_name, data["repository"], formatted_prs):
+                self.put(self.messages, message)
+                rendered += 1
+        for message in builder.finish():
+            self.put(self.messages, message)
+            rendered += 1
+        if not rendered:
+            print("어떤 repository에서도 pull request를 찾을 수 없습니다.")
+        # project 단계가 끝난 뒤이므로 조회 실패 목록이 모두 모였음
+        skipped_msg = format_skipped_repositories(self.results)
+        if skipped_msg:
+            print(skipped_msg)
+            self.put(self.messages, skipped_msg)
+            rendered += 1
+        metrics.inc("slack_messages_rendered_total", rendered)
+
+    def render_keyed(self):
+        """
+        send_digest의 Web API 방식과 같은 (key, 메시지)로 렌더링합니다. (제목 / repository마다 / 빠진 repository)
+        """
+        metrics = get_metrics()
+        rendered = 0
+        while (item := self.get(self.projected)) is not DONE:
+            repo_name, data = item
+            if not rendered:
+                self.put(self.messages, ("title", DIGEST_TITLE))
+                rendered += 1
+            for key, message in render_repository_msgs(repo_name, data, self.max_chars, self.body_limit):
+                self.put(self.messages, (key, message))
+                rendered += 1
+        if not rendered:
+            print("어떤 repository에서도 pull request를 찾을 수 없습니다.")
+        skipped_msg = format_skipped_repositories(self.results)
+        if skipped_msg:
+            print(skipped_msg)
+            self.put(self.messages, ("skipped", skipped_msg))
+            rendered += 1
+        metrics.inc("slack_messages_rendered_total", rendered)
+
+    def run(self):
+        """
+        pipeline을 실행하고 마지막 메시지를 보낼 때까지 기다립니다.
+
+        Returns:
+            bool: 모든 메시지를 보냈으면 True
+
+        Raises:
+            Exception: 단계 중 하나에서 난 예외
+        """
+        metrics = get_metrics()
+        started = time.perf_counter()
+        threads = [
+            threading.Thread(target=self.stage, args=("fetch", self.fetch, self.fetched), daemon=True),
+            threading.Thread(target=self.stage, args=("project", self.project, self.projected), daemon=True),
+            threading.Thread(target=self.stage, args=("render", self.render, self.messages), daemon=True)
+        ]
+        for thread in threads:
+            thread.start()
+
+        publisher = self.publisher
+        sent = True
+        message_count = 0
+        collected = []
+        try:
+            while (message := self.get(self.messages)) is not DONE:
+                message_count += 1
+                if publisher is not None:
+                    collected.append(message)
+                    continue
+                if message_count == 1:
+                    metrics.observe("pipeline_first_message_seconds", time.perf_counter() - started)
+                # 중복 확인은 main에서 digest 단위로 했으므로 메시지마다 다시 확인하지 않음
+                sent = send_slack_message(message, DIGEST_CHANNEL, dedup=False) and sent
+        except PipelineStopped:
+            pass
+        finally:
+            self.stopped.set()
+            for thread in threads:
+                thread.join()
+        if self.error is not None:
+            raise self.error
+        if publisher is not None:
+            sent = publish_digest(publisher, collected, self.results)
+        print(f"pipeline: PR {self.pull_request_count}개 / 메시지 {message_count}개 / "
+              f"{time.perf_counter() - started:.2f}초")
+        return sent
+
+def run_digest_pipeline(owners, state="open", repo_type="private", force_refresh=False):
+    """
+    owner들의 PR을 DigestPipeline으로 가져오면서 digest를 보냅니다.
+
+    Returns:
+        bool: 모든 메시지를 보냈으면 True
+    """
+    return DigestPipeline(owners, state, repo_type, force_refresh=force_refresh).run()
@@ -0,0 +1,118 @@
+from dataclasses import dataclass
+
+@dataclass(slots=True)
+class PullRequestRecord:
+    """
+    알림에 필요한 필드만 남긴 pull request 정보입니다.
+    GitHub API 응답(dict)에서 바로 만들고 원본은 버려서 PR마다 수십 개의 중첩 필드
+    (user, head/base repository 등)를 메모리에 들고 있지 않습니다.
+
+    format_pull_request의 결과(dict)와 같은 key로 pr["title"], pr.get("labels")처럼 읽을 수 있습니다.
+    """
+    number: int
+    title: str
+    body: str
+    state: str
+    author: str
+    created_at: str
+    updated_at: str
+    url: str
+    draft: bool
+    mergeable: object
+    labels: tuple
+    head_sha: str
+    requested_reviewers: tuple = ()
+    # PullRequestEnricher가 채우는 값 (목록 API에는 없음)
+    review_state: str = None
+    ci_state: str = None
+
+    @classmethod
+    def from_api(cls, pr):
+        """
+        GitHub API의 pull request dict에서 필요한 필드만 골라 만듭니다.
+        """
+        return cls(
+            number=pr["number"],
+            title=pr["title"],
+            body=pr["body"],
+            state=pr["state"],
+            author=pr["user"]["login"],
+            created_at=pr["created_at"],
+            updated_at=pr["updated_at"],
+            url=pr["html_url"],
+            draft=pr.get("draft", False),
+            mergeable=pr.get("mergeable"),
+            labels=tuple(label["name"] for label in pr["labels"]),
+            head_sha=pr.get("head", {}).get("sha"),
+            requested_reviewers=tuple(reviewer["login"] for reviewer in pr.get("requested_reviewers") or ())
+        )
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+@dataclass(slots=True)
+class RepositoryRecord:
+    """
+    알림에 필요한 필드만 남긴 repository 정보입니다.
+    repository["html_url"], repository.get("description")처럼 API 응답(dict)과 같은 key로 읽을 수 있습니다.
+    """
+    name: str
+    html_url: str
+    description: str
+    private: bool
+    # "소유자/이름" (협업자로 참여한 repository나 organization repository는 소유자가 조회한 owner와 다름)
+    full_name: str = None
+
+    @classmethod
+    def from_api(cls, repo):
+        """
+        GitHub API의 repository dict에서 필요한 필드만 골라 만듭니다.
+        """
+        return cls(
+            name=repo["name"],
+            html_url=repo["html_url"],
+            description=repo.get("description"),
+            private=repo.get("private", False),
+            full_name=repo.get("full_name")
+        )
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+def repository_full_name(owner, repository):
+    """
+    repository의 "소유자/이름"을 돌려줍니다. PR API URL은 조회한 owner가 아니라 이 값으로 만들어야 합니다.
+    (/user/repos는 협업자로 참여한 다른 사용자 / organization의 repository도 돌려줌)
+
+    Args:
+        owner (str): repository 목록을 조회한 owner
+        repository (dict): repository 정보 (API 응답 dict 또는 RepositoryRecord)
+
+    Returns:
+        str: "소유자/이름" (full_name을 기록하지 않은 repository는 "owner/이름")
+    """
+    return repository.get("full_name") or f"{owner}/{repository['name']}"
+
+def compact_pull_requests(all_pull_requests):
+    """
+    get_all_pull_requests 결과의 repository와 PR을 모두 record로 바꿉니다.
+
+    Args:
+        all_pull_requests (dict): { 레포이름 : { "repository": dict, "pull_requests": [dict, ...] } , ...}
+
+    Returns:
+        dict: 같은 구조이지만 RepositoryRecord / PullRequestRecord를 담은 dict
+    """
+    return {
+        repo_name: {
+            "repository": RepositoryRecord.from_api(data["repository"]),
+            "pull_requests": [PullRequestRecord.from_api(pr) for pr in data["pull_requests"]]
+        }
+        for repo_name, data in all_pull_requests.items()
+    }
@@ -0,0 +1,233 @@
+import json
+import os
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from dotenv import load_dotenv
+
+from github_api_client import github_get
+from pr_records import repository_full_name
+from pr_watermarks import PR_NOTIFY_STATE_DIR
+
+load_dotenv()
+
+GITHUB_API_BASE = os.getenv("GITHUB_API_BASE", "https://api.github.com")
+
+# 지난 digest에 포함된 open PR 목록을 저장할 파일
+PR_SNAPSHOT_PATH = os.path.join(PR_NOTIFY_STATE_DIR, "snapshot.json")
+# 사라진 PR의 merge 여부를 동시에 확인할 요청 수
+SNAPSHOT_RESOLVE_WORKERS = 8
+
+def pull_request_key(owner, repo, number):
+    return f"{owner}/{repo}#{number}"
+
+class PullRequestSnapshot:
+    """
+    지난 digest를 보낼 때의 open PR 목록입니다.
+    이번 실행의 PR 목록과 "owner/repo#번호" key로 비교해 새로 열린 / 변경된 / 그대로인 / 사라진 PR을 나눕니다.
+
+    저장하는 값은 PR마다 owner, repo, number, title, url, updated_at뿐이고,
+    save를 호출해야 파일에 기록됩니다. (digest 전송이 끝난 뒤 save 해야 실패 시 변경분을 놓치지 않음)
+    """
+
+    def __init__(self, path=PR_SNAPSHOT_PATH):
+        self.path = path
+        try:
+            with open(path, encoding="utf-8") as f:
+                self.entries = json.load(f)
+        except FileNotFoundError:
+            self.entries = {}
+
+    def diff(self, results):
+        """
+        owner별 조회 결과를 지난 snapshot과 비교합니다.
+
+        조회에 실패한 repository(failures)의 PR은 사라진 것으로 보지 않고 그대로 둡니다.
+
+        Args:
+            results (list): fetch_owner_pull_requests 결과 목록 ({ "owner", "pull_requests", "failures", ... })
+
+        Returns:
+            dict: {
+                "changed_results": 새로 열렸거나 변경된 PR만 남긴 results (렌더링용),
+                "new": [entry, ...], "updated": [entry, ...], "unchanged": int,
+                "gone": [entry, ...] (이번 목록에 없는 PR, resolve_gone_pull_requests로 merge 여부 확인),
+                "current": { key: entry } (이번 실행 후 저장할 snapshot)
+            }
+        """
+        changes = {"changed_results": [], "new": [], "updated": [], "unchanged": 0, "gone": [], "current": {}}
+        current = changes["current"]
+        fetched_owners = set()
+
+        for result in results:
+            owner = result["owner"]
+            fetched_owners.add(owner)
+            changed = {}
+            for repo_name, data in result["pull_requests"].items():
+                changed_prs = []
+                for pr in data["pull_requests"]:
+                    key = pull_request_key(owner, repo_name, pr["number"])
+                    entry = {
+                        "owner": owner,
+                        "repo": repo_name,
+                        # merge / close 여부를 확인할 때 PR API URL에 씀 (owner와 소유자가 다를 수 있음)
+                        "full_name": repository_full_name(owner, data["repository"]),
+                        "number": pr["number"],
+                        "title": pr["title"],
+                        # API 응답 dict는 html_url, PullRequestRecord는 url
+                        "url": pr.get("html_url") or pr["url"],
+                        "updated_at": pr["updated_at"]
+                    }
+                    current[key] = entry
+
+                    previous = self.entries.get(key)
+                    if previous is None:
+                        changes["new"].append(entry)
+                        changed_prs.append(pr)
+                    elif previous["updated_at"] != entry["updated_at"]:
+                        changes["updated"].append(entry)
+                        changed_prs.append(pr)
+                    else:
+                        changes["unchanged"] += 1
+                if changed_prs:
+                    changed[repo_name] = {"repository": data["repository"], "pull_requests": changed_prs}
+            changes["changed_results"].append({**result, "pull_requests": changed})
+
+        failed = {
+            (result["owner"], repo_name)
+            for result in results
+            for repo_name in result["failures"]
+        }
+        failed_owners = {result["owner"] for result in results if "*" in result["failures"]}
+        for key, entry in self.entries.items():
+            if key in current:
+                continue
+            owner = entry["owner"]
+            if owner not in fetched_owners:
+                # 이번 실행의 대상이 아닌 owner는 비교하지 않음
+                continue
+            if owner in failed_owners or (owner, entry["repo"]) in failed:
+                current[key] = entry
+                changes["unchanged"] += 1
+            else:
+                changes["gone"].append(entry)
+        return changes
+
+    def save(self, entries):
+        """
+        snapshot을 파일에 기록합니다.
+
+        Args:
+            entries (dict): diff 결과의 "current"
+        """
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(entries, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(temp_path, self.path)
+        self.entries = entries
+
+def fetch_pull_request_state(entry):
+    """
+    사라진 PR 하나의 현재 상태를 가져옵니다.
+
+    Returns:
+        str: "merged", "closed", "open" (repository가 없어졌으면 "closed")
+    """
+    # full_name이 없는 이전 snapshot의 PR은 owner/repo로 조회
+    full_name = entry.get("full_name") or f"{entry['owner']}/{entry['repo']}"
+    url = f"{GITHUB_API_BASE}/repos/{full_name}/pulls/{entry['number']}"
+    try:
+        pr = github_get(url).json()
+    except requests.exceptions.HTTPError as e:
+        if e.response is not None and e.response.status_code in (404, 410):
+            return "closed"
+        raise
+    if pr.get("merged") or pr.get("merged_at"):
+        return "merged"
+    return pr["state"]
+
+def resolve_gone_pull_requests(changes, max_workers=SNAPSHOT_RESOLVE_WORKERS):
+    """
+    diff에서 사라진 PR만 GitHub에 다시 물어 merge / close 여부를 확인합니다.
+    아직 open이거나 확인에 실패한 PR은 snapshot에 남겨 다음 실행에서 다시 비교합니다.
+
+    Args:
+        changes (dict): PullRequestSnapshot.diff의 결과 ("merged", "closed" 목록이 추가됨)
+        max_workers (int): 동시 요청 수
+
+    Returns:
+        dict: changes
+    """
+    changes["merged"] = []
+    changes["closed"] = []
+    gone = changes["gone"]
+    if not gone:
+        return changes
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(gone)))) as executor:
+        futures = [(entry, executor.submit(fetch_pull_request_state, entry)) for entry in gone]
+        for entry, future in futures:
+            try:
+                state = future.result()
+            except (requests.exceptions.RequestException, ValueError) as e:
+                print(f"  - {entry['repo']}#{entry['number']} 상태 확인 실패: {e}")
+                state = "open"
+
+            if state == "merged":
+                changes["merged"].append(entry)
+            elif state == "closed":
+                changes["closed"].append(entry)
+            else:
+                key = pull_request_key(entry["owner"], entry["repo"], entry["number"])
+                changes["current"][key] = entry
+                changes["unchanged"] += 1
+    return changes
+
+def format_closed_pull_requests(changes):
+    """
+    지난 digest 이후 merge / close 된 PR을 한 줄씩 정리합니다.
+
+    Returns:
+        str: Slack 메시지 (merge / close 된 PR이 없으면 None)
+    """
+    if not changes["merged"] and not changes["closed"]:
+        return None
+    lines = ["*지난 알림 이후 닫힌 PR:*"]
+    for status, emoji in (("merged", "✅"), ("closed", "❌")):
+        for entry in changes[status]:
+            lines.append(f"{emoji} {entry['owner']}/{entry['repo']}#{entry['number']} {entry['title']} ({entry['url']})")
+    return "\n".join(lines)
+
+def count_closed_by_repository(changes, qualify_owner=False):
+    """
+    merge / close 된 PR 수를 repository별로 셉니다. (일일 요약의 repository별 통계용)
+
+    Args:
+        changes (dict): resolve_gone_pull_requests 결과
+        qualify_owner (bool): True면 merge_owner_pull_requests처럼 "owner/레포이름"으로 셈 (owner가 여럿일 때)
+
+    Returns:
+        dict: { "merged": Counter({레포이름: PR 수}), "closed": Counter(...) }
+    """
+    return {
+        status: Counter(
+            f"{entry['owner']}/{entry['repo']}" if qualify_owner else entry["repo"] for entry in changes[status]
+        )
+        for status in ("merged", "closed")
+    }
+
+def make_summary_data(changes):
+    """
+    send_daily_summary에 넘길 요약 값을 만듭니다.
+    """
+    return {
+        "total_prs": len(changes["current"]),
+        "new_prs": len(changes["new"]),
+        "updated_prs": len(changes["updated"]),
+        "merged_prs": len(changes["merged"]),
+        "closed_prs": len(changes["closed"])
+    }
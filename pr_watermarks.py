@@ -0,0 +1,77 @@
+import json
+import os
+import threading
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 실행 사이에 유지할 상태 파일 위치
+PR_NOTIFY_STATE_DIR = os.getenv("PR_NOTIFY_STATE_DIR", ".pr_notify_state")
+PR_WATERMARKS_PATH = os.path.join(PR_NOTIFY_STATE_DIR, "watermarks.json")
+
+class HighWaterMarks:
+    """
+    repository별로 마지막으로 본 pull request의 updated_at(high-water mark)을 저장합니다.
+    PR 목록은 updated 내림차순으로 오므로 이 값보다 오래된 PR이 나오면
+    그 뒤 페이지는 더 볼 필요가 없습니다.
+
+    여러 스레드에서 동시에 advance를 호출할 수 있으며, save를 호출해야 파일에 기록됩니다.
+    (알림 전송이 끝난 뒤 save 해야 전송 실패 시 변경된 PR을 놓치지 않음)
+    """
+
+    def __init__(self, path=PR_WATERMARKS_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        try:
+            with open(path, encoding="utf-8") as f:
+                self.marks = json.load(f)
+        except FileNotFoundError:
+            self.marks = {}
+
+    def key(self, owner, repo, state):
+        return f"{owner}/{repo}:{state}"
+
+    def get(self, owner, repo, state="open"):
+        """
+        마지막으로 본 updated_at을 가져옵니다.
+
+        Returns:
+            str: ISO 8601 시각 (예: "2024-01-01T00:00:00Z"), 처음 보는 repository면 None
+        """
+        with self.lock:
+            return self.marks.get(self.key(owner, repo, state))
+
+    def advance(self, owner, repo, state, updated_at):
+        """
+        updated_at이 저장된 값보다 최신이면 high-water mark를 올립니다.
+        """
+        key = self.key(owner, repo, state)
+        with self.lock:
+            # GitHub의 ISO 8601 UTC 시각은 문자열 비교로 순서를 비교할 수 있음
+            if updated_at > self.marks.get(key, ""):
+                self.marks[key] = updated_at
+
+    def merge(self, marks):
+        """
+        다른 프로세스에서 올린 high-water mark를 합칩니다. (key마다 더 최신 값을 사용)
+
+        Args:
+            marks (dict): 다른 HighWaterMarks의 marks
+        """
+        with self.lock:
+            for key, updated_at in marks.items():
+                if updated_at > self.marks.get(key, ""):
+                    self.marks[key] = updated_at
+
+    def save(self):
+        """
+        high-water mark를 파일에 기록합니다.
+        """
+        with self.lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(self.marks, f, indent=2, sort_keys=True)
+            os.replace(temp_path, self.path)
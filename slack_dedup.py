@@ -0,0 +1,173 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dotenv import load_dotenv
+
+try:
+    import fcntl
+except ImportError:
+    # Windows 등 fcntl이 없으면 lock 파일을 만들어 잠금
+    fcntl = None
+
+load_dotenv()
+
+# 보낸 메시지의 hash를 기록할 파일 (SLACK_DEDUP_PATH를 비우면 중복 확인 안 함)
+SLACK_DEDUP_PATH = os.getenv(
+    "SLACK_DEDUP_PATH", os.path.join(os.getenv("PR_NOTIFY_STATE_DIR", ".pr_notify_state"), "sent_messages.json")
+)
+# 같은 채널로 같은 내용을 이 시간(초) 안에 다시 보내지 않음 (0이면 중복 확인 안 함)
+# workflow cron('* 1 * * *')이 01시 동안 매분 실행되므로 하루 중 한 번만 보내도록 넉넉히 잡음
+SLACK_DEDUP_WINDOW = float(os.getenv("SLACK_DEDUP_WINDOW", str(12 * 3600)))
+# 전송 중(pending)으로 기록한 뒤 이 시간(초)이 지나도 결과가 없으면 중단된 실행으로 보고 다시 보냄
+SLACK_DEDUP_PENDING_TIMEOUT = float(os.getenv("SLACK_DEDUP_PENDING_TIMEOUT", "600"))
+# fcntl이 없을 때 lock 파일이 이 시간(초)보다 오래되면 중단된 프로세스가 남긴 것으로 보고 지움
+LOCK_STALE_SECONDS = 60
+
+@contextmanager
+def file_lock(path):
+    """
+    여러 프로세스가 같은 파일을 읽고 고치는 동안 다른 프로세스를 기다리게 합니다.
+    fcntl이 있으면 flock을, 없으면 O_EXCL로 만든 lock 파일을 씁니다.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    lock_path = f"{path}.lock"
+
+    if fcntl is not None:
+        with open(lock_path, "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+        return
+
+    while True:
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(lock_path) > LOCK_STALE_SECONDS:
+                    os.remove(lock_path)
+                    continue
+            except FileNotFoundError:
+                continue
+            time.sleep(0.05)
+    try:
+        yield
+    finally:
+        os.close(fd)
+        os.remove(lock_path)
+
+def message_key(channel, payload):
+    """
+    채널과 메시지 내용으로 중복 확인용 hash를 만듭니다.
+    attachment의 ts(보낸 시각)는 내용이 아니므로 제외합니다.
+    """
+    content = dict(payload)
+    content.pop("channel", None)
+    if "attachments" in content:
+        content["attachments"] = [
+            {name: value for name, value in attachment.items() if name != "ts"}
+            for attachment in content["attachments"]
+        ]
+    data = json.dumps([channel, content], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+class SentMessageStore:
+    """
+    채널별로 보낸 메시지 내용의 hash를 파일에 기록해 같은 내용을 window 안에 다시 보내지 않게 합니다.
+
+    - claim으로 보내기 전에 pending으로 기록하고, complete로 결과를 기록합니다.
+      (겹쳐서 실행된 다른 프로세스도 pending을 보고 건너뛰므로 같은 메시지를 동시에 보내지 않음)
+    - 전송에 실패하면 기록을 지워 다음 실행에서 다시 보냅니다.
+    - 파일을 읽고 고치는 동안 file_lock으로 다른 프로세스를 기다리게 합니다.
+    """
+
+    def __init__(self, path, window=SLACK_DEDUP_WINDOW, pending_timeout=SLACK_DEDUP_PENDING_TIMEOUT):
+        self.path = path
+        self.window = window
+        self.pending_timeout = pending_timeout
+        self.lock = threading.Lock()
+
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def save(self, entries):
+        # window가 지난 기록은 지움
+        now = time.time()
+        entries = {key: entry for key, entry in entries.items() if now - entry["at"] < self.window}
+        temp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(entries, f, sort_keys=True)
+        os.replace(temp_path, self.path)
+
+    @contextmanager
+    def entries(self):
+        with self.lock, file_lock(self.path):
+            entries = self.load()
+            yield entries
+            self.save(entries)
+
+    def claim(self, channel, payload, window=None):
+        """
+        보내기 전에 호출합니다. 같은 내용을 window 안에 보냈거나 다른 실행이 보내는 중이면 None을 돌려줍니다.
+
+        Args:
+            channel (str): 채널명
+            payload (dict): 보낼 내용
+            window (float): 이 key에만 쓸 중복 확인 기간 (초, None이면 store의 window)
+
+        Returns:
+            str: complete에 넘길 key (보내지 않아야 하면 None)
+        """
+        if window is None:
+            window = self.window
+        key = message_key(channel, payload)
+        now = time.time()
+        with self.entries() as entries:
+            entry = entries.get(key)
+            if entry is not None:
+                if entry["status"] == "sent" and now - entry["at"] < window:
+                    return None
+                if entry["status"] == "pending" and now - entry["at"] < self.pending_timeout:
+                    return None
+            entries[key] = {"status": "pending", "at": now, "channel": channel}
+        return key
+
+    def complete(self, key, sent):
+        """
+        claim한 메시지의 전송 결과를 기록합니다. 실패했으면 기록을 지워 다시 보낼 수 있게 합니다.
+        """
+        with self.entries() as entries:
+            if sent:
+                entries[key] = {**entries.get(key, {}), "status": "sent", "at": time.time()}
+            else:
+                entries.pop(key, None)
+
+sent_message_store = None
+sent_message_store_lock = threading.Lock()
+
+def get_sent_message_store():
+    """
+    프로세스에서 공유하는 보낸 메시지 기록을 가져옵니다.
+
+    Returns:
+        SentMessageStore: 기록 (SLACK_DEDUP_PATH가 비었거나 SLACK_DEDUP_WINDOW가 0이면 None)
+    """
+    global sent_message_store
+    if not SLACK_DEDUP_PATH or SLACK_DEDUP_WINDOW <= 0:
+        return None
+    with sent_message_store_lock:
+        if sent_message_store is None:
+            sent_message_store = SentMessageStore(SLACK_DEDUP_PATH)
+    return sent_message_store
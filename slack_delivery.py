@@ -0,0 +1,275 @@
+import atexit
+import os
+import random
+import threading
+import time
+from collections import deque
+import requests
+from dotenv import load_dotenv
+
+from http_client import get_http_client
+from pr_metrics import get_metrics
+from slack_dedup import get_sent_message_store
+from slack_message_builder import SLACK_MAX_MESSAGE_CHARS
+
+load_dotenv()
+
+# webhook URL마다 전송 사이의 최소 간격 (초, Slack incoming webhook은 초당 1개 정도로 제한)
+SLACK_MIN_INTERVAL = float(os.getenv("SLACK_MIN_INTERVAL", "1"))
+# 429 / 5xx / 연결 오류의 최대 재시도 횟수
+SLACK_MAX_RETRIES = int(os.getenv("SLACK_MAX_RETRIES", "3"))
+# 같은 채널로 가는 메시지를 모을 시간 (초, wait=False로 보낸 메시지만 모음)
+SLACK_COALESCE_WINDOW = float(os.getenv("SLACK_COALESCE_WINDOW", "0.5"))
+# 메시지 1개로 합칠 최대 attachment 수
+SLACK_MAX_ATTACHMENTS = 20
+
+class Delivery:
+    """
+    전송 대기 중인 메시지 1개입니다. wait()로 전송 결과를 기다릴 수 있습니다.
+    """
+
+    def __init__(self, payload, coalesce, dedup_key=None):
+        self.payload = payload
+        self.coalesce = coalesce
+        # 보낸 메시지 기록(SentMessageStore)에 claim한 key
+        self.dedup_key = dedup_key
+        self.done = threading.Event()
+        self.result = None
+        # 큐에 넣은 시각 (큐 대기 시간을 포함한 전송 지연 측정용)
+        self.submitted_at = time.perf_counter()
+
+    def finish(self, result):
+        self.result = result
+        self.done.set()
+
+    def wait(self, timeout=None):
+        """
+        전송이 끝날 때까지 기다립니다.
+
+        Returns:
+            bool: 전송 성공 여부 (timeout이 지나면 None)
+        """
+        self.done.wait(timeout)
+        return self.result
+
+def coalesce_key(payload):
+    """
+    하나로 합칠 수 있는 payload끼리 같은 값을 돌려줍니다. (합칠 수 없으면 None)
+    text만 있는 메시지끼리, attachments만 있는 메시지끼리 같은 채널 / 봇 설정이면 합칩니다.
+    """
+    if "attachments" in payload and "text" not in payload:
+        kind = "attachments"
+    elif "text" in payload and "attachments" not in payload and "blocks" not in payload:
+        kind = "text"
+    else:
+        return None
+    return (kind, payload.get("channel"), payload.get("username"), payload.get("icon_emoji"))
+
+def merge_payloads(payloads):
+    """
+    coalesce_key가 같은 payload들을 하나로 합칩니다.
+    """
+    merged = dict(payloads[0])
+    if "attachments" in merged:
+        merged["attachments"] = [attachment for payload in payloads for attachment in payload["attachments"]]
+    else:
+        merged["text"] = "\n".join(payload["text"] for payload in payloads)
+    return merged
+
+class SlackDeliveryQueue:
+    """
+    Slack webhook 전송 큐입니다.
+
+    - webhook URL마다 작업 스레드 하나가 min_interval 간격으로 순서대로 보냅니다.
+    - 429 / 5xx / 연결 오류는 Retry-After 또는 jitter를 넣은 exponential backoff로 재시도합니다.
+    - wait=False로 넣은 메시지는 coalesce_window 동안 모아서, 같은 채널로 가는 연속된 메시지를
+      Slack 크기 제한 안에서 하나로 합쳐 보냅니다.
+    - 같은 채널로 같은 내용을 SLACK_DEDUP_WINDOW 안에 이미 보냈으면 보내지 않습니다. (slack_dedup)
+    - 프로세스가 끝날 때 남은 메시지를 모두 보냅니다. (atexit)
+    """
+
+    def __init__(self, min_interval=SLACK_MIN_INTERVAL, max_retries=SLACK_MAX_RETRIES,
+                 coalesce_window=SLACK_COALESCE_WINDOW, sleep=time.sleep):
+        self.min_interval = min_interval
+        self.max_retries = max_retries
+        self.coalesce_window = coalesce_window
+        self.sleep = sleep
+        self.condition = threading.Condition()
+        # { webhook URL: deque[Delivery] }
+        self.queues = {}
+        self.workers = {}
+        # 전송 중인 메시지 수 (flush에서 사용)
+        self.in_flight = 0
+
+    def submit(self, webhook_url, payload, wait=True, dedup=True, event_id=None):
+        """
+        메시지를 큐에 넣습니다.
+
+        Args:
+            webhook_url (str): Slack webhook URL
+            payload (dict): 보낼 payload
+            wait (bool): True면 전송 결과를 돌려주고, False면 큐에 넣고 바로 돌아옴 (다른 메시지와 합쳐질 수 있음)
+            dedup (bool): False면 보낸 메시지 기록을 확인하지 않고 보냄
+                (digest처럼 여러 메시지를 묶음 단위로 중복 확인하는 경우, 일부 메시지만 빠지지 않도록)
+            event_id (str): 메시지를 만든 이벤트의 식별 값 (예: PR의 updated_at)
+                내용과 함께 hash 하므로 같은 내용이어도 다른 이벤트(close → reopen → close)면 보냄
+
+        Returns:
+            bool: 전송 성공 여부 (wait=False면 큐에 넣었으므로 True, 이미 보낸 메시지면 보내지 않고 True)
+        """
+        dedup_key = None
+        sent_messages = get_sent_message_store() if dedup else None
+        if sent_messages is not None:
+            content = payload if event_id is None else {**payload, "event_id": event_id}
+            dedup_key = sent_messages.claim(payload.get("channel"), content)
+            if dedup_key is None:
+                get_metrics().inc("slack_duplicates_skipped_total")
+                print(f"같은 메시지를 이미 {payload.get('channel')}에 보냈으므로 건너뜁니다.")
+                return True
+
+        delivery = Delivery(payload, coalesce=not wait, dedup_key=dedup_key)
+        with self.condition:
+            self.queues.setdefault(webhook_url, deque()).append(delivery)
+            if webhook_url not in self.workers:
+                worker = threading.Thread(target=self.run_worker, args=(webhook_url,), daemon=True)
+                self.workers[webhook_url] = worker
+                worker.start()
+            self.condition.notify_all()
+
+        if not wait:
+            return True
+        return delivery.wait()
+
+    def next_batch(self, webhook_url):
+        """
+        다음에 보낼 메시지 묶음을 큐에서 꺼냅니다. 큐가 비어 있으면 올 때까지 기다립니다.
+        """
+        queue = self.queues[webhook_url]
+        with self.condition:
+            while not queue:
+                self.condition.wait()
+
+            head = queue[0]
+            key = coalesce_key(head.payload) if head.coalesce else None
+            if key is not None and self.coalesce_window > 0:
+                # 같이 보낼 메시지가 더 들어올 시간을 줌
+                self.condition.wait(self.coalesce_window)
+
+            batch = [queue.popleft()]
+            size = len(head.payload.get("text", ""))
+            count = len(head.payload.get("attachments", []))
+            while key is not None and queue and queue[0].coalesce and coalesce_key(queue[0].payload) == key:
+                payload = queue[0].payload
+                size += len(payload.get("text", "")) + 1
+                count += len(payload.get("attachments", []))
+                if size > SLACK_MAX_MESSAGE_CHARS or count > SLACK_MAX_ATTACHMENTS:
+                    break
+                batch.append(queue.popleft())
+            self.in_flight += len(batch)
+            return batch
+
+    def run_worker(self, webhook_url):
+        last_sent = 0
+        while True:
+            batch = self.next_batch(webhook_url)
+            result = False
+            try:
+                payload = merge_payloads([delivery.payload for delivery in batch])
+
+                wait_time = last_sent + self.min_interval - time.monotonic()
+                if wait_time > 0:
+                    self.sleep(wait_time)
+                result = self.post(webhook_url, payload)
+                last_sent = time.monotonic()
+            # 예외로 worker가 끝나면 이 webhook의 메시지를 기다리는 쪽과 flush가 영원히 멈추므로 실패로 처리하고 계속함
+            except Exception as e:
+                print(f"메시지 전송 실패: {e}")
+            finally:
+                self.finish_batch(batch, result)
+
+    def finish_batch(self, batch, result):
+        """
+        묶음의 메시지마다 전송 결과를 기록하고 끝냅니다.
+        기록에 실패해도 모든 메시지를 finish 하고 in_flight를 줄여 wait / flush가 멈추지 않게 합니다.
+        """
+        finished = time.perf_counter()
+        for delivery in batch:
+            try:
+                get_metrics().observe("slack_delivery_seconds", finished - delivery.submitted_at)
+                sent_messages = get_sent_message_store()
+                if delivery.dedup_key is not None and sent_messages is not None:
+                    sent_messages.complete(delivery.dedup_key, result)
+            except Exception as e:
+                print(f"전송 결과 기록 실패: {e}")
+            finally:
+                delivery.finish(result)
+        with self.condition:
+            self.in_flight -= len(batch)
+            self.condition.notify_all()
+
+    def post(self, webhook_url, payload):
+        """
+        payload를 보내고, 429 / 5xx / 연결 오류면 재시도합니다.
+
+        Returns:
+            bool: 전송 성공 여부
+        """
+        metrics = get_metrics()
+        for attempt in range(self.max_retries + 1):
+            delay = min(30, 2 ** attempt)
+            delay = delay / 2 + random.uniform(0, delay / 2)
+            if attempt:
+                metrics.inc("slack_retries_total")
+            started = time.perf_counter()
+            try:
+                response = get_http_client().post(webhook_url, json=payload)
+            except requests.exceptions.RequestException as e:
+                metrics.inc("slack_posts_total", status="error")
+                error = e
+            else:
+                metrics.observe("slack_post_seconds", time.perf_counter() - started)
+                metrics.inc("slack_posts_total", status=response.status_code)
+                metrics.inc("slack_request_bytes_total", len(response.request.body or b""))
+                if response.status_code == 429 or response.status_code >= 500:
+                    error = f"{response.status_code} {response.reason}"
+                    if "Retry-After" in response.headers:
+                        delay = float(response.headers["Retry-After"])
+                else:
+                    try:
+                        response.raise_for_status()
+                    except requests.exceptions.RequestException as e:
+                        print(f"메시지 전송 실패: {e}")
+                        return False
+                    print(f"메시지 전송 성공: {response.status_code}")
+                    return True
+
+            if attempt < self.max_retries:
+                print(f"메시지 전송 실패 ({error}), {delay:.1f}초 후 재시도합니다.")
+                self.sleep(delay)
+        print(f"메시지 전송 실패: {error}")
+        return False
+
+    def flush(self, timeout=None):
+        """
+        큐에 남은 메시지를 모두 보낼 때까지 기다립니다.
+
+        Returns:
+            bool: timeout 전에 모두 보냈으면 True
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.condition:
+            while self.in_flight or any(self.queues.values()):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.condition.wait(remaining)
+        return True
+
+slack_delivery_queue = SlackDeliveryQueue()
+atexit.register(slack_delivery_queue.flush)
+
+def get_slack_delivery_queue():
+    """
+    프로세스에서 공유하는 Slack 전송 큐를 가져옵니다.
+    """
+    return slack_delivery_queue
@@ -0,0 +1,203 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 메시지 1개의 최대 글자 수 (Slack은 text가 4,000자를 넘으면 잘라 보여주고 40,000자를 넘으면 잘라냄)
+SLACK_MAX_MESSAGE_CHARS = int(os.getenv("SLACK_MAX_MESSAGE_CHARS", "3900"))
+# 메시지 1개에 들어갈 최대 section 수 (Slack block 한도 50개)
+SLACK_MAX_SECTIONS = 50
+# section 1개의 최대 글자 수 (Slack section block text 한도 3,000자)
+SLACK_MAX_SECTION_CHARS = 3000
+# PR 본문 최대 글자 수 (0이면 자르지 않음)
+PR_BODY_MAX_CHARS = int(os.getenv("PR_BODY_MAX_CHARS", "300"))
+
+SEPARATOR = f"{'='*50}\n"
+
+# PullRequestEnricher가 채운 상태 값을 표시할 문구
+REVIEW_STATE_LABELS = {
+    "approved": "✅ 승인",
+    "changes_requested": "✋ 변경 요청",
+    "commented": "💬 코멘트"
+}
+CI_STATE_LABELS = {
+    "success": "✅ 성공",
+    "failure": "❌ 실패",
+    "error": "❌ 오류",
+    "pending": "⏳ 진행 중"
+}
+MERGEABLE_LABELS = {
+    True: "가능",
+    False: "⚠️ 충돌"
+}
+CONTINUED_TITLE = "*모든 PR 목록 (계속):*\n"
+
+def continued_title(title):
+    """
+    두 번째 메시지부터 쓸 제목을 만듭니다. ("*제목:*" → "*제목 (계속):*", 제목이 없으면 빈 문자열)
+    """
+    if not title:
+        return ""
+    if ":*" in title:
+        return title.replace(":*", " (계속):*", 1)
+    return CONTINUED_TITLE
+
+def truncate_text(text, limit):
+    """
+    text가 limit보다 길면 잘라서 "…"를 붙입니다.
+
+    Args:
+        text (str): 원본 문자열 (None이면 그대로 둠)
+        limit (int): 최대 글자 수 (0이나 None이면 자르지 않음)
+    """
+    if text is None or not limit or len(text) <= limit:
+        return text
+    return text[:limit].rstrip() + "…"
+
+class SlackMessageBuilder:
+    """
+    PR 목록을 repository 단위로 조금씩 렌더링하면서 Slack 메시지 크기에 맞춰 여러 개로 나눕니다.
+
+    - repository section과 PR section을 list에 모았다가 한 번에 join 합니다.
+    - 메시지는 가능한 한 repository 경계에서 나누고, repository 하나가
+      메시지 1개보다 크면 PR 경계에서 나눕니다.
+    - 메시지마다 글자 수(max_chars)와 section 수(max_sections)를 넘지 않습니다.
+
+    add_repository는 그 사이에 완성된 메시지를 바로 돌려주므로
+    모든 repository를 렌더링하기 전에 앞 메시지를 보낼 수 있습니다.
+    """
+
+    def __init__(self, title="*모든 PR 목록:*\n", max_chars=SLACK_MAX_MESSAGE_CHARS,
+                 max_sections=SLACK_MAX_SECTIONS, body_limit=PR_BODY_MAX_CHARS):
+        """
+        Args:
+            title (str): 첫 메시지의 제목 (빈 문자열이면 제목 없이 렌더링)
+            max_chars (int): 메시지 1개의 최대 글자 수 (None이면 나누지 않음)
+            max_sections (int): 메시지 1개의 최대 section 수 (None이면 제한 없음)
+            body_limit (int): PR 본문 최대 글자 수 (0이나 None이면 자르지 않음)
+        """
+        self.title = title
+        self.continued_title = continued_title(title)
+        self.max_chars = max_chars
+        self.max_sections = max_sections
+        self.body_limit = body_limit
+        self.sections = [title]
+        self.size = len(title)
+
+    def fits(self, size, section_count=1):
+        """
+        현재 메시지에 size 글자, section_count개 section을 더 넣을 수 있는지 확인합니다.
+        """
+        if self.max_chars is None:
+            return True
+        if self.size + size > self.max_chars:
+            return False
+        if self.max_sections is not None and len(self.sections) + section_count > self.max_sections:
+            return False
+        return True
+
+    def cut(self):
+        """
+        현재 메시지를 완성하고 다음 메시지를 시작합니다.
+
+        Returns:
+            str: 완성된 메시지
+        """
+        message = "".join(self.sections)
+        self.sections = [self.continued_title]
+        self.size = len(self.continued_title)
+        return message
+
+    def add_section(self, text, messages, continued=None):
+        """
+        section 하나를 추가합니다. 현재 메시지에 들어가지 않으면 메시지를 나누고,
+        continued가 있으면 새 메시지의 맨 앞에 넣습니다.
+        """
+        if self.max_chars is not None:
+            text = truncate_text(text, SLACK_MAX_SECTION_CHARS)
+            # section 하나가 빈 메시지에도 안 들어가면 들어갈 만큼만 남김
+            available = self.max_chars - max(len(self.title), len(self.continued_title)) - len(continued or "")
+            text = truncate_text(text, available)
+        if not self.fits(len(text)) and len(self.sections) > 1:
+            messages.append(self.cut())
+            if continued is not None:
+                self.sections.append(continued)
+                self.size += len(continued)
+        self.sections.append(text)
+        self.size += len(text)
+
+    def render_repository(self, repo_name, repository, pull_request_count, continued=False):
+        if continued:
+            return f"📁 Repository: {repo_name} (계속)\n{SEPARATOR}"
+        return (
+            f"📁 Repository: {repo_name}\n"
+            f"   URL: {repository['html_url']}\n"
+            f"   설명: {repository.get('description', '설명 없음')}\n"
+            f"   PR 개수: {pull_request_count}\n"
+            f"{SEPARATOR}"
+        )
+
+    def render_pull_request(self, formatted_pr):
+        return (
+            f"  #{formatted_pr['number']} - {formatted_pr['title']}\n"
+            f"    작성자: {formatted_pr['author']}\n"
+            f"    본문: {truncate_text(formatted_pr['body'], self.body_limit)}\n"
+            f"    생성일: {formatted_pr['created_at']}\n"
+            f"{self.render_status(formatted_pr)}"
+            f"    URL: {formatted_pr['url']}\n"
+            f"{SEPARATOR}"
+        )
+
+    def render_status(self, formatted_pr):
+        """
+        PullRequestEnricher가 채운 merge 가능 여부 / 리뷰 / CI 상태를 한 줄로 렌더링합니다. (없으면 빈 문자열)
+        """
+        mergeable = formatted_pr.get("mergeable")
+        review_state = formatted_pr.get("review_state")
+        ci_state = formatted_pr.get("ci_state")
+        if mergeable is None and review_state is None and ci_state is None:
+            return ""
+        return (
+            f"    merge: {MERGEABLE_LABELS.get(mergeable, '확인 중')} / "
+            f"리뷰: {REVIEW_STATE_LABELS.get(review_state, '없음')} / "
+            f"CI: {CI_STATE_LABELS.get(ci_state, '없음')}\n"
+        )
+
+    def add_repository(self, repo_name, repository, formatted_prs):
+        """
+        repository 하나와 그 PR들을 렌더링해서 추가합니다.
+
+        Args:
+            repo_name (str): repository 이름
+            repository (dict): repository 정보 (html_url, description)
+            formatted_prs (list): format_pull_request로 포맷팅된 PR 목록
+
+        Returns:
+            list: 이번에 완성된 메시지 목록 (없으면 빈 목록)
+        """
+        messages = []
+        header = self.render_repository(repo_name, repository, len(formatted_prs))
+        bodies = [self.render_pull_request(pr) for pr in formatted_prs]
+
+        # repository 전체가 현재 메시지에 들어가지 않으면 repository 경계에서 먼저 나눔
+        repository_size = len(header) + sum(len(body) for body in bodies)
+        if len(self.sections) > 1 and not self.fits(repository_size, 1 + len(bodies)):
+            messages.append(self.cut())
+
+        self.add_section(header, messages)
+        # repository 중간(PR 경계)에서 나뉘면 새 메시지에서 어떤 repository인지 알 수 있게 표시
+        continued = self.render_repository(repo_name, repository, len(formatted_prs), continued=True)
+        for body in bodies:
+            self.add_section(body, messages, continued)
+        return messages
+
+    def finish(self):
+        """
+        마지막 메시지를 완성합니다.
+
+        Returns:
+            list: 남은 메시지 목록 (추가된 내용이 없으면 빈 목록)
+        """
+        if len(self.sections) <= 1:
+            return []
+        return [self.cut()]
@@ -1,23 +1,27 @@
-import requests
 import json
 from datetime import datetime
 import os
 from dotenv import load_dotenv
 
+from slack_delivery import get_slack_delivery_queue
+from slack_web_api import SLACK_BOT_TOKEN, post_slack_message
+
 load_dotenv()
 
 # Slack Webhook URL (실제 webhook URL로 교체하세요)
 SLACK_WEBHOOK_URL = os.getenv("SLACK_WEBHOOK_URL")
 
-def send_slack_message(message, channel="#general", username="Bot", icon_emoji=":robot_face:"):
+def send_slack_message(message, channel="#general", username="Bot", icon_emoji=":robot_face:", wait=True):
     """
     Slack webhook을 사용하여 메시지를 보냅니다.
+    전송 큐를 거치므로 webhook 전송 간격 제한을 지키고 429 / 5xx 응답은 재시도합니다.
     
     Args:
         message (str): 보낼 메시지
         channel (str): 채널명 (예: "#general", "@username")
         username (str): 봇 이름
         icon_emoji (str): 봇 아이콘 이모지
+        wait (bool): False면 큐에 넣고 바로 돌아옴 (같은 채널의 메시지와 합쳐서 보낼 수 있음)
     """
     payload = {
         "text": message,
@@ -27,19 +31,15 @@ def send_slack_message(message, channel="#general", username="Bot", icon_emoji="
     }
     
     if SLACK_WEBHOOK_URL is None:
+        # webhook 없이 bot token만 설정했으면 Web API로 보냄
+        if SLACK_BOT_TOKEN:
+            return post_slack_message(payload)
         print("SLACK_WEBHOOK_URL이 설정되어 있지 않습니다.")
         return False
     
-    try:
-        response = requests.post(SLACK_WEBHOOK_URL, json=payload)
-        response.raise_for_status()
-        print(f"메시지 전송 성공: {response.status_code}")
-        return True
-    except requests.exceptions.RequestException as e:
-        print(f"메시지 전송 실패: {e}")
-        return False
+    return get_slack_delivery_queue().submit(SLACK_WEBHOOK_URL, payload, wait)
 
-def send_slack_rich_message(title, text, color="good", channel="#general"):
+def send_slack_rich_message(title, text, color="good", channel="#general", wait=True, event_id=None):
     """
     Slack webhook을 사용하여 rich message(attachments)를 보냅니다.
     
@@ -48,6 +48,8 @@ def send_slack_rich_message(title, text, color="good", channel="#general"):
         text (str): 메시지 내용
         color (str): 색상 ("good", "warning", "danger", 또는 hex color)
         channel (str): 채널명
+        wait (bool): False면 큐에 넣고 바로 돌아옴 (같은 채널의 rich message와 합쳐서 보낼 수 있음)
+        event_id (str): 메시지를 만든 이벤트의 식별 값 (같은 내용의 다른 이벤트를 중복으로 보지 않도록)
     """
     payload = {
         "channel": channel,
@@ -65,21 +67,19 @@ def send_slack_rich_message(title, text, color="good", channel="#general"):
     }
     
     if SLACK_WEBHOOK_URL is None:
+        # webhook 없이 bot token만 설정했으면 Web API로 보냄
+        if SLACK_BOT_TOKEN:
+            return post_slack_message(payload)
         print("SLACK_WEBHOOK_URL이 설정되어 있지 않습니다.")
         return False
     
-    try:
-        response = requests.post(SLACK_WEBHOOK_URL, json=payload)
-        response.raise_for_status()
-        print(f"Rich 메시지 전송 성공: {response.status_code}")
-        return True
-    except requests.exceptions.RequestException as e:
-        print(f"Rich 메시지 전송 실패: {e}")
-        return False
+    return get_slack_delivery_queue().submit(SLACK_WEBHOOK_URL, payload, wait, event_id=event_id)
 
-def send_github_pr_notification(repo_name, pr_number, pr_title, author, url, channel="#github"):
+def send_github_pr_notification(repo_name, pr_number, pr_title, author, url, channel="#github", wait=True,
+                                event_id=None):
     """
     GitHub Pull Request 알림을 Slack으로 보냅니다.
+    event_id(예: PR의 updated_at)를 주면 같은 PR의 다른 이벤트는 내용이 같아도 중복으로 보지 않습니다.
     """
     title = f"🔔 New Pull Request: #{pr_number}"
     text = f"""
@@ -89,49 +89,59 @@ def send_github_pr_notification(repo_name, pr_number, pr_title, author, url, cha
 *URL:* {url}
     """.strip()
     
-    return send_slack_rich_message(title, text, "good", channel)
+    return send_slack_rich_message(title, text, "good", channel, wait, event_id)
 
-def send_github_pr_status_notification(repo_name, pr_number, pr_title, status, url, channel="#github"):
+def send_github_pr_status_notification(repo_name, pr_number, pr_title, status, url, channel="#github", wait=True,
+                                       event_id=None):
     """
     GitHub Pull Request 상태 변경 알림을 Slack으로 보냅니다.
+    event_id(예: PR의 updated_at)를 주면 close → reopen → close처럼 같은 내용이 반복돼도 보냅니다.
     """
     status_emoji = {
         "merged": "✅",
         "closed": "❌",
         "opened": "🔔",
-        "reopened": "🔄"
+        "reopened": "🔄",
+        "ready_for_review": "👀"
     }
     
     status_color = {
         "merged": "good",
         "closed": "danger",
         "opened": "good",
-        "reopened": "warning"
+        "reopened": "warning",
+        "ready_for_review": "good"
+    }
+    
+    status_label = {
+        "ready_for_review": "Ready for Review"
     }
     
     emoji = status_emoji.get(status, "📝")
     color = status_color.get(status, "good")
+    # webhook action 이름은 밑줄로 단어를 이으므로 ("ready_for_review") 밑줄을 공백으로 바꿔 표시
+    label = status_label.get(status, status.replace("_", " ").title())
     
-    title = f"{emoji} PR {status.title()}: #{pr_number}"
+    title = f"{emoji} PR {label}: #{pr_number}"
     text = f"""
 *Repository:* {repo_name}
 *Title:* {pr_title}
-*Status:* {status.title()}
+*Status:* {label}
 *URL:* {url}
     """.strip()
     
-    return send_slack_rich_message(title, text, color, channel)
+    return send_slack_rich_message(title, text, color, channel, wait, event_id)
 
-def send_error_notification(error_message, channel="#alerts"):
+def send_error_notification(error_message, channel="#alerts", wait=True):
     """
     에러 알림을 Slack으로 보냅니다.
     """
     title = "🚨 Error Alert"
     text = f"*Error:* {error_message}"
     
-    return send_slack_rich_message(title, text, "danger", channel)
+    return send_slack_rich_message(title, text, "danger", channel, wait)
 
-def send_daily_summary(summary_data, channel="#daily-summary"):
+def send_daily_summary(summary_data, channel="#daily-summary", wait=True):
     """
     일일 요약 정보를 Slack으로 보냅니다.
     """
@@ -141,11 +151,42 @@ def send_daily_summary(summary_data, channel="#daily-summary"):
 *Date:* {datetime.now().strftime('%Y-%m-%d')}
 *Total PRs:* {summary_data.get('total_prs', 0)}
 *New PRs:* {summary_data.get('new_prs', 0)}
+*Updated PRs:* {summary_data.get('updated_prs', 0)}
 *Merged PRs:* {summary_data.get('merged_prs', 0)}
 *Closed PRs:* {summary_data.get('closed_prs', 0)}
     """.strip()
     
-    return send_slack_rich_message(title, text, "good", channel)
+    # pr_analytics.analyze_pull_requests의 통계가 있으면 함께 표시
+    if "age_percentiles" in summary_data:
+        text += "\n" + format_analytics_summary(summary_data)
+    
+    return send_slack_rich_message(title, text, "good", channel, wait)
+
+def format_analytics_summary(summary_data):
+    """
+    PR 통계(pr_analytics.analyze_pull_requests 결과)를 일일 요약에 붙일 줄로 만듭니다.
+    """
+    ages = summary_data["age_percentiles"]
+    lines = [
+        f"*Draft PRs:* {summary_data.get('draft_prs', 0)}",
+        f"*PR Age (p50 / p90 / p99):* {ages['p50']}d / {ages['p90']}d / {ages['p99']}d",
+        "*Stale PRs:* " + ", ".join(f">{days}d: {count}" for days, count in summary_data["stale_prs"].items())
+    ]
+    if summary_data["top_authors"]:
+        lines.append("*Top Authors:* " + ", ".join(
+            f"{stat['author']} {stat['open']} open / {stat['review_requests']} review requests"
+            for stat in summary_data["top_authors"]
+        ))
+    if summary_data["top_labels"]:
+        lines.append("*Top Labels:* " + ", ".join(f"{label} {count}" for label, count in summary_data["top_labels"]))
+    if summary_data["top_repositories"]:
+        lines.append(f"*Busiest Repositories ({summary_data['window_days']}d):* " + ", ".join(
+            f"{stat['repo']} {stat['open']} open / {stat['opened']} new / {stat['updated']} updated / "
+            f"{stat.get('merged', 0)} merged / {stat.get('closed', 0)} closed / "
+            f"{stat['stale']} stale / oldest {stat['oldest_days']}d"
+            for stat in summary_data["top_repositories"]
+        ))
+    return "\n".join(lines)
 
 def main():
     """
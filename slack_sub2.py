@@ -2,6 +2,8 @@ import requests
 import os
 from dotenv import load_dotenv
 
+from http_client import get_http_client
+
 load_dotenv()
 
 # Slack Webhook URL (실제 webhook URL로 교체하세요)
@@ -29,7 +31,7 @@ def send_slack_message(message, channel="#general", username="Bot", icon_emoji="
         return False
 
     try:
-        response = requests.post(SLACK_WEBHOOK_URL, json=payload)
+        response = get_http_client().post(SLACK_WEBHOOK_URL, json=payload)
         response.raise_for_status()
         print(f"메시지 전송 성공: {response.status_code}")
         return True
@@ -0,0 +1,288 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import requests
+from dotenv import load_dotenv
+
+from http_client import get_http_client
+from pr_metrics import get_metrics
+from slack_dedup import file_lock
+from slack_message_builder import SEPARATOR, SLACK_MAX_SECTION_CHARS
+
+load_dotenv()
+
+# Slack Web API bot token (chat:write 권한 필요, SLACK_TRANSPORT=web_api일 때 사용)
+SLACK_BOT_TOKEN = os.getenv("SLACK_BOT_TOKEN")
+SLACK_API_BASE = os.getenv("SLACK_API_BASE", "https://slack.com/api")
+# 채널별로 보낸 digest 메시지의 ts와 section hash를 기록할 파일
+SLACK_POSTED_MESSAGES_PATH = os.getenv(
+    "SLACK_POSTED_MESSAGES_PATH",
+    os.path.join(os.getenv("PR_NOTIFY_STATE_DIR", ".pr_notify_state"), "slack_posted_messages.json")
+)
+# Web API 호출 사이의 최소 간격 (초, chat.postMessage는 채널마다 초당 1개 정도로 제한)
+SLACK_MIN_INTERVAL = float(os.getenv("SLACK_MIN_INTERVAL", "1"))
+# 429 / 5xx / 연결 오류의 최대 재시도 횟수
+SLACK_MAX_RETRIES = int(os.getenv("SLACK_MAX_RETRIES", "3"))
+
+# chat.update가 이 오류를 돌려주면 기록된 메시지를 쓸 수 없으므로 새로 보냄
+MESSAGE_GONE_ERRORS = ("message_not_found", "cant_update_message", "channel_not_found", "edit_window_closed")
+
+class SlackApiError(requests.exceptions.RequestException):
+    """
+    Slack Web API가 ok: false를 돌려줬습니다.
+    """
+
+    def __init__(self, method, error):
+        super().__init__(f"Slack {method} 실패: {error}")
+        self.error = error
+
+def split_sections(message, max_chars=SLACK_MAX_SECTION_CHARS):
+    """
+    렌더링된 메시지를 section(제목 / repository / PR)으로 나눕니다.
+    SlackMessageBuilder가 repository와 PR마다 SEPARATOR로 끝내므로 SEPARATOR 뒤에서 나누고,
+    max_chars보다 긴 부분(닫힌 PR 목록 등)은 줄 단위로 다시 나눕니다.
+
+    Returns:
+        list: section 문자열 목록 (모두 이으면 원래 메시지)
+    """
+    parts = [part + SEPARATOR for part in message.split(SEPARATOR)]
+    parts[-1] = parts[-1][:-len(SEPARATOR)]
+    sections = []
+    for part in parts:
+        if not part:
+            continue
+        while len(part) > max_chars:
+            cut = part.rfind("\n", 0, max_chars) + 1 or max_chars
+            sections.append(part[:cut])
+            part = part[cut:]
+        if part:
+            sections.append(part)
+    return sections
+
+def section_hash(section):
+    return hashlib.sha256(section.encode("utf-8")).hexdigest()[:16]
+
+class SlackWebApiClient:
+    """
+    Slack Web API(chat.postMessage / chat.update / chat.delete) client입니다.
+    호출 사이에 min_interval을 두고, 429(Retry-After) / 5xx / 연결 오류는 재시도합니다.
+    """
+
+    def __init__(self, token=SLACK_BOT_TOKEN, api_base=SLACK_API_BASE, min_interval=SLACK_MIN_INTERVAL,
+                 max_retries=SLACK_MAX_RETRIES, sleep=time.sleep):
+        self.token = token
+        self.api_base = api_base.rstrip("/")
+        self.min_interval = min_interval
+        self.max_retries = max_retries
+        self.sleep = sleep
+        self.last_called = 0
+
+    def call(self, method, payload):
+        """
+        Web API method를 호출합니다.
+
+        Args:
+            method (str): API method (예: "chat.postMessage")
+            payload (dict): 요청 본문
+
+        Returns:
+            dict: 응답 본문 (ok가 true)
+
+        Raises:
+            SlackApiError: ok가 false인 응답
+            requests.exceptions.RequestException: 재시도해도 실패한 요청
+        """
+        metrics = get_metrics()
+        headers = {"Authorization": f"Bearer {self.token}", "Content-Type": "application/json; charset=utf-8"}
+        for attempt in range(self.max_retries + 1):
+            wait_time = self.last_called + self.min_interval - time.monotonic()
+            if wait_time > 0:
+                self.sleep(wait_time)
+            delay = min(30, 2 ** attempt)
+            try:
+                response = get_http_client().post(f"{self.api_base}/{method}", json=payload, headers=headers)
+            except requests.exceptions.RequestException as e:
+                metrics.inc("slack_api_calls_total", method=method, status="error")
+                error = e
+            else:
+                metrics.inc("slack_api_calls_total", method=method, status=response.status_code)
+                metrics.inc("slack_request_bytes_total", len(response.request.body or b""))
+                if response.status_code == 429 or response.status_code >= 500:
+                    error = requests.exceptions.HTTPError(f"{response.status_code} {response.reason}",
+                                                          response=response)
+                    if "Retry-After" in response.headers:
+                        delay = float(response.headers["Retry-After"])
+                else:
+                    response.raise_for_status()
+                    body = response.json()
+                    if not body.get("ok"):
+                        raise SlackApiError(method, body.get("error", "unknown_error"))
+                    return body
+            finally:
+                self.last_called = time.monotonic()
+
+            if attempt < self.max_retries:
+                metrics.inc("slack_retries_total")
+                print(f"Slack {method} 실패 ({error}), {delay:.1f}초 후 재시도합니다.")
+                self.sleep(delay)
+        raise error
+
+class SlackDigestPublisher:
+    """
+    digest를 채널마다 같은 Slack 메시지에 고쳐 쓰는 전송 방식입니다.
+
+    digest 메시지는 key(제목 / repository / 닫힌 PR 목록 등)와 함께 받습니다. 처음 보는 key는
+    chat.postMessage로 보내고 ts를 기록하며, 다음 실행부터는 같은 key의 메시지를 section(repository / PR)으로
+    나눠 hash를 비교하고 바뀐 section이 있는 메시지만 chat.update로 고칩니다. (Slack은 메시지 일부만
+    고치는 API가 없으므로 바뀐 section이 있는 메시지 전체를 다시 보냄) key로 맞추므로 한 repository의
+    PR 수가 바뀌어도 다른 repository의 메시지는 그대로 둡니다. 이번 digest에 없는 key의 메시지는 chat.delete로 지웁니다.
+
+    Slack은 메시지를 중간에 끼워 넣을 수 없으므로 새로 생긴 repository의 메시지는 채널의 맨 아래에 붙습니다.
+
+    ts와 section hash는 PR_NOTIFY_STATE_DIR에 기록하고, 겹쳐서 실행된 다른 프로세스가
+    같은 메시지를 새로 보내지 않도록 전송하는 동안 file_lock을 잡습니다.
+    """
+
+    def __init__(self, client=None, path=SLACK_POSTED_MESSAGES_PATH):
+        self.client = client or SlackWebApiClient()
+        self.path = path
+        self.lock = threading.Lock()
+
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def save(self, state):
+        temp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, sort_keys=True)
+        os.replace(temp_path, self.path)
+
+    def publish(self, channel, messages, username="Bot", icon_emoji=":robot_face:", prune=True, record=True):
+        """
+        digest 메시지 목록을 채널의 기존 메시지에 반영합니다.
+
+        Args:
+            channel (str): 채널명 (예: "#general") 또는 채널 ID
+            messages (list): 렌더링된 digest 메시지 목록 [(key, 메시지), ...]
+            username (str): 봇 이름
+            icon_emoji (str): 봇 아이콘 이모지
+            prune (bool): True면 이번 digest에 없는 key의 메시지를 지움
+                (조회에 실패한 repository가 있으면 digest가 줄어든 것이 아니므로 False로 호출)
+            record (bool): False면 기존 메시지와 맞추지 않고 모두 새로 보내며 ts를 기록하지 않음
+                (지난 알림 이후 변경분 digest처럼 이전 메시지를 고치거나 지우면 안 되는 경우)
+
+        Returns:
+            bool: 모두 반영했으면 True (실패한 메시지는 기록을 바꾸지 않아 다음 실행에서 다시 반영)
+        """
+        metrics = get_metrics()
+        counts = {"posted": 0, "updated": 0, "unchanged": 0, "deleted": 0}
+        sent = True
+        with self.lock, file_lock(self.path):
+            state = self.load()
+            entry = state.setdefault(channel, {"channel_id": None, "messages": {}})
+            if isinstance(entry["messages"], list):
+                # 순서대로 기록하던 이전 형식은 key가 맞지 않으므로 새로 보내고 prune할 때 지움
+                entry["messages"] = {f"#{index}": record for index, record in enumerate(entry["messages"])}
+            posted = entry["messages"] if record else {}
+            for key, message in messages:
+                hashes = [section_hash(section) for section in split_sections(message)]
+                previous = posted.get(key)
+                if previous is not None and previous["sections"] == hashes:
+                    counts["unchanged"] += 1
+                    metrics.inc("slack_sections_total", len(hashes), outcome="unchanged")
+                    continue
+
+                try:
+                    if previous is not None:
+                        try:
+                            self.client.call("chat.update", {
+                                "channel": entry["channel_id"], "ts": previous["ts"], "text": message
+                            })
+                            changed = len(set(hashes) - set(previous["sections"]))
+                            metrics.inc("slack_sections_total", changed, outcome="changed")
+                            metrics.inc("slack_sections_total", len(hashes) - changed, outcome="unchanged")
+                            previous["sections"] = hashes
+                            counts["updated"] += 1
+                            continue
+                        except SlackApiError as e:
+                            if e.error not in MESSAGE_GONE_ERRORS:
+                                raise
+                            print(f"{channel}의 digest 메시지를 고칠 수 없어 새로 보냅니다. ({e.error})")
+                    body = self.client.call("chat.postMessage", {
+                        "channel": entry["channel_id"] or channel, "text": message,
+                        "username": username, "icon_emoji": icon_emoji
+                    })
+                except requests.exceptions.RequestException as e:
+                    print(f"메시지 전송 실패: {e}")
+                    sent = False
+                    break
+                entry["channel_id"] = body["channel"]
+                metrics.inc("slack_sections_total", len(hashes), outcome="changed")
+                posted[key] = {"ts": body["ts"], "sections": hashes}
+                counts["posted"] += 1
+
+            if sent and prune:
+                # 이번 digest에 없는 repository 등의 메시지를 지움
+                current = {key for key, _ in messages}
+                for key in [key for key in posted if key not in current]:
+                    try:
+                        self.client.call("chat.delete", {"channel": entry["channel_id"], "ts": posted[key]["ts"]})
+                    except SlackApiError as e:
+                        if e.error not in MESSAGE_GONE_ERRORS:
+                            print(f"메시지 삭제 실패: {e}")
+                    except requests.exceptions.RequestException as e:
+                        print(f"메시지 삭제 실패: {e}")
+                    del posted[key]
+                    counts["deleted"] += 1
+            entry["updated_at"] = time.time()
+            self.save(state)
+
+        print(f"{channel} digest 메시지: 새로 보냄 {counts['posted']}개 / 고침 {counts['updated']}개 / "
+              f"그대로 {counts['unchanged']}개 / 삭제 {counts['deleted']}개")
+        return sent
+
+def post_slack_message(payload):
+    """
+    chat.postMessage로 메시지 하나를 보냅니다. (webhook 없이 bot token만 설정했을 때 사용)
+
+    Args:
+        payload (dict): webhook payload와 같은 형식 (channel, text / attachments, username, icon_emoji)
+
+    Returns:
+        bool: 전송 성공 여부
+    """
+    publisher = get_slack_digest_publisher()
+    if publisher is None:
+        print("SLACK_BOT_TOKEN이 설정되어 있지 않습니다.")
+        return False
+    try:
+        publisher.client.call("chat.postMessage", payload)
+    except requests.exceptions.RequestException as e:
+        print(f"메시지 전송 실패: {e}")
+        return False
+    print("메시지 전송 성공: chat.postMessage")
+    return True
+
+slack_digest_publisher = None
+slack_digest_publisher_lock = threading.Lock()
+
+def get_slack_digest_publisher():
+    """
+    프로세스에서 공유하는 digest 전송기를 가져옵니다.
+
+    Returns:
+        SlackDigestPublisher: 전송기 (SLACK_BOT_TOKEN이 없으면 None)
+    """
+    global slack_digest_publisher
+    if not SLACK_BOT_TOKEN:
+        return None
+    with slack_digest_publisher_lock:
+        if slack_digest_publisher is None:
+            slack_digest_publisher = SlackDigestPublisher()
+    return slack_digest_publisher